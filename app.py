@@ -1,7 +1,15 @@
+import copy
+import pandas as pd
 import streamlit as st
+import time
+import uuid
 from datetime import date
+from dateutil.relativedelta import relativedelta
 from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
 from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.jobs import JobRunner
+from src.projection.downsampling import DEFAULT_MAX_POINTS, downsample_frame
+from src.projection.projection_cache import ProjectionCache
 
 st.set_page_config(page_title="Account Portfolio Simulator", layout="wide")
 
@@ -53,7 +61,7 @@ if portfolio.get_account_names():
             )
         with col2:
             if st.button("Delete", key=f"del_{name}"):
-                del portfolio._accounts[name]
+                portfolio.remove_account(name)
                 st.rerun()
 
 # Add contribution rule section
@@ -81,9 +89,9 @@ if st.sidebar.button("Add Contribution Rule"):
         st.error(str(e))
 
 # Show and manage contribution rules
-if portfolio._contribution_rules:
+if portfolio.contribution_rules():
     st.subheader("💸 Contribution Rules")
-    for i, rule in enumerate(portfolio._contribution_rules):
+    for i, rule in enumerate(portfolio.contribution_rules()):
         with st.expander(f"Edit Contribution Rule {i+1}"):
             account = st.text_input(
                 f"Account {i}", value=rule.account_name, key=f"ca_{i}"
@@ -104,15 +112,18 @@ if portfolio._contribution_rules:
             with col1:
                 if st.button("Update", key=f"update_cr_{i}"):
                     try:
-                        portfolio._contribution_rules[i] = ContributionRule(
-                            account, amount, start_age, end_age, escalation
+                        portfolio.update_contribution_rule(
+                            i,
+                            ContributionRule(
+                                account, amount, start_age, end_age, escalation
+                            ),
                         )
                         st.success("Updated successfully")
                     except Exception as e:
                         st.error(str(e))
             with col2:
                 if st.button("Delete", key=f"delete_cr_{i}"):
-                    del portfolio._contribution_rules[i]
+                    portfolio.remove_contribution_rule(i)
                     st.rerun()
 
 # Add withdrawal rule section
@@ -133,9 +144,9 @@ if st.sidebar.button("Add Withdrawal Rule"):
         st.error(str(e))
 
 # Show and manage withdrawal rules
-if portfolio._withdrawal_rules:
+if portfolio.withdrawal_rules():
     st.subheader("📉 Withdrawal Rules")
-    for i, rule in enumerate(portfolio._withdrawal_rules):
+    for i, rule in enumerate(portfolio.withdrawal_rules()):
         with st.expander(f"Edit Withdrawal Rule {i+1}"):
             account = st.text_input(
                 f"WAccount {i}", value=rule.account_name, key=f"wa_{i}"
@@ -151,53 +162,132 @@ if portfolio._withdrawal_rules:
             with col1:
                 if st.button("Update", key=f"update_wr_{i}"):
                     try:
-                        portfolio._withdrawal_rules[i] = WithdrawalRule(
-                            account, amount, start_age, end_age
+                        portfolio.update_withdrawal_rule(
+                            i, WithdrawalRule(account, amount, start_age, end_age)
                         )
                         st.success("Updated successfully")
                     except Exception as e:
                         st.error(str(e))
             with col2:
                 if st.button("Delete", key=f"delete_wr_{i}"):
-                    del portfolio._withdrawal_rules[i]
+                    portfolio.remove_withdrawal_rule(i)
                     st.rerun()
 
+
 # Projection
+@st.cache_resource
+def job_runner():
+    """Worker threads shared by all sessions, so projections never block a rerun."""
+    return JobRunner()
+
+
+@st.cache_resource
+def projection_cache():
+    """Projected account states shared by all sessions, keyed on the spec."""
+    return ProjectionCache(max_entries=32)
+
+
+def run_projection(projected: AccountPortfolio, target_date: date, progress):
+    """
+    Reproject a copy of the session portfolio. Only accounts whose rules changed
+    since its last projection are recomputed, and a configuration projected
+    before is restored from the shared cache.
+    """
+    projected.reproject_to_date(
+        target_date, cache=projection_cache(), progress=progress
+    )
+    return projected
+
+
+@st.cache_data(max_entries=32)
+def projection_view(spec_json: str, chart_points: int, _projected: AccountPortfolio):
+    """
+    Return the final balance of every account and the total portfolio value over
+    time, downsampled to chart_points, of a projected portfolio. Keyed on its
+    spec and the chart size, so reruns without changes to either reuse them.
+    """
+    balances = {
+        name: _projected.get_balance(name) for name in _projected.get_account_names()
+    }
+    timeseries = _projected.timeseries()
+    # Downsampled to a fixed number of points, keeping peaks and depletion
+    chart = downsample_frame(
+        pd.DataFrame({"total": timeseries["total"].to_numpy()}, index=timeseries.index),
+        chart_points,
+    )
+    return balances, chart.index.to_numpy(), chart["total"].to_numpy()
+
+
 st.header("🔄 Forecast Portfolio")
 target_age = st.number_input("Target Age to Project To", min_value=0, value=100)
 
-if st.button("Run Projection"):
+st.sidebar.header("Chart")
+chart_points = st.sidebar.number_input(
+    "Maximum Chart Points", min_value=10, value=DEFAULT_MAX_POINTS, step=50
+)
+
+if "session_id" not in st.session_state:
+    st.session_state.session_id = str(uuid.uuid4())
+runner = job_runner()
+
+run_clicked = st.button("Run Projection")
+if run_clicked:
+    st.session_state.show_projection = True
+
+if st.session_state.get("show_projection"):
     try:
-        portfolio.reset()
-        portfolio.project_to_age(target_age)
-        st.success("Projection completed.")
-
-        # Display results for each account
-        total_values = []
-        dates = None
-
-        for account_name in portfolio.get_account_names():
-            balance = portfolio.get_balance(account_name)
-            st.metric(
-                label=f"Projected Balance for {account_name}", value=f"${balance:,.2f}"
+        target_date = birthdate + relativedelta(years=int(target_age))
+        spec_json = portfolio.spec(target_date).to_json()
+        job = runner.job(st.session_state.session_id)
+        if (
+            job is None
+            or st.session_state.get("projection_spec") != spec_json
+            or (run_clicked and job.state() in ("cancelled", "failed"))
+        ):
+            # Only a changed portfolio or target age is projected again, or a
+            # cancelled or failed projection when it is run again; a newer
+            # projection supersedes one that is still running
+            st.session_state.projection_spec = spec_json
+            job = runner.submit(
+                st.session_state.session_id,
+                run_projection,
+                copy.deepcopy(portfolio),
+                target_date,
             )
 
-            history = portfolio.account_history(account_name)
-            if history:
-                if dates is None:
-                    dates = [d for d, _ in history]
-                values = [v for _, v in history]
-                if not total_values:
-                    total_values = values
-                else:
-                    total_values = [sum(x) for x in zip(total_values, values)]
-
-        # Show total portfolio value over time
-        if dates and total_values:
-            import pandas as pd
-
-            df = pd.DataFrame({"Total Portfolio Value": total_values}, index=dates)
-            st.line_chart(df)
+        if not job.done():
+            completed, total = job.progress()
+            st.progress(
+                job.fraction(),
+                text=f"Projecting... {completed} of {total or '?'} months",
+            )
+            if st.button("Cancel Projection"):
+                job.cancel()
+                st.session_state.show_projection = False
+                st.rerun()
+            time.sleep(0.25)
+            st.rerun()
+        elif job.state() == "failed":
+            st.error(f"Error during projection: {job.error()}")
+        elif job.state() == "done":
+            # The projected copy keeps its checkpoints for the next reprojection
+            portfolio = st.session_state.portfolio = job.result()
+            balances, dates, totals = projection_view(
+                spec_json, int(chart_points), portfolio
+            )
+
+            # Display results for each account
+            for account_name, balance in balances.items():
+                st.metric(
+                    label=f"Projected Balance for {account_name}",
+                    value=f"${balance:,.2f}",
+                )
+
+            # Show total portfolio value over time, aligned on calendar months
+            if len(dates):
+                st.line_chart(
+                    pd.DataFrame({"Total Portfolio Value": totals}, index=dates)
+                )
 
     except Exception as e:
         st.error(f"Error during projection: {e}")
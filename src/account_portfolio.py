@@ -1,10 +1,71 @@
 from datetime import date
 from dateutil.relativedelta import relativedelta
-from typing import Dict, List
-from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass, replace
 
-from src.balance.balance_with_history_and_strategy import BalanceWithHistoryAndStrategy
+import numpy as np
+import pandas as pd
+
+from src.balance.balance_with_history_and_strategy import (
+    HISTORY_MODES,
+    BalanceWithHistoryAndStrategy,
+)
+from src.goal_solvers import (
+    GoalSolution,
+    projected_totals,
+    solve_max_amount,
+    solve_required_amount,
+)
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
 from src.interest_strategy.interest_strategy import InterestStrategy
+from src.interest_strategy.strategy_registry import strategy_from_spec
+from src.projection.account_plan import AccountPlan, build_account_plan, plan_months
+from src.projection.age_table import AgeTable
+from src.projection.depletion import (
+    SHORTFALL_CHUNK_MONTHS,
+    constant_flow_balance,
+    constant_flow_shortfall,
+)
+from src.projection.month_grid import (
+    month_index,
+    month_start,
+    months_between,
+    steps_to_reach,
+    whole_years,
+)
+from src.projection.monte_carlo import (
+    MonteCarloResult,
+    simulate,
+    simulate_streaming,
+)
+from src.projection.parameter_sweep import parameter_sweep
+from src.projection.portfolio_spec import AccountSpec, PortfolioSpec
+from src.projection.projection_cache import ProjectionCache
+from src.projection.parallel_monte_carlo import (
+    simulate_parallel,
+    simulate_streaming_parallel,
+)
+from src.projection.streaming_statistics import MonteCarloSummary
+from src.projection.timeseries import align_month_end_balances, balance_table
+from src.projection.rule_schedule import RuleSchedule
+from src.projection.sensitivities import (
+    SENSITIVITY_MODES,
+    BalanceSensitivities,
+    adjoint_sensitivities,
+    forward_sensitivities,
+    log_growth_per_annual_rate,
+)
+from src.projection.vectorized_projection import (
+    compound,
+    project_account_history,
+    rule_cash_flows,
+    rule_flow_derivatives,
+)
+
+PROJECTION_ENGINES = ("loop", "vectorized")
+
+# Age up to which shortfall queries look by default
+SHORTFALL_MAX_AGE = 100
 
 
 @dataclass
@@ -49,6 +110,25 @@ class WithdrawalRule:
             raise ValueError("Start age must be less than end age for withdrawal rule.")
 
 
+@dataclass
+class ProjectionSnapshot:
+    """
+    State of the portfolio after one projected month: the date the month's rules
+    were applied on, the person's age on that date, the closing balance of every
+    account opened so far, and the contributions and withdrawals of the month.
+    """
+
+    date: date
+    age: int
+    balances: Dict[str, float]
+    contributions: Dict[str, float]
+    withdrawals: Dict[str, float]
+
+    def total_balance(self) -> float:
+        """Return the total closing balance across all accounts."""
+        return sum(self.balances.values())
+
+
 class AccountPortfolio:
     """
     Represents all financial accounts of a person, each with a balance and growth strategy.
@@ -56,12 +136,46 @@ class AccountPortfolio:
     and withdrawal rules with optional escalation.
     """
 
-    def __init__(self, birthdate: date):
-        """Initialize the portfolio with a person's birthdate."""
+    def __init__(self, birthdate: date, history_mode: str = "full"):
+        """
+        Initialize the portfolio with a person's birthdate. history_mode selects
+        which history entries every account records, one of HISTORY_MODES.
+        """
+        if history_mode not in HISTORY_MODES:
+            raise ValueError(f"Unknown history mode '{history_mode}'.")
         self._birthdate = birthdate
+        self._history_mode = history_mode
         self._accounts: Dict[str, BalanceWithHistoryAndStrategy] = {}
         self._contribution_rules: List[ContributionRule] = []
         self._withdrawal_rules: List[WithdrawalRule] = []
+        self._age_table: Optional[AgeTable] = None
+        # Rules compiled by _compile_rules, until a rule is added, changed or removed
+        self._rule_schedule: Optional[RuleSchedule] = None
+        # Target date of the last reproject_to_date, while the accounts still hold
+        # exactly that projection apart from the changes marked in _dirty
+        self._projection_target: Optional[date] = None
+        # Account name -> earliest date a change since that projection affects
+        self._dirty: Dict[str, date] = {}
+
+    @classmethod
+    def from_spec(cls, spec: PortfolioSpec) -> "AccountPortfolio":
+        """
+        Create the portfolio a spec describes, with every account at its initial
+        amount. The spec's target date and engine are not projected to.
+        """
+        portfolio = cls(spec.birthdate, history_mode=spec.history_mode)
+        for account in spec.accounts:
+            portfolio.add_account(
+                account.name,
+                account.initial_amount,
+                account.start_date,
+                strategy_from_spec(account.strategy_spec()),
+            )
+        for rule in spec.contribution_rules:
+            portfolio.add_contribution_rule(ContributionRule(*rule))
+        for rule in spec.withdrawal_rules:
+            portfolio.add_withdrawal_rule(WithdrawalRule(*rule))
+        return portfolio
 
     def add_account(
         self,
@@ -74,20 +188,100 @@ class AccountPortfolio:
         if name in self._accounts:
             raise ValueError(f"Account '{name}' already exists.")
         self._accounts[name] = BalanceWithHistoryAndStrategy(
-            initial_amount, start_date, strategy
+            initial_amount, start_date, strategy, self._history_mode
         )
+        self._dirty[name] = start_date
+
+    def remove_account(self, name: str) -> None:
+        """Remove an account from the portfolio together with all of its rules."""
+        self._get_account(name)
+        del self._accounts[name]
+        self._dirty.pop(name, None)
+        self._contribution_rules = [
+            r for r in self._contribution_rules if r.account_name != name
+        ]
+        self._withdrawal_rules = [
+            r for r in self._withdrawal_rules if r.account_name != name
+        ]
+        self._rule_schedule = None
+
+    def history_mode(self) -> str:
+        """Return which history entries the accounts record."""
+        return self._history_mode
+
+    def set_history_mode(self, history_mode: str) -> None:
+        """
+        Choose which history entries all accounts record from now on:
+        "full" (every change), "month_end" (one entry per account and month),
+        "yearly" (the start and every January) or "none".
+        """
+        if history_mode not in HISTORY_MODES:
+            raise ValueError(f"Unknown history mode '{history_mode}'.")
+        for account in self._accounts.values():
+            account.set_history_mode(history_mode)
+        self._history_mode = history_mode
+        self._projection_target = None
 
     def add_contribution_rule(self, rule: ContributionRule) -> None:
         """Add a recurring contribution rule for a specific account."""
         if rule.account_name not in self._accounts:
             raise KeyError(f"Account '{rule.account_name}' not found.")
         self._contribution_rules.append(rule)
+        self._mark_rule_changed(rule)
+
+    def update_contribution_rule(self, index: int, rule: ContributionRule) -> None:
+        """Replace the contribution rule at a position of contribution_rules()."""
+        if rule.account_name not in self._accounts:
+            raise KeyError(f"Account '{rule.account_name}' not found.")
+        self._mark_rule_changed(self._contribution_rules[index])
+        self._contribution_rules[index] = rule
+        self._mark_rule_changed(rule)
+
+    def remove_contribution_rule(self, index: int) -> None:
+        """Remove the contribution rule at a position of contribution_rules()."""
+        self._mark_rule_changed(self._contribution_rules.pop(index))
+
+    def contribution_rules(self) -> List[ContributionRule]:
+        """Return a copy of the list of contribution rules."""
+        return list(self._contribution_rules)
 
     def add_withdrawal_rule(self, rule: WithdrawalRule) -> None:
         """Add a recurring withdrawal rule for a specific account."""
         if rule.account_name not in self._accounts:
             raise KeyError(f"Account '{rule.account_name}' not found.")
         self._withdrawal_rules.append(rule)
+        self._mark_rule_changed(rule)
+
+    def update_withdrawal_rule(self, index: int, rule: WithdrawalRule) -> None:
+        """Replace the withdrawal rule at a position of withdrawal_rules()."""
+        if rule.account_name not in self._accounts:
+            raise KeyError(f"Account '{rule.account_name}' not found.")
+        self._mark_rule_changed(self._withdrawal_rules[index])
+        self._withdrawal_rules[index] = rule
+        self._mark_rule_changed(rule)
+
+    def remove_withdrawal_rule(self, index: int) -> None:
+        """Remove the withdrawal rule at a position of withdrawal_rules()."""
+        self._mark_rule_changed(self._withdrawal_rules.pop(index))
+
+    def withdrawal_rules(self) -> List[WithdrawalRule]:
+        """Return a copy of the list of withdrawal rules."""
+        return list(self._withdrawal_rules)
+
+    def _mark_rule_changed(self, rule: Union[ContributionRule, WithdrawalRule]) -> None:
+        """
+        Mark a rule's account as changed from the date the rule starts on, and the
+        compiled rule schedule as outdated.
+        """
+        self._rule_schedule = None
+        self._mark_changed(
+            rule.account_name, self._birthdate + relativedelta(years=rule.start_age)
+        )
+
+    def _mark_changed(self, name: str, from_date: date) -> None:
+        """Record that an account's projection is outdated from a given date on."""
+        if name in self._accounts:
+            self._dirty[name] = min(self._dirty.get(name, from_date), from_date)
 
     def get_account_names(self) -> List[str]:
         """Return a list of all account names."""
@@ -97,13 +291,23 @@ class AccountPortfolio:
         """Return the current balance of the specified account."""
         return self._get_account(name).current_amount()
 
+    def get_current_date(self, name: str) -> date:
+        """Return the date the specified account has been projected to."""
+        return self._get_account(name).current_date()
+
+    def get_strategy(self, name: str) -> InterestStrategy:
+        """Return the interest strategy of the specified account."""
+        return self._get_account(name).strategy()
+
     def deposit(self, name: str, amount: float) -> None:
         """Deposit a specific amount into an account."""
         self._get_account(name).add(amount)
+        self._projection_target = None
 
     def withdraw(self, name: str, amount: float) -> None:
         """Withdraw a specific amount from an account."""
         self._get_account(name).subtract(amount)
+        self._projection_target = None
 
     def reset(self) -> None:
         """
@@ -112,67 +316,1019 @@ class AccountPortfolio:
         """
         for account in self._accounts.values():
             account.reset()
+        self._projection_target = None
+        self._dirty = {}
 
     def _current_age(self, on_date: date) -> int:
         """Return the age of the person on a given date."""
+        index = month_index(on_date)
+        if on_date.day == 1 and self._age_table_covers(index):
+            return self._age_table.age(index)
         return relativedelta(on_date, self._birthdate).years
 
     def _months_since_age(self, current_date: date, target_age: int) -> int:
         """Return the number of months since a given target age."""
+        index = month_index(current_date)
+        if current_date.day == 1 and self._age_table_covers(index):
+            return self._age_table.months_since_birth(index) - 12 * target_age
         age_date = self._birthdate + relativedelta(years=target_age)
         delta = relativedelta(current_date, age_date)
         return delta.years * 12 + delta.months
 
-    def _apply_contribution_rules(
-        self, name: str, account: BalanceWithHistoryAndStrategy, date: date
-    ) -> None:
-        """Apply all applicable contribution rules to an account on a given date."""
-        age = self._current_age(date)
-        for rule in self._contribution_rules:
-            if rule.account_name == name and rule.start_age <= age < rule.end_age:
+    def _age_table_covers(self, index: int) -> bool:
+        """Return whether the cached age table is valid and holds a month."""
+        return (
+            self._age_table is not None
+            and self._age_table.birthdate() == self._birthdate
+            and self._age_table.covers(index, index)
+        )
+
+    def _prepare_age_table(self, last_index: int) -> None:
+        """
+        Make sure the cached age table spans every account's current month up to
+        a month index, rebuilding it when the birthdate or horizon has changed.
+        """
+        if not self._accounts:
+            return
+        first_index = min(
+            month_index(a.current_date()) for a in self._accounts.values()
+        )
+        if last_index < first_index:
+            return
+        if (
+            self._age_table is None
+            or self._age_table.birthdate() != self._birthdate
+            or not self._age_table.covers(first_index, last_index)
+        ):
+            self._age_table = AgeTable(self._birthdate, first_index, last_index)
+
+    def _steps_to_reach(self, target_date: date) -> int:
+        """Return how many monthly steps the projection needs to reach a date."""
+        return max(
+            (
+                steps_to_reach(account.current_date(), target_date)
+                for account in self._accounts.values()
+            ),
+            default=0,
+        )
+
+    def _compile_rules(self) -> RuleSchedule:
+        """
+        Return the current rules compiled into a per-account schedule, compiling
+        them only once until a rule is added, changed or removed.
+        """
+        if self._rule_schedule is None:
+            self._rule_schedule = RuleSchedule(
+                self._contribution_rules, self._withdrawal_rules
+            )
+        return self._rule_schedule
+
+    def _contribution_amounts(
+        self, name: str, date: date, schedule: RuleSchedule
+    ) -> List[float]:
+        """Return the amounts of all applicable contribution rules on a given date."""
+        amounts = []
+        for rule, escalated_amount in schedule.contributions(
+            name, self._current_age(date)
+        ):
+            if date.day != 1:
+                # Off the first of the month (an account's start date) whole years
+                # since start_age can differ from age - start_age around leap days.
                 months_since_start = self._months_since_age(date, rule.start_age)
                 years_since_start = months_since_start // 12
                 escalated_amount = rule.amount * (
                     (1 + rule.annual_increase_rate) ** years_since_start
                 )
-                account.add(escalated_amount)
+            amounts.append(escalated_amount)
+        return amounts
+
+    def _apply_contribution_rules(
+        self,
+        name: str,
+        account: BalanceWithHistoryAndStrategy,
+        date: date,
+        schedule: RuleSchedule,
+    ) -> None:
+        """Apply all applicable contribution rules to an account on a given date."""
+        for amount in self._contribution_amounts(name, date, schedule):
+            account.add(amount)
 
     def _apply_withdrawal_rules(
-        self, name: str, account: BalanceWithHistoryAndStrategy, date: date
+        self,
+        name: str,
+        account: BalanceWithHistoryAndStrategy,
+        date: date,
+        schedule: RuleSchedule,
     ) -> None:
         """Apply all applicable withdrawal rules to an account on a given date."""
-        age = self._current_age(date)
-        for rule in self._withdrawal_rules:
-            if rule.account_name == name and rule.start_age <= age < rule.end_age:
-                account.subtract(rule.amount)
+        for amount in schedule.withdrawals(name, self._current_age(date)):
+            account.subtract(amount)
 
     def project_one_month(self) -> None:
         """Advance each account by one month, applying all relevant rules."""
+        self._projection_target = None
+        self._project_one_month(self._compile_rules())
+
+    def _project_one_month(self, schedule: RuleSchedule) -> None:
+        """Advance each account by one month using an already compiled rule schedule."""
         for name, account in self._accounts.items():
-            current_date = account.current_date()
-            self._apply_contribution_rules(name, account, current_date)
-            self._apply_withdrawal_rules(name, account, current_date)
-            account.project_one_month()
+            self._project_account_one_month(name, account, schedule)
+
+    def _project_account_one_month(
+        self,
+        name: str,
+        account: BalanceWithHistoryAndStrategy,
+        schedule: RuleSchedule,
+    ) -> None:
+        """Advance a single account by one month, applying its rules."""
+        current_date = account.current_date()
+        self._apply_contribution_rules(name, account, current_date, schedule)
+        self._apply_withdrawal_rules(name, account, current_date, schedule)
+        account.project_one_month()
+
+    def project_to_date(
+        self,
+        target_date: date,
+        engine: str = "loop",
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        """
+        Project all accounts forward to a specific date.
+        The "vectorized" engine computes the same balances and history with array
+        operations instead of stepping through the months one by one.
 
-    def project_to_date(self, target_date: date) -> None:
-        """Project all accounts forward to a specific date."""
+        progress(completed, total) is called after every month with the loop
+        engine and after every account with the vectorized one. An exception it
+        raises stops the projection, leaving the accounts partly projected.
+        """
+        if engine not in PROJECTION_ENGINES:
+            raise ValueError(f"Unknown projection engine '{engine}'.")
+        self._projection_target = None
+        if engine == "vectorized":
+            self._project_vectorized(target_date, progress)
+            return
+        schedule = self._compile_rules()
+        steps = self._steps_to_reach(target_date)
+        self._prepare_age_table(
+            max(
+                (month_index(a.current_date()) for a in self._accounts.values()),
+                default=0,
+            )
+            + steps
+        )
+        completed = 0
         while any(
             account.current_date() < target_date for account in self._accounts.values()
         ):
-            self.project_one_month()
+            self._project_one_month(schedule)
+            completed += 1
+            if progress is not None:
+                progress(completed, steps)
 
-    def project_to_age(self, target_age: int) -> None:
+    def project_to_age(
+        self,
+        target_age: int,
+        engine: str = "loop",
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
         """Project all accounts forward until the person reaches a specific age."""
         target_date = self._birthdate + relativedelta(years=target_age)
-        self.project_to_date(target_date)
+        self.project_to_date(target_date, engine=engine, progress=progress)
+
+    def reproject_to_date(
+        self,
+        target_date: date,
+        engine: str = "loop",
+        cache: Optional[ProjectionCache] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        """
+        Bring the accounts to the state reset() followed by project_to_date would
+        give, recomputing only what changed since the last reprojection.
+
+        Accounts keep a checkpoint every January 1st. After rules are added,
+        updated or removed, only their accounts are rewound to the last checkpoint
+        before the earliest month the change affects and projected forward again;
+        accounts that were added are projected from their start. Any other change
+        to the accounts, or a different target date, projects everything again.
+
+        With a cache, a configuration that was projected before is restored from
+        the cache instead, and new results are stored in it.
+
+        progress(completed, total) is called as in project_to_date when everything
+        is projected again, and otherwise after every account with the number of
+        its months recomputed so far. An exception it raises stops the
+        projection; the next reprojection picks up where it stopped.
+        """
+        if engine not in PROJECTION_ENGINES:
+            raise ValueError(f"Unknown projection engine '{engine}'.")
+        if cache is None:
+            self._reproject(target_date, engine, progress)
+            return
+        key = self.spec(target_date, engine).key()
+        states = cache.get(key)
+        if states is None:
+            self._reproject(target_date, engine, progress)
+            cache.put(key, {n: a.state() for n, a in self._accounts.items()})
+            return
+        for name, state in states.items():
+            self._accounts[name].restore(state)
+        self._projection_target = target_date
+        self._dirty = {}
+
+    def _reproject(
+        self,
+        target_date: date,
+        engine: str,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        """Reproject to target_date, recomputing only what changed."""
+        if self._projection_target != target_date:
+            self.reset()
+            self.project_to_date(target_date, engine=engine, progress=progress)
+            self._projection_target = target_date
+            return
+
+        # project_to_date advances every account in lockstep by this many months
+        steps = max(
+            (
+                steps_to_reach(account.start_date(), target_date)
+                for account in self._accounts.values()
+            ),
+            default=0,
+        )
+        for name, account in self._accounts.items():
+            if account.steps_taken() > steps:
+                # An account that set the number of steps has been removed
+                self._mark_changed(
+                    name, month_start(month_index(account.start_date()) + steps)
+                )
+        for name, from_date in self._dirty.items():
+            self._accounts[name].rewind(from_date)
+        self._dirty = {}
+
+        schedule = self._compile_rules()
+        self._prepare_age_table(
+            max(
+                (month_index(a.start_date()) for a in self._accounts.values()),
+                default=0,
+            )
+            + steps
+        )
+        remaining = {
+            name: steps - account.steps_taken()
+            for name, account in self._accounts.items()
+        }
+        total = sum(months for months in remaining.values() if months > 0)
+        completed = 0
+        for name, account in self._accounts.items():
+            if remaining[name] <= 0:
+                continue
+            if engine == "vectorized":
+                account.extend_history(
+                    *project_account_history(self._account_plan(name, remaining[name]))
+                )
+            else:
+                for _ in range(remaining[name]):
+                    self._project_account_one_month(name, account, schedule)
+            completed += remaining[name]
+            if progress is not None:
+                progress(completed, total)
+
+    def reproject_to_age(
+        self,
+        target_age: int,
+        engine: str = "loop",
+        cache: Optional[ProjectionCache] = None,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        """Reproject all accounts until the person reaches a specific age."""
+        target_date = self._birthdate + relativedelta(years=target_age)
+        self.reproject_to_date(
+            target_date, engine=engine, cache=cache, progress=progress
+        )
+
+    def spec(
+        self, target_date: Optional[date] = None, engine: str = "loop"
+    ) -> PortfolioSpec:
+        """
+        Return the canonical description of the portfolio configuration and of a
+        projection to target_date, whose key() identifies the projection result.
+        """
+        return PortfolioSpec(
+            birthdate=self._birthdate,
+            accounts=tuple(
+                AccountSpec(
+                    name,
+                    float(account.initial_amount()),
+                    account.start_date(),
+                    tuple(account.strategy().spec().items()),
+                )
+                for name, account in self._accounts.items()
+            ),
+            contribution_rules=tuple(
+                (
+                    r.account_name,
+                    float(r.amount),
+                    int(r.start_age),
+                    int(r.end_age),
+                    float(r.annual_increase_rate),
+                )
+                for r in self._contribution_rules
+            ),
+            withdrawal_rules=tuple(
+                (r.account_name, float(r.amount), int(r.start_age), int(r.end_age))
+                for r in self._withdrawal_rules
+            ),
+            target_date=target_date,
+            engine=engine,
+            history_mode=self._history_mode,
+        )
+
+    def iter_projection(
+        self, target_date: date, record_history: bool = False
+    ) -> Iterator[ProjectionSnapshot]:
+        """
+        Project all accounts to a specific date one calendar month at a time,
+        yielding a snapshot after each month instead of materializing the result.
+
+        Accounts join in the month they start. By default the accounts are left
+        untouched and no history is kept, so memory stays proportional to the
+        number of accounts, and each account stops once it reaches target_date.
+
+        With record_history=True the accounts themselves are advanced and record
+        their history as usual, and they end where project_to_date leaves them:
+        every account is advanced by as many months as the one furthest from
+        target_date needs, so an account that started later ends after it.
+        """
+        if not self._accounts:
+            return
+        dates = {name: a.current_date() for name, a in self._accounts.items()}
+        if record_history:
+            self._projection_target = None
+            steps = self._steps_to_reach(target_date)
+            remaining = {name: steps for name in dates}
+        else:
+            remaining = {
+                name: steps_to_reach(d, target_date) for name, d in dates.items()
+            }
+        schedule = self._compile_rules()
+        amounts = {name: a.current_amount() for name, a in self._accounts.items()}
+        first_months = {name: month_index(d) for name, d in dates.items()}
+        self._prepare_age_table(
+            max(first_months[name] + remaining[name] for name in dates)
+        )
+
+        while True:
+            pending = [name for name in dates if remaining[name] > 0]
+            if not pending:
+                return
+            month = min(month_index(dates[name]) for name in pending)
+            stepping = [name for name in pending if month_index(dates[name]) == month]
+            snapshot_date = min(dates[name] for name in stepping)
+            contributions, withdrawals = {}, {}
+
+            for name in stepping:
+                current_date = dates[name]
+                added = self._contribution_amounts(name, current_date, schedule)
+                taken = schedule.withdrawals(name, self._current_age(current_date))
+                account = self._accounts[name]
+                if record_history:
+                    for amount in added:
+                        account.add(amount)
+                    for amount in taken:
+                        account.subtract(amount)
+                    account.project_one_month()
+                    dates[name] = account.current_date()
+                    amounts[name] = account.current_amount()
+                else:
+                    amount = amounts[name]
+                    for delta in added:
+                        amount += delta
+                    for delta in taken:
+                        amount -= delta
+                    rate = account.strategy().get_monthly_rate(current_date)
+                    amounts[name] = amount * (1 + rate)
+                    dates[name] = month_start(month + 1)
+                contributions[name] = sum(added)
+                withdrawals[name] = sum(taken)
+                remaining[name] -= 1
+
+            yield ProjectionSnapshot(
+                date=snapshot_date,
+                age=self._current_age(snapshot_date),
+                balances={
+                    name: amounts[name]
+                    for name in amounts
+                    if first_months[name] <= month
+                },
+                contributions=contributions,
+                withdrawals=withdrawals,
+            )
+
+    def _project_vectorized(
+        self,
+        target_date: date,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        """Advance every account by as many months as the loop would, in one pass each."""
+        steps = self._steps_to_reach(target_date)
+        if steps == 0:
+            return
+        for completed, (name, account) in enumerate(self._accounts.items(), start=1):
+            month_indices, amounts = project_account_history(
+                self._account_plan(name, steps)
+            )
+            account.extend_history(month_indices, amounts)
+            if progress is not None:
+                progress(completed, len(self._accounts))
+
+    def first_shortfall_date(
+        self, name: Optional[str] = None, max_age: int = SHORTFALL_MAX_AGE
+    ) -> Optional[date]:
+        """
+        Return the first date an account's balance, or with no name the total of
+        all accounts on their calendar month grid, is negative, or None if that
+        does not happen before the person reaches max_age.
+
+        The accounts are left untouched and projecting stops at the shortfall. A
+        fixed-rate account is solved in closed form between the months its rules
+        change; other queries are projected a few years at a time.
+        """
+        max_date = self._birthdate + relativedelta(years=max_age)
+        shortfall, _ = self._project_balance(name, max_date, stop_at_shortfall=True)
+        return shortfall
+
+    def depletion_age(
+        self, name: Optional[str] = None, max_age: int = SHORTFALL_MAX_AGE
+    ) -> Optional[int]:
+        """
+        Return the age at first_shortfall_date, when an account or with no name
+        the whole portfolio runs out of money, or None if it lasts until max_age.
+        """
+        shortfall = self.first_shortfall_date(name, max_age)
+        return None if shortfall is None else self._current_age(shortfall)
+
+    def balance_at_age(self, target_age: int, name: Optional[str] = None) -> float:
+        """
+        Return an account's balance, or with no name the total of all accounts,
+        once the person reaches an age, without changing the accounts. Accounts
+        are counted from their current date; those opening later add nothing.
+        """
+        target_date = self._birthdate + relativedelta(years=target_age)
+        _, balance = self._project_balance(name, target_date, stop_at_shortfall=False)
+        return balance
+
+    def depletion_ages(self, result: MonteCarloResult) -> np.ndarray:
+        """
+        Return the age at which every path of a simulation first has a negative
+        total balance, NaN for paths that never run out of money.
+        """
+        positions = result.first_shortfall_indices()
+        indices = month_index(result.start_date) + positions
+        days = np.where(positions == 0, result.start_date.day, 1)
+        ages = whole_years(months_between(indices, days, self._birthdate))
+        return np.where(positions >= 0, ages, np.nan)
+
+    def balance_sensitivities(
+        self,
+        target_age: int,
+        ages: Optional[Sequence[int]] = None,
+        mode: str = "forward",
+    ) -> BalanceSensitivities:
+        """
+        Return the total balance once the person reaches target_age, and each of
+        ages before it, with its derivative with respect to every account's
+        annual rate, every contribution rule's amount and annual increase rate
+        and every withdrawal rule's amount, without changing the accounts.
+
+        A rate's derivative shifts the annual rate every month compounds to, for
+        fixed and varying strategies alike. Rules are identified by their index
+        in contribution_rules() and withdrawal_rules(). As in balance_at_age,
+        accounts count from their current date and add nothing before it.
+
+        Every derivative comes from a single projection: "forward" mode carries
+        one tangent per input along it, "adjoint" mode one backward pass per
+        age, which is cheaper for many rules and few ages.
+        """
+        if mode not in SENSITIVITY_MODES:
+            raise ValueError(f"Unknown sensitivity mode '{mode}'.")
+        ages = sorted(set(ages or ()) | {target_age})
+        if ages[-1] > target_age:
+            raise ValueError("Ages must not be after the target age.")
+        target_date = self._birthdate + relativedelta(years=target_age)
+        age_dates = [self._birthdate + relativedelta(years=age) for age in ages]
+        inputs = (
+            [("annual_rate", name) for name in self._accounts]
+            + [("contribution_amount", i) for i in range(len(self._contribution_rules))]
+            + [
+                ("contribution_increase_rate", i)
+                for i in range(len(self._contribution_rules))
+            ]
+            + [("withdrawal_amount", i) for i in range(len(self._withdrawal_rules))]
+        )
+        rows = {label: row for row, label in enumerate(inputs)}
+        balances = np.zeros(len(ages))
+        derivatives = np.zeros((len(inputs), len(ages)))
+        solve = forward_sensitivities if mode == "forward" else adjoint_sensitivities
+
+        for name, account in self._accounts.items():
+            current_date = account.current_date()
+            reached = [i for i, d in enumerate(age_dates) if d >= current_date]
+            if not reached:
+                continue
+            steps = steps_to_reach(current_date, target_date)
+            plan = self._account_plan(name, steps)
+            contributions = [
+                i
+                for i, rule in enumerate(self._contribution_rules)
+                if rule.account_name == name
+            ]
+            withdrawals = [
+                i
+                for i, rule in enumerate(self._withdrawal_rules)
+                if rule.account_name == name
+            ]
+            amounts, increase_rates = rule_flow_derivatives(
+                self._birthdate,
+                *plan_months(current_date, steps),
+                *self._account_rules(name),
+            )
+            growth = 1.0 + plan.strategy.get_monthly_rates(plan.dates())
+
+            # Tangents of this account's own inputs, in the order of its labels
+            labels = (
+                [("annual_rate", name)]
+                + [("contribution_amount", i) for i in contributions]
+                + [("contribution_increase_rate", i) for i in contributions]
+                + [("withdrawal_amount", i) for i in withdrawals]
+            )
+            flow_tangents = np.concatenate(
+                [np.zeros((1, steps)), amounts[:, : len(contributions)].T]
+                + [increase_rates.T, amounts[:, len(contributions) :].T]
+            )
+            log_growth_tangents = np.zeros_like(flow_tangents)
+            log_growth_tangents[0] = log_growth_per_annual_rate(growth)
+
+            values, account_derivatives = solve(
+                plan.opening_amount,
+                plan.net_flows(),
+                growth,
+                flow_tangents,
+                log_growth_tangents,
+                [steps_to_reach(current_date, age_dates[i]) for i in reached],
+            )
+            balances[reached] += values
+            cells = np.ix_([rows[label] for label in labels], reached)
+            derivatives[cells] += account_derivatives
+        return BalanceSensitivities(ages, balances, inputs, derivatives)
+
+    def _project_balance(
+        self, name: Optional[str], target_date: date, stop_at_shortfall: bool
+    ) -> Tuple[Optional[date], float]:
+        """
+        Project an account, or with no name every account, to target_date without
+        changing them. Returns the first date the balance is negative (None if it
+        is not, or if stop_at_shortfall is False) and the balance projection
+        stopped at.
+        """
+        if name is not None:
+            if self._get_account(name).current_date() > target_date:
+                raise ValueError(
+                    f"Account '{name}' is already projected past {target_date}."
+                )
+            names = [name]
+        else:
+            names = [
+                n
+                for n, account in self._accounts.items()
+                if account.current_date() <= target_date
+            ]
+        if not names:
+            return None, 0.0
+        # The month whose opening balance is the one at target_date
+        last_index = month_index(target_date) + (target_date.day != 1)
+        solved = None
+        if len(names) == 1:
+            solved = self._closed_form_balance(names[0], last_index, stop_at_shortfall)
+        if solved is None:
+            solved = self._chunked_balance(names, last_index, stop_at_shortfall)
+        shortfall_index, balance = solved
+        if shortfall_index is None:
+            return None, balance
+        opening = min(self._get_account(n).current_date() for n in names)
+        if shortfall_index == month_index(opening):
+            return opening, balance
+        return month_start(shortfall_index), balance
+
+    def _account_rules(
+        self, name: str
+    ) -> Tuple[List[ContributionRule], List[WithdrawalRule]]:
+        return (
+            [r for r in self._contribution_rules if r.account_name == name],
+            [r for r in self._withdrawal_rules if r.account_name == name],
+        )
+
+    def _closed_form_balance(
+        self, name: str, last_index: int, stop_at_shortfall: bool
+    ) -> Optional[Tuple[Optional[int], float]]:
+        """
+        Return the first month index with a negative opening balance (or None)
+        and the balance at last_index of a fixed-rate account, jumping from one
+        change of its cash flows to the next with constant_flow_balance. None
+        if the account's rate is not fixed.
+        """
+        account = self._get_account(name)
+        strategy = account.strategy()
+        if not isinstance(strategy, FixedInterestStrategy):
+            return None
+        growth = 1 + strategy.get_monthly_rate(account.current_date())
+        if growth <= 0:
+            return None
+        current_date = account.current_date()
+        month, amount = month_index(current_date), account.current_amount()
+        if stop_at_shortfall and amount < 0:
+            return month, amount
+        if month >= last_index:
+            return None, amount
+        contribution_rules, withdrawal_rules = self._account_rules(name)
+        if current_date.day != 1:
+            # An opening month off the first is escalated by its own day
+            plan = build_account_plan(
+                name,
+                current_date,
+                amount,
+                strategy,
+                self._birthdate,
+                contribution_rules,
+                withdrawal_rules,
+                1,
+            )
+            amount = (amount + float(plan.net_flows()[0])) * growth
+            month += 1
+            if stop_at_shortfall and amount < 0:
+                return month, amount
+
+        # Cash flows only change in the months rules start, end or escalate
+        ages = set()
+        for rule in contribution_rules + withdrawal_rules:
+            if getattr(rule, "annual_increase_rate", 0):
+                ages.update(range(rule.start_age, rule.end_age + 1))
+            else:
+                ages.update((rule.start_age, rule.end_age))
+        # On the first of a month the age is reached in the birth month, or in
+        # the month after for birthdays later in the month
+        birth_index = month_index(self._birthdate) + (self._birthdate.day > 1)
+        changes = {birth_index + 12 * age for age in ages}
+        ends = sorted(c for c in changes if month < c < last_index) + [last_index]
+        starts = [month] + ends[:-1]
+        flows, _ = rule_cash_flows(
+            self._birthdate,
+            np.array(starts),
+            np.ones(len(starts), dtype=np.int64),
+            contribution_rules,
+            withdrawal_rules,
+        )
+        for start, end, flow in zip(starts, ends, flows.sum(axis=1).tolist()):
+            if stop_at_shortfall:
+                k = constant_flow_shortfall(amount, flow, growth, end - start)
+                if k is not None:
+                    return start + k, constant_flow_balance(amount, flow, growth, k)
+            amount = constant_flow_balance(amount, flow, growth, end - start)
+        return None, amount
+
+    def _chunked_balance(
+        self, names: Sequence[str], last_index: int, stop_at_shortfall: bool
+    ) -> Tuple[Optional[int], float]:
+        """
+        Return the first month index whose opening total of some accounts is
+        negative (or None) and their total at last_index, projecting all of them
+        on their calendar month grid in chunks of SHORTFALL_CHUNK_MONTHS, then
+        twice as many months each time.
+        """
+        states = {}
+        for name in names:
+            account = self._get_account(name)
+            states[name] = (account.current_date(), account.current_amount())
+        rules = {name: self._account_rules(name) for name in names}
+        first = min(month_index(d) for d, _ in states.values())
+        opening = sum(a for d, a in states.values() if month_index(d) == first)
+        if stop_at_shortfall and opening < 0:
+            return first, opening
+
+        chunk = SHORTFALL_CHUNK_MONTHS
+        while first < last_index:
+            last = min(first + chunk, last_index)
+            # Doubling the chunks bounds the number of passes by the horizon's log
+            chunk *= 2
+            # Opening totals of the months after first up to last
+            totals = np.zeros(last - first)
+            for name, (current_date, amount) in states.items():
+                opened = month_index(current_date)
+                if opened > last:
+                    continue
+                strategy = self._get_account(name).strategy()
+                plan = build_account_plan(
+                    name,
+                    current_date,
+                    amount,
+                    strategy,
+                    self._birthdate,
+                    *rules[name],
+                    last - opened,
+                )
+                rates = strategy.get_monthly_rates(plan.dates())
+                balances = compound(amount, plan.net_flows(), 1.0 + rates)
+                shown = max(opened, first + 1)
+                totals[shown - first - 1 :] += balances[shown - opened :]
+                if last > opened:
+                    states[name] = (month_start(last), float(balances[-1]))
+            if stop_at_shortfall:
+                negative = np.flatnonzero(totals < 0)
+                if len(negative):
+                    return first + 1 + int(negative[0]), float(totals[negative[0]])
+            first = last
+        return None, sum(
+            amount
+            for current_date, amount in states.values()
+            if month_index(current_date) <= last_index
+        )
+
+    def simulate_to_age(
+        self,
+        target_age: int,
+        n_paths: int = 10_000,
+        seed=None,
+        max_workers: Optional[int] = 1,
+        streaming: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None,
+        memmap_path: Optional[str] = None,
+    ) -> Union[MonteCarloResult, MonteCarloSummary]:
+        """
+        Simulate n_paths return scenarios from the current state of every account
+        until the person reaches a specific age, without changing the accounts.
+        Stochastic strategies draw a rate per path and month; deterministic
+        strategies contribute the same path to every scenario.
+
+        With max_workers other than 1 the paths are spread over worker processes
+        (None uses every core); the same seed gives the same paths either way.
+        With streaming=True paths are folded into running statistics batch by
+        batch and a MonteCarloSummary is returned instead of every path.
+        progress(paths completed, n_paths) is called after every batch of paths;
+        it is only supported in-process, with max_workers=1. With memmap_path
+        the paths are written to a .npy file at that path and memory-mapped, so
+        even millions of paths need only the pages in use (see simulate_parallel).
+        """
+        if progress is not None and max_workers != 1:
+            raise ValueError("Progress is only reported with max_workers=1.")
+        if memmap_path is not None and streaming:
+            raise ValueError("Streaming simulations do not keep paths to map.")
+        target_date = self._birthdate + relativedelta(years=target_age)
+        plans = [
+            self._account_plan(
+                name, steps_to_reach(account.current_date(), target_date)
+            )
+            for name, account in self._accounts.items()
+        ]
+        if streaming:
+            if max_workers == 1:
+                return simulate_streaming(plans, n_paths, seed, progress=progress)
+            return simulate_streaming_parallel(
+                plans, n_paths, seed, max_workers=max_workers
+            )
+        if max_workers == 1:
+            return simulate(
+                plans, n_paths, seed, progress=progress, memmap_path=memmap_path
+            )
+        return simulate_parallel(
+            plans, n_paths, seed, max_workers=max_workers, memmap_path=memmap_path
+        )
+
+    def sweep(
+        self,
+        target_age: int,
+        retirement_ages: Optional[Sequence[int]] = None,
+        contribution_amounts: Optional[Sequence[float]] = None,
+        annual_rates: Optional[Sequence[float]] = None,
+        withdrawal_amounts: Optional[Sequence[float]] = None,
+        max_workers: Optional[int] = 1,
+    ) -> pd.DataFrame:
+        """
+        Project every combination of the given parameters from the current state of
+        every account until the person reaches a specific age, without changing
+        the accounts, and return one row per combination (see parameter_sweep).
+
+        Each swept parameter overrides the portfolio for every combination:
+        retirement_ages moves retirement to that age (see _rules_retiring_at),
+        contribution_amounts and withdrawal_amounts replace the monthly amount of
+        every contribution or withdrawal rule (escalation still applies), and
+        annual_rates gives every account a fixed interest rate. Raises ValueError
+        for a retirement age before the person's current age.
+        """
+        target_date = self._birthdate + relativedelta(years=target_age)
+        current_age = self._current_age(
+            min(
+                (account.current_date() for account in self._accounts.values()),
+                default=self._birthdate,
+            )
+        )
+        if retirement_ages and min(retirement_ages) < current_age:
+            raise ValueError("Retirement ages must not be before the current age.")
+        cases = {}
+        for retirement_age in retirement_ages or [None]:
+            contribution_rules, withdrawal_rules = self._rules_retiring_at(
+                retirement_age
+            )
+            contribution_rules = [
+                replace(rule, amount=1.0) if contribution_amounts is not None else rule
+                for rule in contribution_rules
+            ]
+            withdrawal_rules = [
+                replace(rule, amount=1.0) if withdrawal_amounts is not None else rule
+                for rule in withdrawal_rules
+            ]
+            cases[retirement_age] = [
+                self._account_plan(
+                    name,
+                    steps_to_reach(account.current_date(), target_date),
+                    contribution_rules,
+                    withdrawal_rules,
+                )
+                for name, account in self._accounts.items()
+            ]
+        return parameter_sweep(
+            cases,
+            contribution_amounts,
+            annual_rates,
+            withdrawal_amounts,
+            max_workers=max_workers,
+        )
+
+    def _rules_retiring_at(
+        self, retirement_age: Optional[int]
+    ) -> Tuple[List[ContributionRule], List[WithdrawalRule]]:
+        """
+        Return the rules with retirement moved to retirement_age (unchanged for
+        None). The current retirement age is where the last contribution rule
+        ends, or without contributions where the first withdrawal rule starts.
+        Contribution rules ending there, or running past the new age, now end at
+        it; withdrawal rules starting there, or running across the new age, now
+        start at it. Other rules, such as a later stage of a staged drawdown,
+        are kept, and rules left without any years are dropped.
+        """
+        if retirement_age is None:
+            return list(self._contribution_rules), list(self._withdrawal_rules)
+        if self._contribution_rules:
+            current = max(rule.end_age for rule in self._contribution_rules)
+        else:
+            current = min((r.start_age for r in self._withdrawal_rules), default=None)
+
+        contribution_rules = []
+        for rule in self._contribution_rules:
+            end_age = rule.end_age
+            if end_age == current or rule.start_age < retirement_age < end_age:
+                end_age = retirement_age
+            if rule.start_age < end_age:
+                contribution_rules.append(replace(rule, end_age=end_age))
+        withdrawal_rules = []
+        for rule in self._withdrawal_rules:
+            start_age = rule.start_age
+            if start_age == current or start_age < retirement_age < rule.end_age:
+                start_age = retirement_age
+            if start_age < rule.end_age:
+                withdrawal_rules.append(replace(rule, start_age=start_age))
+        return contribution_rules, withdrawal_rules
+
+    def required_contribution(
+        self,
+        account_name: str,
+        target_amount: float,
+        target_age: int,
+        start_age: Optional[int] = None,
+        annual_increase_rate: float = 0.0,
+    ) -> GoalSolution:
+        """
+        Return the monthly amount of an additional contribution rule on an account,
+        from start_age (by default the age at the account's current date) until
+        target_age, for the total balance to reach target_amount at target_age.
+        """
+        account = self._get_account(account_name)
+        if start_age is None:
+            start_age = self._current_age(account.current_date())
+        target_date = self._birthdate + relativedelta(years=target_age)
+
+        def totals(amount: float) -> np.ndarray:
+            rule = ContributionRule(
+                account_name, amount, start_age, target_age, annual_increase_rate
+            )
+            return self._projected_totals(
+                target_date, contribution_rules=self._contribution_rules + [rule]
+            )
+
+        return solve_required_amount(totals, target_amount)
+
+    def max_sustainable_withdrawal(
+        self, account_name: str, start_age: int, end_age: int
+    ) -> GoalSolution:
+        """
+        Return the largest monthly amount an additional withdrawal rule on an
+        account can take from start_age until end_age without the total balance
+        going negative before end_age.
+        """
+        self._get_account(account_name)
+        target_date = self._birthdate + relativedelta(years=end_age)
+
+        def totals(amount: float) -> np.ndarray:
+            rules = self._withdrawal_rules
+            if amount > 0:
+                rules = rules + [
+                    WithdrawalRule(account_name, amount, start_age, end_age)
+                ]
+            return self._projected_totals(target_date, withdrawal_rules=rules)
+
+        return solve_max_amount(totals)
+
+    def _projected_totals(
+        self,
+        target_date: date,
+        contribution_rules: Optional[Sequence[ContributionRule]] = None,
+        withdrawal_rules: Optional[Sequence[WithdrawalRule]] = None,
+    ) -> np.ndarray:
+        """
+        Return the total balance of every calendar month until target_date,
+        without changing the accounts, optionally with other rules.
+        """
+        return projected_totals(
+            [
+                self._account_plan(
+                    name,
+                    steps_to_reach(account.current_date(), target_date),
+                    contribution_rules,
+                    withdrawal_rules,
+                )
+                for name, account in self._accounts.items()
+            ]
+        )
+
+    def _account_plan(
+        self,
+        name: str,
+        steps: int,
+        contribution_rules: Optional[Sequence[ContributionRule]] = None,
+        withdrawal_rules: Optional[Sequence[WithdrawalRule]] = None,
+    ) -> AccountPlan:
+        """
+        Evaluate an account's rules over its next number of months, optionally
+        with other rules than the portfolio's own.
+        """
+        account = self._get_account(name)
+        if contribution_rules is None:
+            contribution_rules = self._contribution_rules
+        if withdrawal_rules is None:
+            withdrawal_rules = self._withdrawal_rules
+        return build_account_plan(
+            name,
+            account.current_date(),
+            account.current_amount(),
+            account.strategy(),
+            self._birthdate,
+            [r for r in contribution_rules if r.account_name == name],
+            [r for r in withdrawal_rules if r.account_name == name],
+            steps,
+        )
 
     def total_balance(self) -> float:
         """Return the total balance across all accounts."""
         return sum(account.current_amount() for account in self._accounts.values())
 
-    def account_history(self, name: str):
-        """Return the transaction history for a specific account."""
-        return self._get_account(name).history()
+    def account_history(self, name: str, as_list: bool = False):
+        """
+        Return the transaction history for a specific account as a read-only view,
+        or as a list of (date, amount) tuples when as_list is True.
+        """
+        return self._get_account(name).history(as_list=as_list)
+
+    def timeseries(self, output: str = "pandas"):
+        """
+        Return the month-end balance of every account and their total, aligned on
+        calendar months, as a pandas DataFrame indexed by date or, with
+        output="arrow", as a pyarrow Table.
+
+        Accounts are NaN before the month they start in and carry their last
+        balance forward once their history ends, so the total is never truncated
+        to the shortest history. Built from the history arrays without
+        materializing per-entry Python objects.
+        """
+        histories = {}
+        for name, account in self._accounts.items():
+            history = account.history()
+            # The current state closes the history in every history mode
+            histories[name] = (
+                np.append(history.month_indices(), month_index(account.current_date())),
+                np.append(history.amounts(), account.current_amount()),
+            )
+        month_indices, columns = align_month_end_balances(histories)
+        return balance_table(month_indices, histories.keys(), columns, output)
 
     def birthdate(self) -> date:
         """Return the person's birthdate."""
@@ -0,0 +1,71 @@
+from datetime import date
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from src.projection.month_grid import month_start
+
+
+class BalanceHistory:
+    """
+    Read-only, zero-copy view of a balance history stored as a month-index array
+    and an amount array. Behaves like a sequence of (date, amount) tuples.
+
+    Histories only ever grow at the end, so a view keeps showing the entries
+    that existed when it was taken.
+    """
+
+    def __init__(
+        self, month_indices: np.ndarray, amounts: np.ndarray, start_date: date
+    ):
+        self._month_indices = month_indices
+        self._amounts = amounts
+        self._start_date = start_date
+
+    def month_indices(self) -> np.ndarray:
+        """Return the month index (year * 12 + month - 1) of every entry."""
+        return self._month_indices
+
+    def amounts(self) -> np.ndarray:
+        """Return the balance after every entry."""
+        return self._amounts
+
+    def dates(self) -> List[date]:
+        """Return the date of every entry."""
+        return [self._date(index) for index in self._month_indices.tolist()]
+
+    def to_list(self) -> List[Tuple[date, float]]:
+        """Return the history as a list of (date, amount) tuples."""
+        return list(zip(self.dates(), self._amounts.tolist()))
+
+    def _date(self, index: int) -> date:
+        start = self._start_date
+        if index == start.year * 12 + start.month - 1:
+            return start
+        return month_start(index)
+
+    def __len__(self) -> int:
+        return len(self._amounts)
+
+    def __getitem__(self, position):
+        if isinstance(position, slice):
+            return BalanceHistory(
+                self._month_indices[position], self._amounts[position], self._start_date
+            )
+        return self._date(int(self._month_indices[position])), float(
+            self._amounts[position]
+        )
+
+    def __iter__(self) -> Iterator[Tuple[date, float]]:
+        return iter(self.to_list())
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, BalanceHistory):
+            other = other.to_list()
+        try:
+            return self.to_list() == list(other)
+        except TypeError:
+            return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"BalanceHistory({self.to_list()!r})"
@@ -1,27 +1,92 @@
+from dataclasses import dataclass
 from datetime import date
-from typing import List, Tuple
-from copy import deepcopy
+from typing import Dict, List, Tuple, Union
 
+import numpy as np
+
+from src.balance.balance_history import BalanceHistory
 from src.interest_strategy.interest_strategy import InterestStrategy
+from src.projection.month_grid import month_index, month_start
+
+_INITIAL_CAPACITY = 16
+
+
+@dataclass
+class BalanceState:
+    """A copy of everything a balance has recorded since its start."""
+
+    month_indices: np.ndarray
+    amounts: np.ndarray
+    current_date: date
+    current_amount: float
+    checkpoints: Dict[int, float]
+
+
+# full: every change; month_end: the last entry of each date;
+# yearly: the last entry of the start date and of every January 1st; none: nothing
+HISTORY_MODES = ("full", "month_end", "yearly", "none")
 
 
 class BalanceWithHistoryAndStrategy:
     def __init__(
-        self, initial_amount: float, start_date: date, strategy: InterestStrategy
+        self,
+        initial_amount: float,
+        start_date: date,
+        strategy: InterestStrategy,
+        history_mode: str = "full",
     ):
-        self._history: List[Tuple[date, float]] = [(start_date, initial_amount)]
         self._initial_amount = initial_amount
         self._start_date = start_date
         self._strategy = strategy
+        self.set_history_mode(history_mode)
+        self.reset()
 
     def current_amount(self) -> float:
-        return self._history[-1][1]
+        return self._current_amount
 
     def current_date(self) -> date:
-        return self._history[-1][0]
+        return self._current_date
+
+    def start_date(self) -> date:
+        return self._start_date
+
+    def initial_amount(self) -> float:
+        return self._initial_amount
 
-    def history(self) -> List[Tuple[date, float]]:
-        return deepcopy(self._history)
+    def steps_taken(self) -> int:
+        """Return how many months the balance has been advanced since its start."""
+        return month_index(self._current_date) - month_index(self._start_date)
+
+    def history(
+        self, as_list: bool = False
+    ) -> Union[BalanceHistory, List[Tuple[date, float]]]:
+        """
+        Return a read-only view of the history without copying it.
+        Pass as_list=True for a list of (date, amount) tuples instead.
+        In the month_end and yearly modes the last entry of a view can still be
+        updated until the balance moves on to the next month.
+        """
+        view = BalanceHistory(
+            self._read_only(self._month_indices),
+            self._read_only(self._amounts),
+            self._start_date,
+        )
+        return view.to_list() if as_list else view
+
+    def strategy(self) -> InterestStrategy:
+        return self._strategy
+
+    def history_mode(self) -> str:
+        return self._history_mode
+
+    def set_history_mode(self, history_mode: str) -> None:
+        """
+        Choose which entries are recorded from now on, one of HISTORY_MODES.
+        The current amount and date are tracked in every mode.
+        """
+        if history_mode not in HISTORY_MODES:
+            raise ValueError(f"Unknown history mode '{history_mode}'.")
+        self._history_mode = history_mode
 
     def add(self, amount: float) -> None:
         if amount < 0:
@@ -34,22 +99,169 @@ class BalanceWithHistoryAndStrategy:
         self._record_change(-amount)
 
     def project_one_month(self) -> None:
-        prev_date, prev_amount = self._history[-1]
-        rate = self._strategy.get_monthly_rate(prev_date)
-        new_date = self._advance_one_month(prev_date)
-        new_amount = prev_amount * (1 + rate)
-        self._history.append((new_date, new_amount))
+        rate = self._strategy.get_monthly_rate(self._current_date)
+        self._current_date = self._advance_one_month(self._current_date)
+        index = month_index(self._current_date)
+        self._append(index, self._current_amount * (1 + rate))
+        if index % 12 == 0:
+            self._checkpoints[index] = self._current_amount
+
+    def extend_history(self, month_indices: np.ndarray, amounts: np.ndarray) -> None:
+        """
+        Append precomputed history entries, e.g. from a vectorized projection.
+        The last entry becomes the current date and amount; only the entries the
+        history mode keeps are recorded. The first entry of every month must be
+        the balance the month opens with, as in a projection.
+        """
+        if len(amounts) == 0:
+            return
+        month_indices, amounts = np.asarray(month_indices), np.asarray(amounts)
+        previous = np.empty_like(month_indices)
+        previous[0] = month_index(self._current_date)
+        previous[1:] = month_indices[:-1]
+        opening = (month_indices != previous) & (month_indices % 12 == 0)
+        self._checkpoints.update(
+            zip(month_indices[opening].tolist(), amounts[opening].tolist())
+        )
+
+        last_index = int(month_indices[-1])
+        if last_index != month_index(self._current_date):
+            self._current_date = month_start(last_index)
+        self._current_amount = float(amounts[-1])
+
+        month_indices, amounts = self._kept_entries(month_indices, amounts)
+        if len(amounts) and self._replaces_last_entry(int(month_indices[0])):
+            self._amounts[self._size - 1] = amounts[0]
+            month_indices, amounts = month_indices[1:], amounts[1:]
+        count = len(amounts)
+        self._reserve(self._size + count)
+        self._month_indices[self._size : self._size + count] = month_indices
+        self._amounts[self._size : self._size + count] = amounts
+        self._size += count
 
     def reset(self) -> None:
         """
         Reset the balance to its initial amount and date, and clear history.
         """
-        self._history = [(self._start_date, self._initial_amount)]
+        # Fresh buffers rather than overwriting, so views handed out earlier stay valid
+        self._month_indices = np.empty(_INITIAL_CAPACITY, dtype=np.int32)
+        self._amounts = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._size = 0
+        # Month index of every January 1st passed -> amount the month opened with
+        self._checkpoints: Dict[int, float] = {}
+        self._current_date = self._start_date
+        self._append(month_index(self._start_date), self._initial_amount)
+
+    def rewind(self, to_date: date) -> None:
+        """
+        Go back to the state at the latest yearly checkpoint (the opening balance
+        of a January 1st) on or before to_date, or to the initial state if there
+        is none, discarding all history and checkpoints after it.
+        """
+        passed = [index for index in self._checkpoints if month_start(index) <= to_date]
+        if not passed:
+            self.reset()
+            return
+        index = max(passed)
+        amount = self._checkpoints[index]
+        size = int(np.searchsorted(self._month_indices[: self._size], index))
+        month_indices, amounts = self._month_indices, self._amounts
+        # Fresh buffers, so views handed out earlier keep their entries
+        self._month_indices = np.empty(len(month_indices), dtype=np.int32)
+        self._amounts = np.empty(len(amounts), dtype=np.float64)
+        self._month_indices[:size] = month_indices[:size]
+        self._amounts[:size] = amounts[:size]
+        self._size = size
+        self._checkpoints = {i: a for i, a in self._checkpoints.items() if i <= index}
+        self._current_date = month_start(index)
+        self._append(index, amount)
+
+    def state(self) -> BalanceState:
+        """Return a copy of the history, current date and amount and checkpoints."""
+        return BalanceState(
+            self._month_indices[: self._size].copy(),
+            self._amounts[: self._size].copy(),
+            self._current_date,
+            self._current_amount,
+            dict(self._checkpoints),
+        )
+
+    def restore(self, state: BalanceState) -> None:
+        """Replace everything recorded with a copy of a state taken by state()."""
+        size = len(state.amounts)
+        self._month_indices = np.empty(max(size, _INITIAL_CAPACITY), dtype=np.int32)
+        self._amounts = np.empty(max(size, _INITIAL_CAPACITY), dtype=np.float64)
+        self._month_indices[:size] = state.month_indices
+        self._amounts[:size] = state.amounts
+        self._size = size
+        self._current_date = state.current_date
+        self._current_amount = state.current_amount
+        self._checkpoints = dict(state.checkpoints)
 
     def _record_change(self, delta: float) -> None:
-        prev_date, prev_amount = self._history[-1]
-        new_amount = prev_amount + delta
-        self._history.append((prev_date, new_amount))
+        self._append(month_index(self._current_date), self._current_amount + delta)
+
+    def _append(self, index: int, amount: float) -> None:
+        self._current_amount = amount
+        if self._history_mode == "none":
+            return
+        if self._history_mode == "yearly" and not self._is_yearly_entry(index):
+            return
+        if self._replaces_last_entry(index):
+            self._amounts[self._size - 1] = amount
+            return
+        if self._size == len(self._amounts):
+            self._reserve(self._size + 1)
+        self._month_indices[self._size] = index
+        self._amounts[self._size] = amount
+        self._size += 1
+
+    def _is_yearly_entry(self, index: int) -> bool:
+        return index % 12 == 0 or index == month_index(self._start_date)
+
+    def _replaces_last_entry(self, index: int) -> bool:
+        """Coalescing modes keep one entry per date by updating the last one."""
+        return (
+            self._history_mode != "full"
+            and self._size > 0
+            and self._month_indices[self._size - 1] == index
+        )
+
+    def _kept_entries(
+        self, month_indices: np.ndarray, amounts: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Filter a run of full-history entries down to those the mode records."""
+        if self._history_mode == "full":
+            return month_indices, amounts
+        keep = np.ones(len(amounts), dtype=bool)
+        if self._history_mode == "none":
+            keep[:] = False
+        else:
+            keep[:-1] = month_indices[1:] != month_indices[:-1]
+        if self._history_mode == "yearly":
+            keep &= (month_indices % 12 == 0) | (
+                month_indices == month_index(self._start_date)
+            )
+        return month_indices[keep], amounts[keep]
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow the history buffers geometrically until they hold capacity entries."""
+        if capacity <= len(self._amounts):
+            return
+        new_capacity = len(self._amounts)
+        while new_capacity < capacity:
+            new_capacity *= 2
+        month_indices = np.empty(new_capacity, dtype=np.int32)
+        amounts = np.empty(new_capacity, dtype=np.float64)
+        month_indices[: self._size] = self._month_indices[: self._size]
+        amounts[: self._size] = self._amounts[: self._size]
+        self._month_indices = month_indices
+        self._amounts = amounts
+
+    def _read_only(self, buffer: np.ndarray) -> np.ndarray:
+        view = buffer[: self._size]
+        view.flags.writeable = False
+        return view
 
     def _advance_one_month(self, d: date) -> date:
         month = d.month % 12 + 1
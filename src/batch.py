@@ -0,0 +1,250 @@
+"""
+Project many client profiles headlessly, e.g.
+
+    python -m src.batch clients.csv results/ --target-age 95 --workers 4
+
+Every input row is one client with the columns client_id (optional), birthdate,
+target_age (optional), accounts, contribution_rules and withdrawal_rules. The
+last three hold JSON lists (or lists, in Parquet) of objects:
+
+    accounts:           {"name", "amount", "start_date", "annual_rate"}
+    contribution_rules: {"account_name", "amount", "start_age", "end_age",
+                         "annual_increase_rate" (optional)}
+    withdrawal_rules:   {"account_name", "amount", "start_age", "end_age"}
+
+The input is read one chunk of rows at a time and chunks are projected in
+worker processes, each writing its own Parquet part file:
+
+    results/part-00000.parquet  client_id, date, account, balance (month ends)
+    errors/part-00000.parquet   client_id, error (only for chunks with failures)
+
+A record that cannot be parsed or projected is written to the errors part
+file instead of aborting the run.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.account_portfolio import (
+    PROJECTION_ENGINES,
+    AccountPortfolio,
+    ContributionRule,
+    WithdrawalRule,
+)
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_TARGET_AGE = 100
+
+RESULT_SCHEMA = pa.schema(
+    [
+        ("client_id", pa.string()),
+        ("date", pa.date32()),
+        ("account", pa.string()),
+        ("balance", pa.float64()),
+    ]
+)
+ERROR_SCHEMA = pa.schema([("client_id", pa.string()), ("error", pa.string())])
+
+
+def read_chunks(path: str, chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Read client records from a CSV or Parquet file, chunk_size rows at a time."""
+    if path.endswith(".parquet"):
+        batches = (
+            batch.to_pandas()
+            for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size)
+        )
+    else:
+        batches = pd.read_csv(path, chunksize=chunk_size, dtype=str)
+    offset = 0
+    for frame in batches:
+        records = frame.to_dict(orient="records")
+        for row, record in enumerate(records, start=offset):
+            if pd.isna(record.get("client_id", np.nan)):
+                record["client_id"] = str(row)
+        offset += len(records)
+        yield records
+
+
+def _parse_date(value) -> date:
+    if isinstance(value, date):
+        return value if type(value) is date else value.date()
+    return date.fromisoformat(str(value))
+
+
+def _parse_list(value) -> List[Dict[str, Any]]:
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    if isinstance(value, str):
+        return json.loads(value) if value.strip() else []
+    return list(value)
+
+
+def build_portfolio(record: Dict[str, Any]) -> AccountPortfolio:
+    """Build the portfolio of one client record."""
+    portfolio = AccountPortfolio(
+        _parse_date(record["birthdate"]), history_mode="month_end"
+    )
+    for account in _parse_list(record.get("accounts")):
+        portfolio.add_account(
+            account["name"],
+            float(account["amount"]),
+            _parse_date(account["start_date"]),
+            FixedInterestStrategy(float(account["annual_rate"])),
+        )
+    for rule in _parse_list(record.get("contribution_rules")):
+        portfolio.add_contribution_rule(ContributionRule(**rule))
+    for rule in _parse_list(record.get("withdrawal_rules")):
+        portfolio.add_withdrawal_rule(WithdrawalRule(**rule))
+    return portfolio
+
+
+def project_record(
+    record: Dict[str, Any], target_age: int, engine: str
+) -> Dict[str, np.ndarray]:
+    """
+    Project one client record and return its month-end balances in long form,
+    one array per column of RESULT_SCHEMA.
+    """
+    if not pd.isna(record.get("target_age", np.nan)):
+        target_age = int(float(record["target_age"]))
+    portfolio = build_portfolio(record)
+    portfolio.project_to_age(target_age, engine=engine)
+    timeseries = portfolio.timeseries()
+    # Every column but the total, skipping months before an account opened
+    balances = timeseries.to_numpy()[:, :-1]
+    opened = ~np.isnan(balances)
+    rows, columns = np.nonzero(opened)
+    return {
+        "client_id": np.full(len(rows), str(record["client_id"]), dtype=object),
+        "date": timeseries.index.to_numpy()[rows].astype("datetime64[D]"),
+        "account": timeseries.columns.to_numpy()[columns],
+        "balance": balances[opened],
+    }
+
+
+def project_chunk(
+    chunk_index: int,
+    records: Sequence[Dict[str, Any]],
+    output: str,
+    target_age: int,
+    engine: str,
+) -> Tuple[int, int, int]:
+    """
+    Project a chunk of records and write its result part file, plus an errors
+    part file if any record failed. Returns the chunk index and the number of
+    records and of failures.
+    """
+    results, errors = [], []
+    for record in records:
+        try:
+            results.append(project_record(record, target_age, engine))
+        except Exception as e:
+            errors.append({"client_id": str(record.get("client_id")), "error": repr(e)})
+
+    part = f"part-{chunk_index:05d}.parquet"
+    columns = [
+        pa.array(
+            np.concatenate([result[field.name] for result in results])
+            if results
+            else [],
+            type=field.type,
+        )
+        for field in RESULT_SCHEMA
+    ]
+    table = pa.Table.from_arrays(columns, schema=RESULT_SCHEMA)
+    pq.write_table(table, os.path.join(output, "results", part))
+    errors_path = os.path.join(output, "errors", part)
+    if errors:
+        pq.write_table(pa.Table.from_pylist(errors, schema=ERROR_SCHEMA), errors_path)
+    elif os.path.exists(errors_path):
+        # Left over from an earlier run into the same directory
+        os.remove(errors_path)
+    return chunk_index, len(records), len(errors)
+
+
+def run(
+    input_path: str,
+    output: str,
+    target_age: int = DEFAULT_TARGET_AGE,
+    engine: str = "vectorized",
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_workers: Optional[int] = None,
+    progress=sys.stderr,
+) -> Tuple[int, int]:
+    """
+    Project every record of input_path into Parquet part files under output and
+    return the number of records and of failures. At most two chunks per worker
+    are read ahead, so memory stays bounded by the chunk size.
+    """
+    if engine not in PROJECTION_ENGINES:
+        raise ValueError(f"Unknown projection engine '{engine}'.")
+    os.makedirs(os.path.join(output, "results"), exist_ok=True)
+    os.makedirs(os.path.join(output, "errors"), exist_ok=True)
+    workers = max_workers or os.cpu_count() or 1
+    done = failed = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = set()
+        chunks = enumerate(read_chunks(input_path, chunk_size))
+        while True:
+            for chunk_index, records in chunks:
+                pending.add(
+                    executor.submit(
+                        project_chunk, chunk_index, records, output, target_age, engine
+                    )
+                )
+                if len(pending) >= 2 * workers:
+                    break
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                chunk_index, records, failures = future.result()
+                done += records
+                failed += failures
+                print(
+                    f"chunk {chunk_index}: {records} records, {failures} failed "
+                    f"({done} done, {failed} failed)",
+                    file=progress,
+                )
+    return done, failed
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.batch",
+        description="Project client profiles from CSV or Parquet to Parquet.",
+    )
+    parser.add_argument("input", help="CSV or .parquet file of client records")
+    parser.add_argument("output", help="directory for the Parquet part files")
+    parser.add_argument("--target-age", type=int, default=DEFAULT_TARGET_AGE)
+    parser.add_argument("--engine", choices=PROJECTION_ENGINES, default="vectorized")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    done, failed = run(
+        args.input,
+        args.output,
+        target_age=args.target_age,
+        engine=args.engine,
+        chunk_size=args.chunk_size,
+        max_workers=args.workers,
+    )
+    print(f"{done} records projected, {failed} failed", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
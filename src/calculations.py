@@ -1,3 +1,8 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+
 def estimate_life_expectancy(age, gender, lifestyle_score) -> int:
     base = 80 if gender == "male" else 84
     adj = int((lifestyle_score - 5) * 1.5)  # crude modifier
@@ -29,3 +34,96 @@ def project_financials(
         drawdown.append(balance)
 
     return total_savings, drawdown
+
+
+def estimate_life_expectancies(ages, genders, lifestyle_scores) -> np.ndarray:
+    """
+    Array version of estimate_life_expectancy for many people at once.
+    Accepts NumPy arrays, pandas Series or anything that broadcasts.
+    """
+    ages = np.asarray(ages)
+    base = np.where(np.asarray(genders) == "male", 80, 84)
+    adj = np.trunc((np.asarray(lifestyle_scores) - 5) * 1.5)
+    return np.minimum(100, np.maximum(ages + 1, base + adj)).astype(int)
+
+
+def project_financials_batch(
+    current_ages,
+    retirement_ages,
+    savings,
+    monthly_savings,
+    monthly_expenses,
+    life_expectancies,
+    growth_rates=0.05,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Array version of project_financials for many households at once, stepping
+    all of them through the years together. Inputs broadcast against each other.
+
+    Returns every household's savings at retirement and its drawdown balances
+    as a households x years array, padded with NaN after its own horizon.
+    """
+    (
+        current_ages,
+        retirement_ages,
+        savings,
+        monthly_savings,
+        monthly_expenses,
+        life_expectancies,
+        growth_rates,
+    ) = np.broadcast_arrays(
+        current_ages,
+        retirement_ages,
+        savings,
+        monthly_savings,
+        monthly_expenses,
+        life_expectancies,
+        growth_rates,
+    )
+    years_to_retire = retirement_ages - current_ages
+    years_post_retirement = life_expectancies - retirement_ages
+    growth = 1 + growth_rates
+
+    # Pre-retirement accumulation, masked once a household has retired
+    total_savings = savings.astype(float)
+    yearly_savings = monthly_savings * 12
+    for year in range(int(np.max(years_to_retire, initial=0))):
+        np.copyto(
+            total_savings,
+            (total_savings + yearly_savings) * growth,
+            where=year < years_to_retire,
+        )
+
+    # Post-retirement depletion, padded once a household's horizon has ended
+    years = int(np.max(years_post_retirement, initial=0))
+    drawdown = np.full(total_savings.shape + (years,), np.nan)
+    balance = total_savings.copy()
+    yearly_expenses = monthly_expenses * 12
+    for year in range(years):
+        balance -= yearly_expenses
+        balance *= growth
+        np.copyto(drawdown[..., year], balance, where=year < years_post_retirement)
+
+    return total_savings, drawdown
+
+
+def summarize_drawdowns(drawdown: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Summarize padded drawdown balances from project_financials_batch per household:
+    the balance at life expectancy, the lowest balance (both NaN without any
+    drawdown years) and the first drawdown year with a negative balance
+    (-1 if the savings last).
+    """
+    drawdown = np.asarray(drawdown, dtype=float)
+    years = drawdown.shape[-1] - np.isnan(drawdown).sum(axis=-1)
+    last = np.take_along_axis(
+        drawdown, np.maximum(years - 1, 0)[..., np.newaxis], axis=-1
+    )[..., 0]
+    # fmin skips the NaN padding
+    lowest = np.fmin.reduce(drawdown, axis=-1, initial=np.inf)
+    negative = drawdown < 0
+    return {
+        "final_balance": np.where(years > 0, last, np.nan),
+        "min_balance": np.where(years > 0, lowest, np.nan),
+        "depletion_year": np.where(negative.any(axis=-1), negative.argmax(axis=-1), -1),
+    }
@@ -0,0 +1,272 @@
+import math
+from dataclasses import dataclass
+from typing import Callable, Sequence
+
+import numpy as np
+
+from src.calculations import project_financials
+from src.projection.account_plan import AccountPlan
+from src.projection.monte_carlo import simulation_grid
+from src.projection.vectorized_projection import compound
+
+# Goals are met to within a hundredth of a cent
+DEFAULT_TOLERANCE = 1e-4
+MAX_EVALUATIONS = 100
+
+
+@dataclass
+class GoalSolution:
+    """
+    Result of a goal solver: the solved monthly amount, how many projections
+    were evaluated to find it, and whether it came from closed-form math
+    ("closed_form") or bracketed root-finding ("root_finding").
+    """
+
+    value: float
+    evaluations: int
+    method: str
+
+
+def find_root(
+    function: Callable[[float], float],
+    low: float,
+    high: float,
+    tolerance: float = DEFAULT_TOLERANCE,
+    max_evaluations: int = MAX_EVALUATIONS,
+) -> GoalSolution:
+    """
+    Find where a continuous function crosses zero between low and high with the
+    Illinois variant of regula falsi. Affine functions are solved by the first
+    interpolation, piecewise-linear ones in a handful of evaluations.
+    """
+    f_low, f_high = function(low), function(high)
+    evaluations = 2
+    if f_low == 0:
+        return GoalSolution(low, evaluations, "root_finding")
+    if f_high == 0:
+        return GoalSolution(high, evaluations, "root_finding")
+    if (f_low > 0) == (f_high > 0):
+        raise ValueError("The goal is not bracketed by the search interval.")
+
+    side = 0
+    while evaluations < max_evaluations:
+        x = (low * f_high - high * f_low) / (f_high - f_low)
+        f_x = function(x)
+        evaluations += 1
+        if abs(f_x) <= tolerance or abs(high - low) <= tolerance:
+            return GoalSolution(x, evaluations, "root_finding")
+        if (f_x > 0) == (f_high > 0):
+            high, f_high = x, f_x
+            if side == -1:
+                f_low /= 2
+            side = -1
+        else:
+            low, f_low = x, f_x
+            if side == 1:
+                f_high /= 2
+            side = 1
+    raise ValueError("Goal solver did not converge.")
+
+
+def find_amount(
+    function: Callable[[float], float],
+    tolerance: float = DEFAULT_TOLERANCE,
+    max_evaluations: int = MAX_EVALUATIONS,
+) -> GoalSolution:
+    """
+    Find the non-negative amount where a monotonic function crosses zero,
+    doubling the upper end of the search interval until it brackets the root.
+    """
+    f_zero = function(0.0)
+    high = 1.0
+    evaluations = 1
+    while (function(high) > 0) == (f_zero > 0):
+        evaluations += 1
+        high *= 2
+        if evaluations >= max_evaluations or not math.isfinite(high):
+            raise ValueError("No amount reaches the goal.")
+    solution = find_root(
+        function, 0.0, high, tolerance, max_evaluations - evaluations - 1
+    )
+    solution.evaluations += evaluations + 1
+    return solution
+
+
+def _geometric_sum(growth: float, years: int) -> float:
+    """Return growth + growth**2 + ... + growth**years."""
+    if growth == 1:
+        return float(years)
+    return growth * (growth**years - 1) / (growth - 1)
+
+
+def required_monthly_savings(
+    current_age,
+    retirement_age,
+    savings,
+    target_savings,
+    growth_rate=0.05,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> GoalSolution:
+    """
+    Return the monthly savings project_financials needs to reach target_savings
+    at retirement, from the closed-form future value of an annuity:
+    savings * g**n + 12 * monthly * (g + g**2 + ... + g**n) with g = 1 + growth_rate.
+    Zero if the current savings already grow to the target.
+    """
+    years = retirement_age - current_age
+    if years <= 0:
+        raise ValueError("Retirement age must be after the current age.")
+
+    def residual(monthly_savings: float) -> float:
+        total_savings, _ = project_financials(
+            current_age,
+            retirement_age,
+            savings,
+            monthly_savings,
+            0,
+            retirement_age,
+            growth_rate,
+        )
+        return total_savings - target_savings
+
+    growth = 1 + growth_rate
+    annuity = 12 * _geometric_sum(growth, years)
+    with np.errstate(all="ignore"):
+        candidate = max((target_savings - savings * growth**years) / annuity, 0.0)
+    return _verified(candidate, residual, tolerance, increasing=True)
+
+
+def max_monthly_expenses(
+    current_age,
+    retirement_age,
+    savings,
+    monthly_savings,
+    life_expectancy,
+    growth_rate=0.05,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> GoalSolution:
+    """
+    Return the largest monthly expenses for which the drawdown of
+    project_financials stays non-negative until life expectancy, from the
+    closed-form present value of an annuity.
+    """
+    years = life_expectancy - retirement_age
+    if years <= 0:
+        raise ValueError("Life expectancy must be after the retirement age.")
+
+    def residual(monthly_expenses: float) -> float:
+        _, drawdown = project_financials(
+            current_age,
+            retirement_age,
+            savings,
+            monthly_savings,
+            monthly_expenses,
+            life_expectancy,
+            growth_rate,
+        )
+        return min(drawdown)
+
+    total_savings, _ = project_financials(
+        current_age,
+        retirement_age,
+        savings,
+        monthly_savings,
+        0,
+        retirement_age,
+        growth_rate,
+    )
+    if total_savings < 0:
+        raise ValueError("Savings are depleted before retirement.")
+    growth = 1 + growth_rate
+    with np.errstate(all="ignore"):
+        candidate = total_savings * growth**years / (12 * _geometric_sum(growth, years))
+    return _verified(candidate, residual, tolerance, increasing=False)
+
+
+def projected_totals(plans: Sequence[AccountPlan]) -> np.ndarray:
+    """
+    Return the deterministic portfolio total of a set of account plans on their
+    calendar month grid, with the vectorized projection kernel.
+    """
+    _, first_index, months = simulation_grid(plans)
+    total = np.zeros(months)
+    for plan in plans:
+        rates = plan.strategy.get_monthly_rates(plan.dates())
+        balances = compound(plan.opening_amount, plan.net_flows(), 1.0 + rates)
+        offset = plan.first_index() - first_index
+        end = offset + plan.steps() + 1
+        total[offset:end] += balances
+        total[end:] += balances[-1]
+    return total
+
+
+def solve_required_amount(
+    totals: Callable[[float], np.ndarray],
+    target_amount: float,
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> GoalSolution:
+    """
+    Return the smallest non-negative amount for which the last month of
+    totals(amount) reaches target_amount. Totals are affine in the amount of a
+    rule, so two projections give the answer in closed form.
+    """
+    base, unit = totals(0.0)[-1], totals(1.0)[-1]
+    if unit == base:
+        raise ValueError("The rule is never active before the target age.")
+    candidate = max(float((target_amount - base) / (unit - base)), 0.0)
+
+    def residual(amount: float) -> float:
+        return totals(amount)[-1] - target_amount
+
+    solution = _verified(candidate, residual, tolerance, increasing=True)
+    solution.evaluations += 2
+    return solution
+
+
+def solve_max_amount(
+    totals: Callable[[float], np.ndarray], tolerance: float = DEFAULT_TOLERANCE
+) -> GoalSolution:
+    """
+    Return the largest amount for which totals(amount) stays non-negative in
+    every month. Each month is affine in the amount, so two projections give
+    the answer in closed form as the tightest of the monthly limits.
+    """
+    base = totals(0.0)
+    if np.any(base < 0):
+        raise ValueError("The portfolio is depleted even without the withdrawal.")
+    slope = totals(1.0) - base
+    limited = slope < 0
+    if not np.any(limited):
+        raise ValueError("The rule is never active before the end age.")
+    candidate = float(np.min(base[limited] / -slope[limited]))
+
+    def residual(amount: float) -> float:
+        return float(np.min(totals(amount)))
+
+    solution = _verified(candidate, residual, tolerance, increasing=False)
+    solution.evaluations += 2
+    return solution
+
+
+def _verified(
+    candidate: float,
+    residual: Callable[[float], float],
+    tolerance: float,
+    increasing: bool,
+) -> GoalSolution:
+    """
+    Check a closed-form candidate with one projection and fall back to
+    bracketed root-finding if it misses the goal by more than the tolerance.
+    """
+    evaluations = 0
+    if math.isfinite(candidate):
+        error = residual(candidate)
+        evaluations += 1
+        if candidate == 0 and (error >= 0) == increasing:
+            # The goal holds without any amount
+            return GoalSolution(0.0, evaluations, "closed_form")
+        if abs(error) <= tolerance:
+            return GoalSolution(candidate, evaluations, "closed_form")
+    solution = find_amount(residual, tolerance)
+    solution.evaluations += evaluations
+    return solution
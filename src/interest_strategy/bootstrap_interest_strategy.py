@@ -0,0 +1,120 @@
+import os
+from datetime import date
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from src.interest_strategy.interest_strategy import InterestStrategy
+from src.projection.month_grid import month_index
+
+DEFAULT_BLOCK_SIZE = 12
+
+
+def save_return_series(path: str, monthly_returns: Sequence[float]) -> None:
+    """
+    Store a historical series of monthly returns in the .npy format of float64
+    BootstrapInterestStrategy memory-maps, at exactly the given path (np.save
+    would add a .npy suffix the strategy then would not find).
+    """
+    returns = np.asarray(monthly_returns, dtype=np.float64)
+    if returns.ndim != 1:
+        raise ValueError("Return series must be one-dimensional.")
+    with open(path, "wb") as f:
+        np.save(f, returns)
+
+
+class BootstrapInterestStrategy(InterestStrategy):
+    """
+    A stochastic interest strategy that replays a historical series of monthly
+    returns with a circular block bootstrap: each path is made of blocks of
+    block_size consecutive historical months starting at random positions, so
+    the autocorrelation within a block is preserved.
+
+    The series is memory-mapped from a .npy file (see save_return_series)
+    instead of being loaded, and pickling only carries the path, so worker
+    processes map the same file and share its pages without copies.
+
+    get_monthly_rate returns one reproducible scenario: the block covering a
+    month only depends on the seed and the month, not on the order of the calls.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        seed: Optional[int] = None,
+    ):
+        if block_size < 1:
+            raise ValueError("Block size must be at least one month.")
+        self._path = os.path.abspath(path)
+        self._block_size = block_size
+        self._entropy = np.random.SeedSequence(seed).entropy
+        self._returns = self._open(self._path)
+        if len(self._returns) < block_size:
+            raise ValueError("Return series must be at least one block long.")
+        if np.any(self._returns <= -1):
+            raise ValueError("Monthly returns must be greater than -100%")
+
+    @staticmethod
+    def _open(path: str) -> np.ndarray:
+        returns = np.load(path, mmap_mode="r")
+        if returns.ndim != 1 or returns.dtype != np.float64:
+            raise ValueError("Return series must be a one-dimensional float64 array.")
+        return returns
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_returns"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._returns = self._open(self._path)
+
+    def _block_start(self, block: int) -> int:
+        rng = np.random.default_rng([self._entropy, block])
+        return int(rng.integers(len(self._returns)))
+
+    def get_monthly_rate(self, current_date: date) -> float:
+        """
+        Returns the rate of this strategy's reproducible scenario for the month
+        of current_date.
+        """
+        block, offset = divmod(month_index(current_date), self._block_size)
+        position = (self._block_start(block) + offset) % len(self._returns)
+        return float(self._returns[position])
+
+    def get_monthly_rates(self, dates: Sequence[date]) -> np.ndarray:
+        """Returns the reproducible scenario's rates, drawing each block once."""
+        month_indices = np.fromiter(
+            (month_index(d) for d in dates), dtype=np.int64, count=len(dates)
+        )
+        blocks, offsets = np.divmod(month_indices, self._block_size)
+        unique_blocks, inverse = np.unique(blocks, return_inverse=True)
+        starts = np.array([self._block_start(b) for b in unique_blocks], dtype=np.int64)
+        positions = (starts[inverse] + offsets) % len(self._returns)
+        return np.asarray(self._returns[positions], dtype=np.float64)
+
+    def sample_monthly_rates(
+        self, dates: Sequence[date], n_paths: int, rng: np.random.Generator
+    ) -> np.ndarray:
+        """
+        Returns block-bootstrapped monthly rates of shape (n_paths, len(dates)),
+        with blocks starting at the first date, drawn for every path at once.
+        """
+        months = len(dates)
+        blocks = -(-months // self._block_size)
+        starts = rng.integers(len(self._returns), size=(n_paths, blocks))
+        positions = starts[:, :, np.newaxis] + np.arange(self._block_size)
+        positions = positions.reshape(n_paths, blocks * self._block_size)[:, :months]
+        positions %= len(self._returns)
+        return np.asarray(self._returns[positions])
+
+    def spec(self) -> Dict[str, Any]:
+        """The series is identified by its path, so it must not change in place."""
+        return {
+            "type": "bootstrap",
+            "path": self._path,
+            "block_size": self._block_size,
+            "seed": self._entropy,
+        }
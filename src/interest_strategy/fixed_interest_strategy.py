@@ -1,5 +1,8 @@
 import math
 from datetime import date
+from typing import Any, Dict, Sequence
+
+import numpy as np
 
 from src.interest_strategy.interest_strategy import InterestStrategy
 
@@ -24,3 +27,12 @@ class FixedInterestStrategy(InterestStrategy):
         The current_date parameter is ignored in this implementation.
         """
         return self._monthly_rate
+
+    def get_monthly_rates(self, dates: Sequence[date]) -> np.ndarray:
+        """
+        Returns the fixed monthly rate for every date, without looking at the dates.
+        """
+        return np.full(len(dates), self._monthly_rate)
+
+    def spec(self) -> Dict[str, Any]:
+        return {"type": "fixed", "annual_rate": float(self._annual_rate)}
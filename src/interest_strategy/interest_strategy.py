@@ -1,8 +1,38 @@
 from abc import ABC, abstractmethod
 from datetime import date
+from typing import Any, Dict, Sequence
+
+import numpy as np
 
 
 class InterestStrategy(ABC):
     @abstractmethod
     def get_monthly_rate(self, current_date: date) -> float:
         pass
+
+    def get_monthly_rates(self, dates: Sequence[date]) -> np.ndarray:
+        """
+        Returns the monthly rates for a sequence of dates as a float array.
+        Falls back to get_monthly_rate per date; subclasses can override this
+        to compute a whole horizon at once.
+        """
+        return np.fromiter(
+            (self.get_monthly_rate(d) for d in dates), dtype=float, count=len(dates)
+        )
+
+    def sample_monthly_rates(
+        self, dates: Sequence[date], n_paths: int, rng: np.random.Generator
+    ) -> np.ndarray:
+        """
+        Returns simulated monthly rates for n_paths scenarios as an array that
+        broadcasts to (n_paths, len(dates)). Deterministic strategies return their
+        single path as one row; stochastic strategies override this.
+        """
+        return self.get_monthly_rates(dates)[np.newaxis, :]
+
+    @abstractmethod
+    def spec(self) -> Dict[str, Any]:
+        """
+        Returns the strategy type and the parameters it was created with, as a
+        JSON-serializable dict that identifies the rates it produces.
+        """
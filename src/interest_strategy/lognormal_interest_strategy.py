@@ -0,0 +1,62 @@
+import math
+from datetime import date
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from src.interest_strategy.interest_strategy import InterestStrategy
+
+
+class LognormalInterestStrategy(InterestStrategy):
+    """
+    A stochastic interest strategy with normally distributed monthly log returns.
+    The drift is chosen so that the expected growth over a year equals the
+    annual mean rate; the annual volatility is scaled to months by sqrt(12).
+
+    get_monthly_rate returns one reproducible scenario: the rate for a month only
+    depends on the seed and the month, not on the order of the calls.
+    """
+
+    def __init__(
+        self, annual_mean: float, annual_volatility: float, seed: Optional[int] = None
+    ):
+        if annual_mean is None or math.isnan(annual_mean):
+            raise ValueError("Annual mean must be a valid number.")
+        if annual_mean <= -1:
+            raise ValueError("Annual mean must be greater than -100%")
+        if annual_volatility is None or not annual_volatility >= 0:
+            raise ValueError("Annual volatility must be a non-negative number.")
+        self._annual_mean = annual_mean
+        self._annual_volatility = annual_volatility
+        self._sigma = annual_volatility / math.sqrt(12)
+        self._mu = math.log1p(annual_mean) / 12 - self._sigma**2 / 2
+        self._entropy = np.random.SeedSequence(seed).entropy
+
+    def get_monthly_rate(self, current_date: date) -> float:
+        """
+        Returns the rate of this strategy's reproducible scenario for the month
+        of current_date.
+        """
+        month = current_date.year * 12 + current_date.month - 1
+        rng = np.random.default_rng([self._entropy, month])
+        return math.expm1(rng.normal(self._mu, self._sigma))
+
+    def sample_monthly_rates(
+        self, dates: Sequence[date], n_paths: int, rng: np.random.Generator
+    ) -> np.ndarray:
+        """
+        Returns independent lognormal monthly rates of shape (n_paths, len(dates)).
+        """
+        log_returns = rng.standard_normal((n_paths, len(dates)))
+        log_returns *= self._sigma
+        log_returns += self._mu
+        return np.expm1(log_returns, out=log_returns)
+
+    def spec(self) -> Dict[str, Any]:
+        """The seed is the entropy of the scenario, so a spec recreates the same rates."""
+        return {
+            "type": "lognormal",
+            "annual_mean": float(self._annual_mean),
+            "annual_volatility": float(self._annual_volatility),
+            "seed": self._entropy,
+        }
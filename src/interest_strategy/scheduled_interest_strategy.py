@@ -0,0 +1,89 @@
+import math
+from datetime import date
+from typing import Any, Dict, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.interest_strategy.interest_strategy import InterestStrategy
+from src.projection.month_grid import month_index, month_start
+
+
+class ScheduledInterestStrategy(InterestStrategy):
+    """
+    An interest strategy whose rate follows a schedule, such as a glide path
+    stepping down towards retirement or a table of historical rates.
+
+    The schedule is a list of (start_date, rate) segments: every rate applies
+    from the month of its start date until the month the next segment starts,
+    the first rate also applies before the schedule and the last one after it.
+    Rates are annual rates compounded monthly, or monthly rates with
+    monthly=True. The schedule is expanded into one rate per month up front,
+    so a lookup costs the same for any number of segments.
+    """
+
+    def __init__(
+        self,
+        segments: Sequence[Tuple[Union[date, str], float]],
+        monthly: bool = False,
+    ):
+        if not segments:
+            raise ValueError("Schedule must have at least one segment.")
+        starts, rates = [], []
+        for start_date, rate in segments:
+            if isinstance(start_date, str):
+                start_date = date.fromisoformat(start_date)
+            if rate is None or math.isnan(rate):
+                raise ValueError("Scheduled rates must be valid numbers.")
+            if rate < -1:
+                raise ValueError("Scheduled rates must be greater than -100%")
+            starts.append(month_index(start_date))
+            rates.append(float(rate))
+        if any(later <= earlier for earlier, later in zip(starts, starts[1:])):
+            raise ValueError("Segments must start in increasing months.")
+        self._segments = [(month_start(s), r) for s, r in zip(starts, rates)]
+        self._monthly = monthly
+        self._first_month = starts[0]
+
+        segment_rates = np.array(rates)
+        if not monthly:
+            segment_rates = (1 + segment_rates) ** (1 / 12) - 1
+        # Dense table with one monthly rate per month from the first to the last segment
+        lengths = np.diff(starts + [starts[-1] + 1])
+        self._table = np.repeat(segment_rates, lengths)
+        # Indexing a list of floats is much faster than a numpy scalar lookup
+        self._table_list = self._table.tolist()
+
+    @classmethod
+    def from_monthly_rates(
+        cls, start_date: date, monthly_rates: Sequence[float]
+    ) -> "ScheduledInterestStrategy":
+        """Create a schedule from a table of monthly rates, one per month from start_date."""
+        first = month_index(start_date)
+        return cls(
+            [(month_start(first + k), rate) for k, rate in enumerate(monthly_rates)],
+            monthly=True,
+        )
+
+    def monthly_rates_for_months(self, month_indices: np.ndarray) -> np.ndarray:
+        """Returns the monthly rate for every month index, in one table lookup."""
+        positions = np.asarray(month_indices, dtype=np.int64) - self._first_month
+        return self._table[np.clip(positions, 0, len(self._table) - 1)]
+
+    def get_monthly_rate(self, current_date: date) -> float:
+        """Returns the monthly rate of the schedule for the month of current_date."""
+        position = month_index(current_date) - self._first_month
+        return self._table_list[min(max(position, 0), len(self._table_list) - 1)]
+
+    def get_monthly_rates(self, dates: Sequence[date]) -> np.ndarray:
+        """Returns the scheduled monthly rate for every date."""
+        month_indices = np.fromiter(
+            (month_index(d) for d in dates), dtype=np.int64, count=len(dates)
+        )
+        return self.monthly_rates_for_months(month_indices)
+
+    def spec(self) -> Dict[str, Any]:
+        return {
+            "type": "scheduled",
+            "segments": [[start.isoformat(), rate] for start, rate in self._segments],
+            "monthly": self._monthly,
+        }
@@ -0,0 +1,38 @@
+from typing import Any, Dict, Type
+
+from src.interest_strategy.bootstrap_interest_strategy import (
+    BootstrapInterestStrategy,
+)
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.interest_strategy.interest_strategy import InterestStrategy
+from src.interest_strategy.lognormal_interest_strategy import (
+    LognormalInterestStrategy,
+)
+from src.interest_strategy.scheduled_interest_strategy import (
+    ScheduledInterestStrategy,
+)
+
+# Strategy type of a spec -> class created from the remaining spec parameters
+STRATEGY_TYPES: Dict[str, Type[InterestStrategy]] = {
+    "bootstrap": BootstrapInterestStrategy,
+    "fixed": FixedInterestStrategy,
+    "lognormal": LognormalInterestStrategy,
+    "scheduled": ScheduledInterestStrategy,
+}
+
+
+def register_strategy(type_name: str, strategy_class: Type[InterestStrategy]) -> None:
+    """Make strategy_from_spec create strategy_class for specs of type_name."""
+    STRATEGY_TYPES[type_name] = strategy_class
+
+
+def strategy_from_spec(spec: Dict[str, Any]) -> InterestStrategy:
+    """
+    Create the strategy described by the dict of a strategy's spec(), passing
+    every parameter but the type to the registered class.
+    """
+    parameters = dict(spec)
+    type_name = parameters.pop("type", None)
+    if type_name not in STRATEGY_TYPES:
+        raise ValueError(f"Unknown interest strategy type '{type_name}'.")
+    return STRATEGY_TYPES[type_name](**parameters)
@@ -0,0 +1,154 @@
+"""
+Run projections in the background, so long horizons, Monte Carlo simulations
+and sweeps do not block the caller, e.g. the Streamlit script thread:
+
+    runner = JobRunner()
+    job = runner.submit(session_id, portfolio.project_to_age, 100)
+    job.progress()  # (months completed, total months)
+
+Every job belongs to a key such as a UI session. Submitting a new job for a key
+cancels the job it supersedes instead of queuing behind it.
+"""
+
+import threading
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+
+DEFAULT_MAX_WORKERS = 2
+
+JOB_STATES = ("pending", "running", "done", "failed", "cancelled")
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's function when it reports progress after cancellation."""
+
+
+class Job:
+    """
+    A function running in a JobRunner worker thread. The function receives the
+    job's report method as its progress keyword argument and calls it with the
+    work completed so far and the total; once the job is cancelled, report raises
+    JobCancelled, so the function stops at its next progress report.
+    """
+
+    def __init__(self, key: str):
+        self._key = key
+        self._cancel_requested = threading.Event()
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._total: Optional[int] = None
+        self._future: Optional[Future] = None
+
+    def key(self) -> str:
+        """Return the key the job was submitted for."""
+        return self._key
+
+    def report(self, completed: int, total: int) -> None:
+        """Record progress; raises JobCancelled if the job has been cancelled."""
+        with self._lock:
+            self._completed = completed
+            self._total = total
+        if self._cancel_requested.is_set():
+            raise JobCancelled(f"Job for '{self._key}' was cancelled.")
+
+    def progress(self) -> Tuple[int, Optional[int]]:
+        """Return the last reported work completed and total (None before any report)."""
+        with self._lock:
+            return self._completed, self._total
+
+    def fraction(self) -> float:
+        """Return the fraction of the work completed, 1.0 once the job is done."""
+        if self.state() == "done":
+            return 1.0
+        completed, total = self.progress()
+        return min(completed / total, 1.0) if total else 0.0
+
+    def cancel(self) -> None:
+        """Ask the job to stop; a job that has not started yet never runs."""
+        self._cancel_requested.set()
+        if self._future is not None:
+            self._future.cancel()
+
+    def state(self) -> str:
+        """Return the state of the job, one of JOB_STATES."""
+        future = self._future
+        if future is None or not future.done():
+            if future is not None and future.running():
+                return "running"
+            return "pending"
+        if future.cancelled() or isinstance(future.exception(), JobCancelled):
+            return "cancelled"
+        return "failed" if future.exception() is not None else "done"
+
+    def done(self) -> bool:
+        """Return whether the job finished, failed or was cancelled."""
+        return self._future is not None and self._future.done()
+
+    def error(self) -> Optional[BaseException]:
+        """Return the exception a failed job raised, or None."""
+        if self.state() != "failed":
+            return None
+        return self._future.exception()
+
+    def result(self, timeout: Optional[float] = None) -> Any:
+        """
+        Wait for the job and return what its function returned. Raises the
+        function's exception if it failed, and JobCancelled if it was cancelled.
+        """
+        try:
+            return self._future.result(timeout)
+        except CancelledError:
+            raise JobCancelled(f"Job for '{self._key}' was cancelled.") from None
+
+
+class JobRunner:
+    """
+    Runs jobs in a pool of worker threads and keeps the latest job of every key.
+    Threads share memory with the caller, so progress can be polled without any
+    inter-process communication; a job's function can still spread its work over
+    processes, as with simulate_to_age(max_workers=...).
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS):
+        if max_workers < 1:
+            raise ValueError("Job runner needs at least one worker.")
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="projection-job"
+        )
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, key: str, function: Callable[..., Any], *args, **kwargs) -> Job:
+        """
+        Run function(*args, progress=job.report, **kwargs) in the background as
+        the job of key, cancelling the job of key it supersedes.
+        """
+        job = Job(key)
+        with self._lock:
+            stale = self._jobs.get(key)
+            if stale is not None:
+                stale.cancel()
+            job._future = self._executor.submit(
+                function, *args, progress=job.report, **kwargs
+            )
+            self._jobs[key] = job
+        return job
+
+    def job(self, key: str) -> Optional[Job]:
+        """Return the latest job submitted for key, or None."""
+        with self._lock:
+            return self._jobs.get(key)
+
+    def cancel(self, key: str) -> None:
+        """Cancel the latest job of key, if any."""
+        job = self.job(key)
+        if job is not None:
+            job.cancel()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Cancel every job and stop the worker threads."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        self._executor.shutdown(wait=wait)
@@ -0,0 +1,308 @@
+from datetime import date
+from typing import TYPE_CHECKING, List, Sequence, Tuple
+
+import numpy as np
+
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.interest_strategy.interest_strategy import InterestStrategy
+from src.projection.month_grid import (
+    days_in_month,
+    month_dates,
+    month_index,
+    month_start,
+    months_between_indices,
+    whole_years,
+)
+
+if TYPE_CHECKING:
+    from src.account_portfolio import (
+        AccountPortfolio,
+        ContributionRule,
+        WithdrawalRule,
+    )
+
+# (name, current amount, current date, strategy) of an account
+AccountState = Tuple[str, float, date, InterestStrategy]
+
+
+class PortfolioBatch:
+    """
+    Many portfolios stored as struct-of-arrays: balances, dates, fixed monthly
+    rates and rule parameters live in NumPy arrays indexed by portfolio and
+    account slot (portfolios with fewer accounts leave slots unused), and every
+    portfolio advances through a shared month loop with vectorized steps.
+
+    Projections follow AccountPortfolio.project_to_date: all accounts of a
+    portfolio move in lockstep until the last reaches the target, with rules
+    applied by age in the order they were added. The balances are identical to
+    the month-by-month loop of each portfolio. No history is recorded.
+    """
+
+    def __init__(
+        self,
+        birthdates: Sequence[date],
+        accounts: Sequence[Sequence[AccountState]],
+        contribution_rules: Sequence[Sequence["ContributionRule"]],
+        withdrawal_rules: Sequence[Sequence["WithdrawalRule"]],
+    ):
+        lengths = {len(birthdates), len(accounts)}
+        lengths |= {len(contribution_rules), len(withdrawal_rules)}
+        if len(lengths) > 1:
+            raise ValueError("Every portfolio needs a birthdate, accounts and rules.")
+        portfolios = len(birthdates)
+        slots = max((len(a) for a in accounts), default=0)
+        self._names: List[List[str]] = [[n for n, _, _, _ in a] for a in accounts]
+        self._birth_indices = np.array([month_index(b) for b in birthdates], np.int64)
+        self._birth_days = np.array([b.day for b in birthdates], dtype=np.int64)
+        self._valid = np.zeros((portfolios, slots), dtype=bool)
+        self._amounts = np.zeros((portfolios, slots))
+        self._indices = np.zeros((portfolios, slots), dtype=np.int64)
+        self._days = np.ones((portfolios, slots), dtype=np.int64)
+        # Monthly rate of fixed strategies, NaN for slots with other strategies
+        self._fixed_rates = np.zeros((portfolios, slots))
+        self._strategies: List[Tuple[int, InterestStrategy]] = []
+        for p, portfolio_accounts in enumerate(accounts):
+            for a, (name, amount, current_date, strategy) in enumerate(
+                portfolio_accounts
+            ):
+                self._valid[p, a] = True
+                self._amounts[p, a] = amount
+                self._indices[p, a] = month_index(current_date)
+                self._days[p, a] = current_date.day
+                if isinstance(strategy, FixedInterestStrategy):
+                    self._fixed_rates[p, a] = strategy.get_monthly_rate(current_date)
+                else:
+                    self._fixed_rates[p, a] = np.nan
+                    self._strategies.append((p * slots + a, strategy))
+        self._compile_rules(contribution_rules, withdrawal_rules)
+
+    @classmethod
+    def from_portfolios(
+        cls, portfolios: Sequence["AccountPortfolio"]
+    ) -> "PortfolioBatch":
+        """Create a batch from the current state of portfolios, which stay untouched."""
+        return cls(
+            [portfolio.birthdate() for portfolio in portfolios],
+            [
+                [
+                    (
+                        name,
+                        portfolio.get_balance(name),
+                        portfolio.get_current_date(name),
+                        portfolio.get_strategy(name),
+                    )
+                    for name in portfolio.get_account_names()
+                ]
+                for portfolio in portfolios
+            ],
+            [portfolio.contribution_rules() for portfolio in portfolios],
+            [portfolio.withdrawal_rules() for portfolio in portfolios],
+        )
+
+    def _compile_rules(
+        self,
+        contribution_rules: Sequence[Sequence["ContributionRule"]],
+        withdrawal_rules: Sequence[Sequence["WithdrawalRule"]],
+    ) -> None:
+        """
+        Flatten the rules into arrays sorted by the order they apply in within an
+        account slot (its rank): contributions, then withdrawals, in the order
+        they were added. Rules of the same rank touch distinct slots.
+        """
+        slots = self._amounts.shape[1]
+        rows = []
+        for p, (contributions, withdrawals) in enumerate(
+            zip(contribution_rules, withdrawal_rules)
+        ):
+            names = self._names[p]
+            ranks = [0] * len(names)
+            for rule in list(contributions) + list(withdrawals):
+                if rule.account_name not in names:
+                    raise KeyError(f"Account '{rule.account_name}' not found.")
+                a = names.index(rule.account_name)
+                increase = getattr(rule, "annual_increase_rate", None)
+                rows.append(
+                    (
+                        ranks[a],
+                        p,
+                        p * slots + a,
+                        rule.amount,
+                        rule.start_age,
+                        rule.end_age,
+                        0.0 if increase is None else increase,
+                        increase is not None,
+                    )
+                )
+                ranks[a] += 1
+        rows.sort(key=lambda row: row[0])
+        columns = list(zip(*rows)) or [()] * 8
+        ranks = np.array(columns[0], dtype=np.int64)
+        self._rule_portfolios = np.array(columns[1], dtype=np.int64)
+        self._rule_slots = np.array(columns[2], dtype=np.int64)
+        self._rule_amounts = np.array(columns[3], dtype=float)
+        self._rule_start_ages = np.array(columns[4], dtype=np.int64)
+        self._rule_end_ages = np.array(columns[5], dtype=np.int64)
+        self._rule_increases = np.array(columns[6], dtype=float)
+        self._rule_contributions = np.array(columns[7], dtype=bool)
+        # Rules of each rank are a contiguous run of the sorted arrays
+        bounds = np.searchsorted(ranks, np.arange(ranks.max(initial=-1) + 2))
+        self._rank_bounds = list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+        # The date each rule starts on, birthdate + start_age years
+        start_indices = self._birth_indices[self._rule_portfolios]
+        start_indices = start_indices + 12 * self._rule_start_ages
+        self._rule_start_indices = start_indices
+        self._rule_start_days = np.minimum(
+            self._birth_days[self._rule_portfolios], days_in_month(start_indices)
+        )
+        # Contribution amounts escalated by each whole year since start_age, in
+        # one flat table with an offset per rule, computed as RuleSchedule does
+        escalations = [0.0]
+        offsets = []
+        for amount, start, end, increase, contribution in zip(*columns[3:8]):
+            offsets.append(len(escalations))
+            if contribution:
+                escalations.extend(
+                    amount * (1 + increase) ** years for years in range(end - start)
+                )
+        self._rule_offsets = np.array(offsets, dtype=np.int64)
+        self._escalations = np.array(escalations)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def account_names(self, portfolio: int) -> List[str]:
+        """Return the account names of a portfolio, in slot order."""
+        return list(self._names[portfolio])
+
+    def balance(self, portfolio: int, name: str) -> float:
+        """Return the current balance of an account of a portfolio."""
+        return float(self._amounts[portfolio, self._slot(portfolio, name)])
+
+    def current_date(self, portfolio: int, name: str) -> date:
+        """Return the date an account of a portfolio has been projected to."""
+        a = self._slot(portfolio, name)
+        index = int(self._indices[portfolio, a])
+        return month_start(index).replace(day=int(self._days[portfolio, a]))
+
+    def balances(self) -> np.ndarray:
+        """Return the current balances as a (portfolios, slots) array, NaN in unused slots."""
+        return np.where(self._valid, self._amounts, np.nan)
+
+    def total_balances(self) -> np.ndarray:
+        """Return the total balance of every portfolio."""
+        return np.where(self._valid, self._amounts, 0.0).sum(axis=1)
+
+    def _slot(self, portfolio: int, name: str) -> int:
+        if name not in self._names[portfolio]:
+            raise KeyError(f"Account '{name}' not found.")
+        return self._names[portfolio].index(name)
+
+    def project_to_date(self, target_date: date) -> None:
+        """Project every portfolio forward to the same date."""
+        portfolios = len(self)
+        self._project(
+            np.full(portfolios, month_index(target_date), dtype=np.int64),
+            np.full(portfolios, target_date.day, dtype=np.int64),
+        )
+
+    def project_to_age(self, target_age: int) -> None:
+        """Project every portfolio forward until its person reaches an age."""
+        target_indices = self._birth_indices + 12 * target_age
+        target_days = np.minimum(self._birth_days, days_in_month(target_indices))
+        self._project(target_indices, target_days)
+
+    def _steps(self, target_indices: np.ndarray, target_days: np.ndarray) -> np.ndarray:
+        """Return the lockstep months of every portfolio, as steps_to_reach per account."""
+        target_indices = target_indices[:, np.newaxis]
+        target_days = target_days[:, np.newaxis]
+        reached = (self._indices > target_indices) | (
+            (self._indices == target_indices) & (self._days >= target_days)
+        )
+        steps = target_indices - self._indices + (target_days != 1)
+        return np.where(reached | ~self._valid, 0, steps).max(axis=1, initial=0)
+
+    def _variable_rates(self, steps: np.ndarray) -> np.ndarray:
+        """Return the monthly rates of every slot with a non-fixed strategy per month."""
+        slots = self._amounts.shape[1]
+        rates = np.zeros((len(self._strategies), steps.max(initial=0)))
+        for row, (slot, strategy) in enumerate(self._strategies):
+            p, a = divmod(slot, slots)
+            index, day = int(self._indices[p, a]), int(self._days[p, a])
+            dates = month_dates(month_start(index).replace(day=day), int(steps[p]))
+            rates[row, : steps[p]] = strategy.get_monthly_rates(dates)
+        return rates
+
+    def _opening_flows(
+        self,
+        flows: np.ndarray,
+        active: np.ndarray,
+        indices: np.ndarray,
+        days: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Return the flows of the opening month with contributions of accounts
+        opening off the first of the month escalated by whole years since the
+        rule started, which can differ from age - start_age around leap days.
+        """
+        since_start = months_between_indices(
+            indices, days, self._rule_start_indices, self._rule_start_days
+        )
+        flows = flows.copy()
+        for rule in np.flatnonzero(active & self._rule_contributions & (days != 1)):
+            flows[rule] = self._rule_amounts[rule] * (
+                (1 + self._rule_increases[rule]) ** int(since_start[rule] // 12)
+            )
+        return flows
+
+    def _project(self, target_indices: np.ndarray, target_days: np.ndarray) -> None:
+        steps = self._steps(target_indices, target_days)
+        months = int(steps.max(initial=0))
+        if months == 0:
+            return
+        amounts = self._amounts.reshape(-1)
+        growth = 1 + self._fixed_rates.reshape(-1)
+        variable_slots = np.array([slot for slot, _ in self._strategies], np.int64)
+        variable_rates = self._variable_rates(steps)
+        slot_steps = np.repeat(steps, self._amounts.shape[1])
+
+        rule_steps = steps[self._rule_portfolios]
+        opening_indices = self._indices.reshape(-1)[self._rule_slots]
+        opening_days = self._days.reshape(-1)[self._rule_slots]
+        birth_indices = self._birth_indices[self._rule_portfolios]
+        birth_days = self._birth_days[self._rule_portfolios]
+        ones = np.ones_like(opening_days)
+
+        for k in range(months):
+            indices = opening_indices + k
+            days = opening_days if k == 0 else ones
+            ages = whole_years(
+                months_between_indices(indices, days, birth_indices, birth_days)
+            )
+            active = (
+                (k < rule_steps)
+                & (self._rule_start_ages <= ages)
+                & (ages < self._rule_end_ages)
+            )
+            escalated = active & self._rule_contributions
+            positions = self._rule_offsets + ages - self._rule_start_ages
+            flows = np.where(
+                self._rule_contributions,
+                self._escalations[np.where(escalated, positions, 0)],
+                -self._rule_amounts,
+            )
+            if k == 0:
+                flows = self._opening_flows(flows, active, indices, days)
+            for start, end in self._rank_bounds:
+                applied = active[start:end]
+                amounts[self._rule_slots[start:end][applied]] += flows[start:end][
+                    applied
+                ]
+
+            moving = k < slot_steps
+            if len(variable_slots):
+                growth[variable_slots] = 1 + variable_rates[:, k]
+            amounts[moving] *= growth[moving]
+
+        advanced = self._valid & (steps > 0)[:, np.newaxis]
+        self._indices += np.where(self._valid, steps[:, np.newaxis], 0)
+        self._days[advanced] = 1
@@ -0,0 +1,73 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import TYPE_CHECKING, List, Sequence, Tuple
+
+import numpy as np
+
+from src.interest_strategy.interest_strategy import InterestStrategy
+from src.projection.month_grid import month_dates, month_index
+from src.projection.vectorized_projection import rule_cash_flows
+
+if TYPE_CHECKING:
+    from src.account_portfolio import ContributionRule, WithdrawalRule
+
+
+@dataclass
+class AccountPlan:
+    """
+    Everything needed to project one account over a number of months with array
+    operations: its opening state, its strategy and the cash flow of every rule
+    in every month (one column per rule, contributions before withdrawals).
+    """
+
+    name: str
+    opening_date: date
+    opening_amount: float
+    strategy: InterestStrategy
+    flows: np.ndarray
+    active: np.ndarray
+
+    def steps(self) -> int:
+        """Return the number of months the plan covers."""
+        return len(self.flows)
+
+    def first_index(self) -> int:
+        """Return the month index of the opening date."""
+        return month_index(self.opening_date)
+
+    def dates(self) -> List[date]:
+        """Return the date each month of the plan starts on."""
+        return month_dates(self.opening_date, self.steps())
+
+    def net_flows(self) -> np.ndarray:
+        """Return the net cash flow of every month."""
+        return self.flows.sum(axis=1)
+
+
+def build_account_plan(
+    name: str,
+    opening_date: date,
+    opening_amount: float,
+    strategy: InterestStrategy,
+    birthdate: date,
+    contribution_rules: Sequence["ContributionRule"],
+    withdrawal_rules: Sequence["WithdrawalRule"],
+    steps: int,
+) -> AccountPlan:
+    """Evaluate an account's rules over the next number of months."""
+    indices, days = plan_months(opening_date, steps)
+    flows, active = rule_cash_flows(
+        birthdate, indices, days, contribution_rules, withdrawal_rules
+    )
+    return AccountPlan(name, opening_date, opening_amount, strategy, flows, active)
+
+
+def plan_months(opening_date: date, steps: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the month index and the day of the date rules are applied on in each
+    of the next number of months: the opening date, then the first of the month.
+    """
+    indices = month_index(opening_date) + np.arange(steps)
+    days = np.ones(steps, dtype=np.int64)
+    days[:1] = opening_date.day
+    return indices, days
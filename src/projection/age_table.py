@@ -0,0 +1,41 @@
+from datetime import date
+
+import numpy as np
+
+from src.projection.month_grid import months_between, whole_years
+
+
+class AgeTable:
+    """
+    Precomputed ages on the first day of every month of a projection horizon.
+    Looks up the whole years and whole months since birth by month index instead
+    of calling relativedelta every month. Values match relativedelta exactly,
+    including month-end and leap-day birthdates.
+    """
+
+    def __init__(self, birthdate: date, first_index: int, last_index: int):
+        if last_index < first_index:
+            raise ValueError("Last month index must not be before the first.")
+        self._birthdate = birthdate
+        self._first_index = first_index
+        self._last_index = last_index
+        indices = np.arange(first_index, last_index + 1)
+        months = months_between(indices, np.ones_like(indices), birthdate)
+        self._months_since_birth = months.tolist()
+        self._ages = whole_years(months).tolist()
+
+    def birthdate(self) -> date:
+        """Return the birthdate the table was built for."""
+        return self._birthdate
+
+    def covers(self, first_index: int, last_index: int) -> bool:
+        """Return whether the table holds every month between two month indices."""
+        return self._first_index <= first_index and last_index <= self._last_index
+
+    def age(self, index: int) -> int:
+        """Return the age in whole years on the first day of a month."""
+        return self._ages[index - self._first_index]
+
+    def months_since_birth(self, index: int) -> int:
+        """Return the whole months since birth on the first day of a month."""
+        return self._months_since_birth[index - self._first_index]
@@ -0,0 +1,66 @@
+import math
+from typing import Optional
+
+import numpy as np
+
+# Months projected in the first pass of a shortfall search; later passes double
+SHORTFALL_CHUNK_MONTHS = 60
+
+
+def first_negative_indices(balances: np.ndarray) -> np.ndarray:
+    """
+    Return the position of the first negative balance along the last axis of a
+    balance array, e.g. one per path of a Monte Carlo grid; -1 where a balance
+    never goes negative.
+    """
+    negative = np.asarray(balances) < 0
+    return np.where(negative.any(axis=-1), negative.argmax(axis=-1), -1)
+
+
+def constant_flow_balance(
+    opening: float, flow: float, growth: float, months: int
+) -> float:
+    """
+    Return the balance after a number of months of b[k + 1] = (b[k] + flow) *
+    growth in closed form: the balance approaches the fixed point
+    flow * growth / (1 - growth) geometrically.
+    """
+    if growth == 1:
+        return opening + months * flow
+    fixed_point = flow * growth / (1 - growth)
+    return fixed_point + (opening - fixed_point) * growth**months
+
+
+def constant_flow_shortfall(
+    opening: float, flow: float, growth: float, months: int
+) -> Optional[int]:
+    """
+    Return the first month k in 1..months after which the balance of
+    constant_flow_balance is negative, or None. The balance moves monotonically
+    towards its fixed point, so the crossing is found from a logarithm and only
+    checked against its neighbours.
+    """
+    if months < 1:
+        return None
+    if growth <= 0:
+        raise ValueError("Growth must be positive.")
+
+    def negative(k: int) -> bool:
+        return constant_flow_balance(opening, flow, growth, k) < 0
+
+    if negative(1):
+        return 1
+    if not negative(months):
+        return None
+    if growth == 1:
+        estimate = math.floor(-opening / flow) + 1
+    else:
+        fixed_point = flow * growth / (1 - growth)
+        ratio = -fixed_point / (opening - fixed_point)
+        estimate = math.ceil(math.log(ratio) / math.log(growth))
+    k = min(max(estimate, 2), months)
+    while k > 2 and negative(k - 1):
+        k -= 1
+    while not negative(k):
+        k += 1
+    return k
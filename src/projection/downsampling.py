@@ -0,0 +1,140 @@
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+DOWNSAMPLING_METHODS = ("lttb", "min_max")
+DEFAULT_MAX_POINTS = 500
+
+
+def lttb_indices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Return the positions of at most max_points samples of an evenly spaced series
+    chosen with Largest-Triangle-Three-Buckets: the first and last samples, and
+    from every bucket in between the sample spanning the largest triangle with
+    the previous choice and the mean of the next bucket. Values must be finite.
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n <= max(max_points, 2):
+        return np.arange(n)
+    if max_points < 3:
+        raise ValueError("LTTB needs at least three points.")
+    # Bucket boundaries for the max_points - 2 samples between the first and last
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+    selected = np.empty(max_points, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(max_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            following = values[end : edges[bucket + 2]]
+            next_x, next_y = (end + edges[bucket + 2] - 1) / 2, following.mean()
+        else:
+            next_x, next_y = n - 1, values[-1]
+        x = np.arange(start, end)
+        areas = np.abs(
+            (previous - next_x) * (values[start:end] - values[previous])
+            - (previous - x) * (next_y - values[previous])
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def min_max_indices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Return the sorted positions of at most max_points samples of a (samples,
+    series) array, keeping the lowest and highest sample of every series in each
+    of max_points / (2 * series) equal buckets. NaN values are ignored.
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    n, series = values.shape
+    if n <= max_points:
+        return np.arange(n)
+    buckets = max_points // (2 * series)
+    if buckets < 1:
+        raise ValueError("The point budget is too small for the number of series.")
+    missing = np.isnan(values)
+    low = np.where(missing, np.inf, values)
+    high = np.where(missing, -np.inf, values)
+    edges = np.linspace(0, n, buckets + 1).astype(int)
+    selected = [
+        index
+        for start, end in zip(edges[:-1], edges[1:])
+        for index in (
+            start + low[start:end].argmin(axis=0),
+            start + high[start:end].argmax(axis=0),
+        )
+    ]
+    return np.unique(np.concatenate(selected))
+
+
+def key_indices(values: np.ndarray) -> np.ndarray:
+    """
+    Return the positions a chart must not drop for a (samples, series) array:
+    the first and last sample and, for every series, its peak, its low and the
+    first sample below zero (where it is depleted).
+    """
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, np.newaxis]
+    n = len(values)
+    if n == 0:
+        return np.arange(0)
+    missing = np.isnan(values)
+    negative = np.where(missing, False, values < 0)
+    depleted = negative.argmax(axis=0)[negative.any(axis=0)]
+    valid = ~missing.all(axis=0)
+    peaks = np.where(missing, -np.inf, values).argmax(axis=0)[valid]
+    lows = np.where(missing, np.inf, values).argmin(axis=0)[valid]
+    return np.unique(np.concatenate([[0, n - 1], peaks, lows, depleted]))
+
+
+def downsample_frame(
+    frame: pd.DataFrame,
+    max_points: int = DEFAULT_MAX_POINTS,
+    method: str = "lttb",
+    keep: Optional[Iterable[int]] = None,
+) -> pd.DataFrame:
+    """
+    Return at most max_points rows of a chart frame such as timeseries(), so the
+    payload sent to the browser does not grow with the horizon or path count.
+
+    The rows in key_indices (peaks, lows, depletion points) of every column, or
+    of the NaN-ignoring sum of the columns when those would take more than half
+    the budget, and the positions in keep are always kept. The rest of the
+    budget is spent on "lttb", which picks rows by the visual shape of the sum,
+    or on "min_max", which keeps the extremes of every column per bucket, or of
+    the envelope of all columns when there are too many for the budget, and
+    suits fan charts of many percentile or path columns. Raises ValueError if
+    the rows that must be kept do not fit in max_points.
+    """
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"Unknown downsampling method '{method}'.")
+    if len(frame) <= max_points:
+        return frame
+    values = frame.to_numpy(dtype=float)
+    summed = np.nansum(values, axis=1)
+    forced = key_indices(values)
+    if len(forced) > max_points // 2:
+        # Many columns would crowd out the rest of the chart
+        forced = key_indices(summed)
+    if keep is not None:
+        forced = np.union1d(forced, np.fromiter(keep, dtype=np.intp))
+    if len(forced) > max_points:
+        raise ValueError("The rows that must be kept do not fit in max_points.")
+    budget = max_points - len(forced)
+    if method == "lttb":
+        selected = lttb_indices(summed, budget) if budget >= 3 else []
+    else:
+        if budget < 2 * values.shape[1]:
+            # The lowest and highest column of every row, ignoring NaN
+            values = np.column_stack(
+                [np.fmin.reduce(values, axis=1), np.fmax.reduce(values, axis=1)]
+            )
+        fits = budget >= 2 * values.shape[1]
+        selected = min_max_indices(values, budget) if fits else []
+    return frame.iloc[np.union1d(forced, selected)]
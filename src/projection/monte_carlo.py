@@ -0,0 +1,191 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.projection.account_plan import AccountPlan
+from src.projection.depletion import first_negative_indices
+from src.projection.month_grid import month_dates, steps_to_reach
+from src.projection.streaming_statistics import MonteCarloSummary
+from src.projection.vectorized_projection import compound
+
+DEFAULT_BATCH_SIZE = 10_000
+
+
+@dataclass
+class MonteCarloResult:
+    """
+    Total portfolio balance of every simulated path, one row per path and one
+    column per month of a calendar-aligned grid starting at start_date.
+    """
+
+    start_date: date
+    balances: np.ndarray
+
+    def dates(self) -> List[date]:
+        """Return the date of every column of the balance grid."""
+        return month_dates(self.start_date, self.balances.shape[1])
+
+    def percentiles(self, q: Sequence[float] = (5, 50, 95)) -> np.ndarray:
+        """Return the given percentiles of the total balance, one row per percentile."""
+        return np.percentile(self.balances, q, axis=0)
+
+    def depletion_curve(self) -> np.ndarray:
+        """Return the share of paths whose total balance went negative by each month."""
+        depleted = np.logical_or.accumulate(self.balances < 0, axis=1)
+        return depleted.mean(axis=0)
+
+    def depletion_probability(self) -> float:
+        """Return the share of paths whose total balance goes negative at any point."""
+        return float(np.any(self.balances < 0, axis=1).mean())
+
+    def first_shortfall_indices(self) -> np.ndarray:
+        """Return the first column with a negative total of every path, -1 if none."""
+        return first_negative_indices(self.balances)
+
+    def first_shortfall_dates(self) -> np.ndarray:
+        """Return the first date with a negative total of every path, NaT if none."""
+        positions = self.first_shortfall_indices()
+        dates = np.array(self.dates(), dtype="datetime64[D]")
+        return np.where(positions >= 0, dates[positions], np.datetime64("NaT"))
+
+    def balances_at(self, on_date: date) -> np.ndarray:
+        """Return the total balance of every path once the grid reaches a date."""
+        column = steps_to_reach(self.start_date, on_date)
+        if column >= self.balances.shape[1]:
+            raise ValueError(f"The simulation does not reach {on_date}.")
+        return self.balances[:, column]
+
+
+def simulation_grid(plans: Sequence[AccountPlan]) -> Tuple[date, int, int]:
+    """
+    Return the start date, first month index and number of months of the
+    calendar-aligned grid a set of account plans is simulated on.
+    """
+    if not plans:
+        raise ValueError("Cannot simulate a portfolio without accounts.")
+    first_index = min(plan.first_index() for plan in plans)
+    last_index = max(plan.first_index() + plan.steps() for plan in plans)
+    start_date = min(plan.opening_date for plan in plans)
+    return start_date, first_index, last_index - first_index + 1
+
+
+def path_batches(
+    n_paths: int, seed=None, batch_size: int = DEFAULT_BATCH_SIZE
+) -> List[Tuple[int, int, np.random.SeedSequence]]:
+    """
+    Split n_paths into fixed-size batches of rows, each with its own independent
+    random stream spawned from the seed. The split only depends on n_paths and
+    batch_size, so results do not depend on how batches are scheduled.
+    """
+    if n_paths < 1:
+        raise ValueError("Number of paths must be positive.")
+    if batch_size < 1:
+        raise ValueError("Batch size must be positive.")
+    starts = range(0, n_paths, batch_size)
+    seeds = np.random.SeedSequence(seed).spawn(len(starts))
+    return [
+        (start, min(start + batch_size, n_paths), batch_seed)
+        for start, batch_seed in zip(starts, seeds)
+    ]
+
+
+def simulate_batch(
+    plans: Sequence[AccountPlan],
+    out: np.ndarray,
+    first_index: int,
+    rng: np.random.Generator,
+) -> None:
+    """
+    Simulate one path per row of out and write the portfolio totals into it.
+    Accounts join the grid in the month they open and keep their last balance
+    once their plan ends.
+    """
+    out[...] = 0.0
+    for plan in plans:
+        rates = plan.strategy.sample_monthly_rates(plan.dates(), len(out), rng)
+        balances = compound(plan.opening_amount, plan.net_flows(), 1.0 + rates)
+        offset = plan.first_index() - first_index
+        end = offset + plan.steps() + 1
+        out[:, offset:end] += balances
+        out[:, end:] += balances[:, -1:]
+
+
+def simulate(
+    plans: Sequence[AccountPlan],
+    n_paths: int,
+    seed=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    progress: Optional[Callable[[int, int], None]] = None,
+    memmap_path: Optional[str] = None,
+) -> MonteCarloResult:
+    """
+    Simulate n_paths scenarios for a set of account plans as paths x months
+    arrays, aligned on calendar months and summed into a portfolio total.
+    progress(paths completed, n_paths) is called after every batch. With
+    memmap_path the total is written to a .npy file the caller owns and
+    memory-mapped instead of held in memory.
+    """
+    start_date, first_index, months = simulation_grid(plans)
+    if memmap_path is None:
+        total = np.empty((n_paths, months))
+    else:
+        total = np.lib.format.open_memmap(
+            memmap_path, mode="w+", dtype=np.float64, shape=(n_paths, months)
+        )
+    for start, end, batch_seed in path_batches(n_paths, seed, batch_size):
+        simulate_batch(
+            plans, total[start:end], first_index, np.random.default_rng(batch_seed)
+        )
+        if progress is not None:
+            progress(end, n_paths)
+    if memmap_path is not None:
+        total.flush()
+    return MonteCarloResult(start_date, total)
+
+
+def simulate_streaming(
+    plans: Sequence[AccountPlan],
+    n_paths: int,
+    seed=None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    relative_accuracy: float = 0.01,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> MonteCarloSummary:
+    """
+    Simulate the same paths as simulate, one batch at a time, folding each batch
+    into running statistics instead of keeping it. Memory is bounded by
+    batch_size x months regardless of n_paths.
+    progress(paths completed, n_paths) is called after every batch.
+    """
+    return summarize_batches(
+        plans, path_batches(n_paths, seed, batch_size), relative_accuracy, progress
+    )
+
+
+def summarize_batches(
+    plans: Sequence[AccountPlan],
+    batches: Sequence[Tuple[int, int, np.random.SeedSequence]],
+    relative_accuracy: float = 0.01,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> MonteCarloSummary:
+    """
+    Simulate a sequence of path batches into a single streaming summary, calling
+    progress(paths completed, paths in all batches) after every batch.
+    """
+    start_date, first_index, months = simulation_grid(plans)
+    summary = MonteCarloSummary(start_date, months, relative_accuracy)
+    buffer = np.empty(
+        (max((end - start for start, end, _ in batches), default=0), months)
+    )
+    paths = sum(end - start for start, end, _ in batches)
+    completed = 0
+    for start, end, batch_seed in batches:
+        chunk = buffer[: end - start]
+        simulate_batch(plans, chunk, first_index, np.random.default_rng(batch_seed))
+        summary.add(chunk)
+        if progress is not None:
+            completed += end - start
+            progress(completed, paths)
+    return summary
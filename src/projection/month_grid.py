@@ -0,0 +1,81 @@
+from datetime import date
+from typing import List
+
+import numpy as np
+
+_DAYS_IN_MONTH = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+
+def month_index(d: date) -> int:
+    """Return the number of whole months between year 0 and the month of a date."""
+    return d.year * 12 + d.month - 1
+
+
+def month_start(index: int) -> date:
+    """Return the first day of the month with the given month index."""
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_dates(first_date: date, count: int) -> List[date]:
+    """
+    Return the dates a balance passes through when advanced month by month:
+    the first date itself, followed by the first day of each following month.
+    """
+    first_index = month_index(first_date)
+    return [first_date] + [month_start(first_index + k) for k in range(1, count)]
+
+
+def steps_to_reach(current_date: date, target_date: date) -> int:
+    """
+    Return how many monthly steps a balance dated current_date needs
+    before its date is on or after target_date.
+    """
+    if current_date >= target_date:
+        return 0
+    steps = month_index(target_date) - month_index(current_date)
+    return steps if target_date.day == 1 else steps + 1
+
+
+def days_in_month(indices: np.ndarray) -> np.ndarray:
+    """Return the number of days in each month of an array of month indices."""
+    years = indices // 12
+    months = indices % 12
+    leap = (years % 4 == 0) & ((years % 100 != 0) | (years % 400 == 0))
+    return _DAYS_IN_MONTH[months] + ((months == 1) & leap)
+
+
+def months_between(
+    indices: np.ndarray, days: np.ndarray, reference: date
+) -> np.ndarray:
+    """
+    Return the signed number of whole months from reference to each date given
+    as month index and day, matching relativedelta's month-end clipping rules.
+    """
+    return months_between_indices(indices, days, month_index(reference), reference.day)
+
+
+def months_between_indices(
+    indices: np.ndarray,
+    days: np.ndarray,
+    reference_indices: np.ndarray,
+    reference_days: np.ndarray,
+) -> np.ndarray:
+    """
+    Return the signed number of whole months between dates given as month index
+    and day, with a reference date per element, as months_between.
+    """
+    indices = np.asarray(indices, dtype=np.int64)
+    days = np.asarray(days, dtype=np.int64)
+    reference_indices = np.asarray(reference_indices, dtype=np.int64)
+    reference_days = np.asarray(reference_days, dtype=np.int64)
+    months = indices - reference_indices
+    anchor = np.minimum(reference_days, days_in_month(indices))
+    after = (indices > reference_indices) | (
+        (indices == reference_indices) & (days >= reference_days)
+    )
+    return np.where(after, months - (days < anchor), months + (days > anchor))
+
+
+def whole_years(months: np.ndarray) -> np.ndarray:
+    """Convert signed month counts to whole years, truncating towards zero."""
+    return np.where(months >= 0, months // 12, -(-months // 12))
@@ -0,0 +1,150 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.projection.account_plan import AccountPlan
+from src.projection.monte_carlo import (
+    DEFAULT_BATCH_SIZE,
+    MonteCarloResult,
+    path_batches,
+    simulate_batch,
+    simulation_grid,
+    summarize_batches,
+)
+from src.projection.streaming_statistics import MonteCarloSummary
+
+# Per-process state set up once by the pool initializer
+_worker_state = {}
+
+
+def simulate_parallel(
+    plans: Sequence[AccountPlan],
+    n_paths: int,
+    seed=None,
+    max_workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    memmap_path: Optional[str] = None,
+) -> MonteCarloResult:
+    """
+    Simulate n_paths scenarios across a pool of worker processes.
+
+    Paths are split into fixed-size batches with independent random streams
+    spawned from the seed, so the same seed gives the same paths for any number
+    of workers (and the same paths as the in-process simulate). Workers write
+    their rows straight into a shared buffer instead of pickling results back
+    to the parent.
+
+    By default the buffer is a shared memory block that is copied into the
+    result before it is released, so memory peaks at twice the paths x months
+    array. With memmap_path the workers write into a .npy file at that path
+    instead, which the result's balances memory-map: memory stays bounded by
+    the pages in use, and the caller owns the file.
+    """
+    start_date, first_index, months = simulation_grid(plans)
+    batches = path_batches(n_paths, seed, batch_size)
+    shape = (n_paths, months)
+    if memmap_path is not None:
+        total = np.lib.format.open_memmap(
+            memmap_path, mode="w+", dtype=np.float64, shape=shape
+        )
+        _run_workers(
+            plans, batches, max_workers, first_index, shape, memmap_path=memmap_path
+        )
+        total.flush()
+        return MonteCarloResult(start_date, total)
+
+    block = shared_memory.SharedMemory(
+        create=True, size=n_paths * months * np.dtype(np.float64).itemsize
+    )
+    try:
+        _run_workers(
+            plans, batches, max_workers, first_index, shape, block_name=block.name
+        )
+        total = np.ndarray(shape, dtype=np.float64, buffer=block.buf).copy()
+    finally:
+        block.close()
+        block.unlink()
+    return MonteCarloResult(start_date, total)
+
+
+def _run_workers(
+    plans: Sequence[AccountPlan],
+    batches: Sequence[Tuple[int, int, np.random.SeedSequence]],
+    max_workers: Optional[int],
+    first_index: int,
+    shape: Tuple[int, int],
+    block_name: Optional[str] = None,
+    memmap_path: Optional[str] = None,
+) -> None:
+    """Simulate every batch in a pool of workers writing into a shared buffer."""
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(plans, first_index, shape, block_name, memmap_path),
+    ) as executor:
+        for _ in executor.map(_simulate_rows, batches):
+            pass
+
+
+def simulate_streaming_parallel(
+    plans: Sequence[AccountPlan],
+    n_paths: int,
+    seed=None,
+    max_workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    relative_accuracy: float = 0.01,
+) -> MonteCarloSummary:
+    """
+    Fold the same batches as simulate_streaming into per-worker summaries and
+    merge them. Each worker keeps only one batch of paths in memory at a time.
+    Quantile sketches and depletion counts merge exactly, so they do not depend
+    on the number of workers; mean and variance agree up to rounding.
+    """
+    batches = path_batches(n_paths, seed, batch_size)
+    workers = min(max_workers or os.cpu_count() or 1, len(batches))
+    groups = [batches[i::workers] for i in range(workers)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        summaries = list(
+            executor.map(
+                summarize_batches,
+                [plans] * workers,
+                groups,
+                [relative_accuracy] * workers,
+            )
+        )
+    summary = summaries[0]
+    for other in summaries[1:]:
+        summary.merge(other)
+    return summary
+
+
+def _init_worker(
+    plans: Sequence[AccountPlan],
+    first_index: int,
+    shape: Tuple[int, int],
+    block_name: Optional[str],
+    memmap_path: Optional[str],
+) -> None:
+    if memmap_path is not None:
+        # Rows go straight into the .npy file the parent created
+        total = np.load(memmap_path, mmap_mode="r+")
+    else:
+        block = shared_memory.SharedMemory(name=block_name)
+        _worker_state["block"] = block
+        total = np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+    _worker_state["plans"] = plans
+    _worker_state["first_index"] = first_index
+    _worker_state["total"] = total
+
+
+def _simulate_rows(batch: Tuple[int, int, np.random.SeedSequence]) -> None:
+    start, end, batch_seed = batch
+    simulate_batch(
+        _worker_state["plans"],
+        _worker_state["total"][start:end],
+        _worker_state["first_index"],
+        np.random.default_rng(batch_seed),
+    )
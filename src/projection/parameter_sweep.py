@@ -0,0 +1,148 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.projection.account_plan import AccountPlan
+from src.projection.month_grid import month_dates
+from src.projection.monte_carlo import simulation_grid
+from src.projection.vectorized_projection import compound
+
+SWEEP_AXES = (
+    "retirement_age",
+    "contribution_amount",
+    "annual_rate",
+    "withdrawal_amount",
+)
+
+
+def sweep_components(
+    plans: Sequence[AccountPlan], annual_rates: Optional[Sequence[float]] = None
+) -> np.ndarray:
+    """
+    Return the portfolio total on the calendar month grid of the plans, split into
+    three parts that are linear in the cash flows: the opening balances growing on
+    their own, the contributions and the withdrawals. Shape (3, rates, months).
+
+    With annual_rates every account grows at each of the given fixed rates in
+    turn; without, every account keeps its own strategy (a single rate row).
+    """
+    _, first_index, months = simulation_grid(plans)
+    rows = 1 if annual_rates is None else len(annual_rates)
+    components = np.zeros((3, rows, months))
+    for plan in plans:
+        if annual_rates is None:
+            rates = plan.strategy.get_monthly_rates(plan.dates())[np.newaxis, :]
+        else:
+            rates = np.stack(
+                [
+                    FixedInterestStrategy(rate).get_monthly_rates(plan.dates())
+                    for rate in annual_rates
+                ]
+            )
+        flows = np.zeros((3, 1, plan.steps()))
+        flows[1, 0] = np.clip(plan.flows, 0.0, None).sum(axis=1)
+        flows[2, 0] = np.clip(plan.flows, None, 0.0).sum(axis=1)
+        opening = np.array([plan.opening_amount, 0.0, 0.0])[:, np.newaxis]
+        balances = compound(opening, flows, 1.0 + rates)
+
+        offset = plan.first_index() - first_index
+        end = offset + plan.steps() + 1
+        components[..., offset:end] += balances
+        components[..., end:] += balances[..., -1:]
+    return components
+
+
+def sweep_metrics(
+    components: np.ndarray,
+    contribution_scales: Sequence[float],
+    withdrawal_scales: Sequence[float],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Combine sweep components into the final balance, the lowest balance and the
+    first month (grid position, -1 if never) the total goes negative, for every
+    contribution scale, rate row and withdrawal scale. Each has shape
+    (contributions, rates, withdrawals).
+    """
+    opening, contributions, withdrawals = components
+    contribution_scales = np.asarray(contribution_scales, dtype=float)
+    withdrawal_scales = np.asarray(withdrawal_scales, dtype=float)
+    totals = (
+        opening[np.newaxis, :, np.newaxis, :]
+        + contribution_scales[:, None, None, None] * contributions[None, :, None, :]
+        + withdrawal_scales[None, None, :, None] * withdrawals[None, :, None, :]
+    )
+    negative = totals < 0
+    depletion = np.where(negative.any(axis=-1), negative.argmax(axis=-1), -1)
+    return totals[..., -1], totals.min(axis=-1), depletion
+
+
+def _evaluate_case(
+    plans: Sequence[AccountPlan],
+    contribution_scales: Sequence[float],
+    annual_rates: Optional[Sequence[float]],
+    withdrawal_scales: Sequence[float],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    return sweep_metrics(
+        sweep_components(plans, annual_rates), contribution_scales, withdrawal_scales
+    )
+
+
+def parameter_sweep(
+    cases: Dict[Optional[int], List[AccountPlan]],
+    contribution_amounts: Optional[Sequence[float]] = None,
+    annual_rates: Optional[Sequence[float]] = None,
+    withdrawal_amounts: Optional[Sequence[float]] = None,
+    max_workers: Optional[int] = 1,
+) -> pd.DataFrame:
+    """
+    Evaluate the Cartesian grid of sweep parameters and return one row per
+    combination, with a column per swept axis followed by final_balance,
+    min_balance and depletion_date (NaT if the total never goes negative).
+
+    cases maps every retirement age (None if not swept) to account plans built
+    for it. When contribution_amounts or withdrawal_amounts are swept, the plans'
+    rules must have an amount of 1, so balances can be scaled linearly instead of
+    projected once per amount. With max_workers other than 1 the retirement ages
+    are evaluated in a pool of worker processes (None uses every core).
+    """
+    contribution_scales = (
+        [1.0] if contribution_amounts is None else contribution_amounts
+    )
+    withdrawal_scales = [1.0] if withdrawal_amounts is None else withdrawal_amounts
+    plan_sets = list(cases.values())
+    arguments = (
+        plan_sets,
+        [contribution_scales] * len(plan_sets),
+        [annual_rates] * len(plan_sets),
+        [withdrawal_scales] * len(plan_sets),
+    )
+    if max_workers == 1 or len(plan_sets) == 1:
+        results = list(map(_evaluate_case, *arguments))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_evaluate_case, *arguments))
+
+    start_date, _, months = simulation_grid(plan_sets[0])
+    grid_dates = np.array(month_dates(start_date, months), dtype="datetime64[D]")
+    final, minimum, depletion = (
+        np.stack([result[k] for result in results]) for k in range(3)
+    )
+
+    retirement_ages = None if list(cases) == [None] else list(cases)
+    axes = [retirement_ages, contribution_amounts, annual_rates, withdrawal_amounts]
+    values = [[None] if axis is None else axis for axis in axes]
+    grids = np.meshgrid(*[np.arange(len(axis)) for axis in values], indexing="ij")
+    table = {}
+    for name, axis, positions in zip(SWEEP_AXES, axes, grids):
+        if axis is not None:
+            table[name] = np.asarray(axis)[positions.ravel()]
+    table["final_balance"] = final.ravel()
+    table["min_balance"] = minimum.ravel()
+    depletion = depletion.ravel()
+    table["depletion_date"] = np.where(
+        depletion >= 0, grid_dates[depletion], np.datetime64("NaT")
+    ).astype("datetime64[ns]")
+    return pd.DataFrame(table)
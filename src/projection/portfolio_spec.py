@@ -0,0 +1,116 @@
+import hashlib
+import json
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, Dict, Optional, Tuple
+
+
+def _freeze(value: Any) -> Any:
+    """Return a value with every list, tuple and dict in it turned into tuples."""
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in sorted(value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+@dataclass(frozen=True)
+class AccountSpec:
+    """
+    An account's name, initial amount, start date and strategy parameters. The
+    parameters are sorted (name, value) pairs, with nested lists such as a
+    rate schedule frozen into tuples so the spec stays hashable.
+    """
+
+    name: str
+    initial_amount: float
+    start_date: date
+    strategy: Tuple[Tuple[str, Any], ...]
+
+    def __post_init__(self):
+        object.__setattr__(self, "strategy", _freeze(dict(self.strategy)))
+
+    def strategy_spec(self) -> Dict[str, Any]:
+        """Return the strategy parameters as a dict."""
+        return dict(self.strategy)
+
+
+@dataclass(frozen=True)
+class PortfolioSpec:
+    """
+    Canonical, hashable description of a portfolio projection: the birthdate,
+    the accounts with their strategy parameters, the rules in the order they
+    are applied, the target date and how the projection is run.
+
+    Rules are stored as (account_name, amount, start_age, end_age[,
+    annual_increase_rate]) tuples with amounts as floats and ages as ints, so
+    equivalent configurations have the same spec and key.
+    """
+
+    birthdate: date
+    accounts: Tuple[AccountSpec, ...]
+    contribution_rules: Tuple[Tuple[str, float, int, int, float], ...]
+    withdrawal_rules: Tuple[Tuple[str, float, int, int], ...]
+    target_date: Optional[date] = None
+    engine: str = "loop"
+    history_mode: str = "full"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the spec as JSON-serializable data."""
+        return {
+            "birthdate": self.birthdate.isoformat(),
+            "accounts": [
+                {
+                    "name": account.name,
+                    "initial_amount": account.initial_amount,
+                    "start_date": account.start_date.isoformat(),
+                    "strategy": account.strategy_spec(),
+                }
+                for account in self.accounts
+            ],
+            "contribution_rules": [list(rule) for rule in self.contribution_rules],
+            "withdrawal_rules": [list(rule) for rule in self.withdrawal_rules],
+            "target_date": self.target_date and self.target_date.isoformat(),
+            "engine": self.engine,
+            "history_mode": self.history_mode,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PortfolioSpec":
+        """Create a spec from the data returned by to_dict()."""
+        return cls(
+            birthdate=date.fromisoformat(data["birthdate"]),
+            accounts=tuple(
+                AccountSpec(
+                    account["name"],
+                    float(account["initial_amount"]),
+                    date.fromisoformat(account["start_date"]),
+                    tuple(account["strategy"].items()),
+                )
+                for account in data["accounts"]
+            ),
+            contribution_rules=tuple(
+                (name, float(amount), int(start), int(end), float(increase))
+                for name, amount, start, end, increase in data["contribution_rules"]
+            ),
+            withdrawal_rules=tuple(
+                (name, float(amount), int(start), int(end))
+                for name, amount, start, end in data["withdrawal_rules"]
+            ),
+            target_date=data["target_date"] and date.fromisoformat(data["target_date"]),
+            engine=data["engine"],
+            history_mode=data["history_mode"],
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "PortfolioSpec":
+        """Create a spec from the JSON returned by to_json()."""
+        return cls.from_dict(json.loads(text))
+
+    def to_json(self) -> str:
+        """Return the canonical JSON form the key is computed from."""
+        return json.dumps(self.to_dict(), sort_keys=True, separators=(",", ":"))
+
+    def key(self) -> str:
+        """Return a content hash identifying the projection."""
+        return hashlib.sha256(self.to_json().encode()).hexdigest()
@@ -0,0 +1,158 @@
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+DEFAULT_MAX_ENTRIES = 128
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_SUFFIX = ".pkl"
+
+
+class ProjectionCache:
+    """
+    Cache of projection results keyed on PortfolioSpec.key().
+
+    Entries live in an in-memory LRU tier of at most max_entries results. With a
+    directory, results are also pickled to disk, where the least recently used
+    files are evicted once they take up more than max_bytes; a result evicted
+    from memory is then loaded from disk on its next use. Files are only ever
+    read from the cache's own directory, which must not be shared with
+    untrusted writers.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        directory: Optional[str] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        if max_entries < 1:
+            raise ValueError("Cache must hold at least one entry.")
+        if max_bytes < 0:
+            raise ValueError("Disk cache size must not be negative.")
+        self._max_entries = max_entries
+        self._directory = directory
+        self._max_bytes = max_bytes
+        self._memory: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the result stored under a key, or None."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._hits += 1
+                return self._memory[key]
+        value = self._read_disk(key)
+        with self._lock:
+            if value is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._remember(key, value)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a result under a key in memory and, if configured, on disk."""
+        with self._lock:
+            self._remember(key, value)
+        self._write_disk(key, value)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Return the result stored under a key, computing and storing it if missing."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        """Remove every entry from memory and disk; counters are kept."""
+        with self._lock:
+            self._memory.clear()
+            for path in self._disk_files():
+                os.remove(path)
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Return the number of memory hits, disk hits and misses, the number of
+        entries in memory and the bytes used on disk.
+        """
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "entries": len(self._memory),
+                "disk_bytes": sum(os.path.getsize(p) for p in self._disk_files()),
+            }
+
+    def _remember(self, key: str, value: Any) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_entries:
+            self._memory.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._directory, key + _SUFFIX)
+
+    def _disk_files(self):
+        if self._directory is None:
+            return []
+        return [
+            os.path.join(self._directory, name)
+            for name in os.listdir(self._directory)
+            if name.endswith(_SUFFIX)
+        ]
+
+    def _read_disk(self, key: str) -> Optional[Any]:
+        if self._directory is None:
+            return None
+        try:
+            with open(self._path(key), "rb") as f:
+                value = pickle.load(f)
+            # The modification time orders files for eviction
+            os.utime(self._path(key))
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        return value
+
+    def _write_disk(self, key: str, value: Any) -> None:
+        if self._directory is None:
+            return
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self._max_bytes:
+            return
+        # Write to a temporary file first, so readers never see partial files
+        handle, temporary = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+        with os.fdopen(handle, "wb") as f:
+            f.write(data)
+        os.replace(temporary, self._path(key))
+        self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        with self._lock:
+            files = []
+            for path in self._disk_files():
+                try:
+                    status = os.stat(path)
+                except OSError:
+                    continue
+                files.append((status.st_mtime_ns, status.st_size, path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self._max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
@@ -0,0 +1,49 @@
+from typing import TYPE_CHECKING, Dict, Sequence, Tuple
+
+if TYPE_CHECKING:
+    from src.account_portfolio import ContributionRule, WithdrawalRule
+
+
+class RuleSchedule:
+    """
+    Contribution and withdrawal rules compiled into a per-account table keyed by age.
+    Each age holds the rules active at that age together with the escalated
+    contribution amount, so applying the rules of a month is a dictionary lookup
+    rather than a scan over every rule of the portfolio.
+    """
+
+    def __init__(
+        self,
+        contribution_rules: Sequence["ContributionRule"],
+        withdrawal_rules: Sequence["WithdrawalRule"],
+    ):
+        self._contributions: Dict[
+            str, Dict[int, Tuple[Tuple["ContributionRule", float], ...]]
+        ] = {}
+        self._withdrawals: Dict[str, Dict[int, Tuple[float, ...]]] = {}
+
+        for rule in contribution_rules:
+            by_age = self._contributions.setdefault(rule.account_name, {})
+            for age in range(rule.start_age, rule.end_age):
+                escalated_amount = rule.amount * (
+                    (1 + rule.annual_increase_rate) ** (age - rule.start_age)
+                )
+                by_age[age] = by_age.get(age, ()) + ((rule, escalated_amount),)
+
+        for rule in withdrawal_rules:
+            by_age = self._withdrawals.setdefault(rule.account_name, {})
+            for age in range(rule.start_age, rule.end_age):
+                by_age[age] = by_age.get(age, ()) + (rule.amount,)
+
+    def contributions(
+        self, account_name: str, age: int
+    ) -> Tuple[Tuple["ContributionRule", float], ...]:
+        """
+        Return the contribution rules active for an account at an age, in the order
+        they were added, each with its amount escalated by whole years since start_age.
+        """
+        return self._contributions.get(account_name, {}).get(age, ())
+
+    def withdrawals(self, account_name: str, age: int) -> Tuple[float, ...]:
+        """Return the amounts of the withdrawal rules active for an account at an age."""
+        return self._withdrawals.get(account_name, {}).get(age, ())
@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from src.projection.vectorized_projection import compound
+
+SENSITIVITY_MODES = ("forward", "adjoint")
+SENSITIVITY_INPUTS = (
+    "annual_rate",
+    "contribution_amount",
+    "contribution_increase_rate",
+    "withdrawal_amount",
+)
+
+
+@dataclass
+class BalanceSensitivities:
+    """
+    Total balance at a number of ages and its derivative with respect to every
+    input of the projection, one row per input and one column per age.
+
+    Inputs are labelled (input, target) with input one of SENSITIVITY_INPUTS
+    and target the account name for rates, or the rule's index for rules. Rates
+    are fractions, so the balance moves by about 0.001 times the derivative for
+    an annual rate 0.1 percentage points higher.
+    """
+
+    ages: List[int]
+    balances: np.ndarray
+    inputs: List[Tuple[str, Union[str, int]]]
+    derivatives: np.ndarray
+
+    def derivative(self, input_name: str, target: Union[str, int]) -> np.ndarray:
+        """Return the derivative of the balance at every age with respect to one input."""
+        try:
+            row = self.inputs.index((input_name, target))
+        except ValueError:
+            raise KeyError(f"No sensitivity to {input_name} of {target!r}.") from None
+        return self.derivatives[row]
+
+    def frame(self) -> pd.DataFrame:
+        """Return the derivatives as a DataFrame indexed by input and target."""
+        return pd.DataFrame(
+            self.derivatives,
+            index=pd.MultiIndex.from_tuples(self.inputs, names=["input", "target"]),
+            columns=pd.Index(self.ages, name="age"),
+        )
+
+
+def log_growth_per_annual_rate(growth: np.ndarray) -> np.ndarray:
+    """
+    Return the derivative of the log of monthly growth factors with respect to
+    a parallel shift of the annual rate each compounds to: growth ** 12 is one
+    plus the annual rate, so d log(growth) = growth ** -12 / 12 per unit of rate.
+    """
+    with np.errstate(divide="ignore"):
+        return np.power(np.asarray(growth, dtype=float), -12.0) / 12
+
+
+def forward_sensitivities(
+    opening: float,
+    flows: np.ndarray,
+    growth: np.ndarray,
+    flow_tangents: np.ndarray,
+    log_growth_tangents: np.ndarray,
+    positions: Sequence[int],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the balances of b[k + 1] = (b[k] + flows[k]) * growth[k] at the given
+    positions and their derivatives with respect to every input, shape (inputs,
+    positions). Tangents give each input's derivative of the flows and of the
+    log of the growth factors, shape (inputs, months).
+
+    The tangent recurrence t[k + 1] = (t[k] + dflows[k] + (b[k] + flows[k]) *
+    dlog(growth[k])) * growth[k] has the same form, so every input is carried
+    through compound in one call; the cost grows with the number of inputs.
+    """
+    balances = compound(opening, flows, growth)
+    carried = balances[:-1] + flows
+    tangents = compound(0.0, flow_tangents + carried * log_growth_tangents, growth)
+    return balances[list(positions)], tangents[:, list(positions)]
+
+
+def adjoint_sensitivities(
+    opening: float,
+    flows: np.ndarray,
+    growth: np.ndarray,
+    flow_tangents: np.ndarray,
+    log_growth_tangents: np.ndarray,
+    positions: Sequence[int],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the same as forward_sensitivities from one backward pass per
+    position instead: the balance at position m moves by growth[k] * ... *
+    growth[m - 1] per unit of flows[k], and by that times b[k] + flows[k] per
+    unit of log(growth[k]). The cost grows with the number of positions, so
+    this suits many inputs and few ages.
+    """
+    balances = compound(opening, flows, growth)
+    carried = balances[:-1] + flows
+    adjoints = np.zeros((len(positions), len(flows)))
+    for row, position in enumerate(positions):
+        adjoints[row, :position] = np.cumprod(growth[:position][::-1])[::-1]
+    derivatives = (
+        adjoints @ flow_tangents.T + (adjoints * carried) @ log_growth_tangents.T
+    )
+    return balances[list(positions)], derivatives.T
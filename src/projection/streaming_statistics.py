@@ -0,0 +1,193 @@
+import math
+from datetime import date
+from typing import List, Sequence
+
+import numpy as np
+
+from src.projection.month_grid import month_dates
+
+
+class MonthlyQuantileSketch:
+    """
+    Mergeable quantile sketch for every month of a simulation, in the style of
+    DDSketch: values are counted in logarithmically spaced buckets, so memory
+    depends on the value range and accuracy, not on the number of paths.
+
+    Error bound: a reported quantile is within relative_accuracy of the order
+    statistic at rank floor(q * (n - 1)), for values whose magnitude lies between
+    min_value and max_value. Magnitudes below min_value are counted as zero
+    (absolute error below min_value) and magnitudes above max_value are clamped
+    to max_value. Merging two sketches adds their bucket counts, which is exact.
+    """
+
+    def __init__(
+        self,
+        months: int,
+        relative_accuracy: float = 0.01,
+        min_value: float = 1.0,
+        max_value: float = 1e12,
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Relative accuracy must be between 0 and 1.")
+        if not 0 < min_value < max_value:
+            raise ValueError("Value range must satisfy 0 < min_value < max_value.")
+        self._months = months
+        self._relative_accuracy = relative_accuracy
+        self._min_value = min_value
+        self._max_value = max_value
+
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(gamma)
+        self._min_key = math.ceil(math.log(min_value) / self._log_gamma)
+        self._buckets = (
+            math.ceil(math.log(max_value) / self._log_gamma) - self._min_key + 1
+        )
+        magnitudes = (
+            2
+            * gamma ** np.arange(self._min_key, self._min_key + self._buckets)
+            / (gamma + 1)
+        )
+        # Negative buckets (largest magnitude first), zero, positive buckets
+        self._values = np.concatenate([-magnitudes[::-1], [0.0], magnitudes])
+        self._counts = np.zeros((months, 2 * self._buckets + 1), dtype=np.int64)
+
+    def add(self, values: np.ndarray) -> None:
+        """Count a paths x months array of values."""
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2 or values.shape[1] != self._months:
+            raise ValueError(f"Expected an array with {self._months} columns.")
+        magnitude = np.abs(values)
+        with np.errstate(divide="ignore"):
+            keys = np.ceil(np.log(magnitude) / self._log_gamma)
+        offsets = np.clip(keys, self._min_key, self._min_key + self._buckets - 1)
+        offsets = offsets.astype(np.int64) - self._min_key
+        buckets = np.where(
+            values > 0, self._buckets + 1 + offsets, self._buckets - 1 - offsets
+        )
+        buckets[magnitude < self._min_value] = self._buckets
+
+        width = self._counts.shape[1]
+        flat = buckets + width * np.arange(self._months)
+        self._counts += np.bincount(flat.ravel(), minlength=self._counts.size).reshape(
+            self._counts.shape
+        )
+
+    def merge(self, other: "MonthlyQuantileSketch") -> None:
+        """Add the counts of a sketch built with the same parameters."""
+        if (
+            other._counts.shape != self._counts.shape
+            or other._relative_accuracy != self._relative_accuracy
+            or other._min_value != self._min_value
+            or other._max_value != self._max_value
+        ):
+            raise ValueError("Cannot merge sketches with different parameters.")
+        self._counts += other._counts
+
+    def count(self) -> np.ndarray:
+        """Return the number of values counted for every month."""
+        return self._counts.sum(axis=1)
+
+    def quantiles(self, q: Sequence[float]) -> np.ndarray:
+        """
+        Return the given quantiles (between 0 and 1) for every month,
+        one row per quantile. Months without values are NaN.
+        """
+        cumulative = np.cumsum(self._counts, axis=1)
+        total = cumulative[:, -1]
+        result = np.full((len(q), self._months), np.nan)
+        for row, quantile in enumerate(q):
+            if not 0 <= quantile <= 1:
+                raise ValueError("Quantiles must be between 0 and 1.")
+            rank = np.floor(quantile * (total - 1))
+            bucket = np.argmax(cumulative > rank[:, np.newaxis], axis=1)
+            result[row] = np.where(total > 0, self._values[bucket], np.nan)
+        return result
+
+
+class MonteCarloSummary:
+    """
+    Running per-month statistics of simulated portfolio totals, folded in one
+    chunk of paths at a time so memory is bounded by the chunk size rather than
+    the number of paths: count, mean and variance (merged with Chan's parallel
+    update), a quantile sketch and the number of paths depleted by each month.
+
+    Summaries of disjoint path sets merge exactly for counts, sketches and
+    depletion; mean and variance merge up to floating-point rounding.
+    """
+
+    def __init__(self, start_date: date, months: int, relative_accuracy: float = 0.01):
+        self.start_date = start_date
+        self._count = 0
+        self._mean = np.zeros(months)
+        self._m2 = np.zeros(months)
+        self._depleted = np.zeros(months, dtype=np.int64)
+        self._sketch = MonthlyQuantileSketch(months, relative_accuracy)
+
+    def add(self, balances: np.ndarray) -> None:
+        """Fold a paths x months chunk of total balances into the summary."""
+        balances = np.asarray(balances, dtype=float)
+        count = len(balances)
+        if count == 0:
+            return
+        mean = balances.mean(axis=0)
+        m2 = ((balances - mean) ** 2).sum(axis=0)
+        depleted = np.logical_or.accumulate(balances < 0, axis=1).sum(axis=0)
+        self._combine(count, mean, m2, depleted)
+        self._sketch.add(balances)
+
+    def merge(self, other: "MonteCarloSummary") -> None:
+        """Fold in the summary of a disjoint set of paths on the same grid."""
+        if other.start_date != self.start_date or len(other._mean) != len(self._mean):
+            raise ValueError("Cannot merge summaries of different month grids.")
+        self._sketch.merge(other._sketch)
+        if other._count:
+            self._combine(other._count, other._mean, other._m2, other._depleted)
+
+    def _combine(
+        self, count: int, mean: np.ndarray, m2: np.ndarray, depleted: np.ndarray
+    ) -> None:
+        total = self._count + count
+        delta = mean - self._mean
+        self._mean = self._mean + delta * (count / total)
+        self._m2 = self._m2 + m2 + delta**2 * (self._count * count / total)
+        self._depleted = self._depleted + depleted
+        self._count = total
+
+    def path_count(self) -> int:
+        """Return the number of paths folded into the summary."""
+        return self._count
+
+    def dates(self) -> List[date]:
+        """Return the date of every month of the grid."""
+        return month_dates(self.start_date, len(self._mean))
+
+    def mean(self) -> np.ndarray:
+        """Return the mean total balance of every month."""
+        return self._mean.copy()
+
+    def variance(self) -> np.ndarray:
+        """Return the sample variance of the total balance of every month."""
+        if self._count < 2:
+            return np.full(len(self._m2), np.nan)
+        return self._m2 / (self._count - 1)
+
+    def percentiles(self, q: Sequence[float] = (5, 50, 95)) -> np.ndarray:
+        """
+        Return approximate percentiles of the total balance, one row per
+        percentile, within the error bound of MonthlyQuantileSketch.
+        """
+        return self._sketch.quantiles([p / 100 for p in q])
+
+    def depletion_curve(self) -> np.ndarray:
+        """Return the share of paths whose total balance went negative by each month."""
+        if self._count == 0:
+            return np.full(len(self._depleted), np.nan)
+        return self._depleted / self._count
+
+    def depletion_probability(self) -> float:
+        """Return the share of paths whose total balance goes negative at any point."""
+        if self._count == 0:
+            return float("nan")
+        if not len(self._depleted):
+            return 0.0
+        return float(self._depleted[-1] / self._count)
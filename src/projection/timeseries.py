@@ -0,0 +1,90 @@
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+TIMESERIES_FORMATS = ("pandas", "arrow")
+TOTAL_COLUMN = "total"
+
+
+def month_end_balances(
+    month_indices: np.ndarray, amounts: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a history to its last entry in every month it has entries for,
+    i.e. the balance each month closes with.
+    """
+    month_indices = np.asarray(month_indices)
+    if len(month_indices) == 0:
+        return month_indices, np.asarray(amounts)
+    last = np.ones(len(month_indices), dtype=bool)
+    last[:-1] = month_indices[1:] != month_indices[:-1]
+    return month_indices[last], np.asarray(amounts)[last]
+
+
+def align_month_end_balances(
+    histories: Dict[str, Tuple[np.ndarray, np.ndarray]],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Place the histories of several accounts on one calendar month grid.
+
+    Returns the month indices of the grid, from the earliest to the latest month
+    of any history, and one column of month-end balances per account. A column is
+    NaN before the account's first month and carries its last known balance
+    forward through months without entries.
+    """
+    reduced = [month_end_balances(*history) for history in histories.values()]
+    recorded = [indices for indices, _ in reduced if len(indices)]
+    if not recorded:
+        return np.empty(0, dtype=np.int64), np.empty((0, len(histories)))
+    first_index = min(int(indices[0]) for indices in recorded)
+    last_index = max(int(indices[-1]) for indices in recorded)
+    grid = np.arange(first_index, last_index + 1, dtype=np.int64)
+
+    columns = np.full((len(grid), len(histories)), np.nan)
+    for column, (indices, amounts) in enumerate(reduced):
+        if len(indices) == 0:
+            continue
+        # Position of the latest entry on or before every month of the grid
+        latest = np.searchsorted(indices, grid, side="right") - 1
+        opened = latest >= 0
+        columns[opened, column] = amounts[latest[opened]]
+    return grid, columns
+
+
+def month_index_dates(month_indices: np.ndarray) -> np.ndarray:
+    """Convert month indices to datetime64 dates on the first day of each month."""
+    months = np.asarray(month_indices, dtype=np.int64) - 1970 * 12
+    return months.astype("datetime64[M]").astype("datetime64[D]")
+
+
+def balance_table(
+    month_indices: np.ndarray, names, columns: np.ndarray, output: str = "pandas"
+):
+    """
+    Build a table with one row per month, one column of balances per account and
+    a total column, as a pandas DataFrame indexed by date or as a pyarrow Table
+    with a leading date column. Accounts not yet opened count as zero in the total.
+    """
+    if output not in TIMESERIES_FORMATS:
+        raise ValueError(f"Unknown time series format '{output}'.")
+    names = list(names)
+    if TOTAL_COLUMN in names:
+        raise ValueError(
+            f"Account name '{TOTAL_COLUMN}' clashes with the total column."
+        )
+    total = np.nansum(columns, axis=1)
+    dates = month_index_dates(month_indices)
+
+    if output == "arrow":
+        import pyarrow as pa
+
+        arrays = [pa.array(dates)] + [
+            pa.array(columns[:, k]) for k in range(len(names))
+        ]
+        arrays.append(pa.array(total))
+        return pa.table(arrays, names=["date"] + names + [TOTAL_COLUMN])
+
+    data = {name: columns[:, k] for k, name in enumerate(names)}
+    data[TOTAL_COLUMN] = total
+    return pd.DataFrame(data, index=pd.DatetimeIndex(dates, name="date"))
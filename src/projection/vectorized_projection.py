@@ -0,0 +1,135 @@
+from datetime import date
+from typing import TYPE_CHECKING, Sequence, Tuple
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+from src.projection.month_grid import months_between, whole_years
+
+if TYPE_CHECKING:
+    from src.account_portfolio import ContributionRule, WithdrawalRule
+    from src.projection.account_plan import AccountPlan
+
+
+def compound(opening, flows, growth) -> np.ndarray:
+    """
+    Solve the balance recurrence b[k + 1] = (b[k] + flows[k]) * growth[k] along
+    the last axis without a Python loop over months.
+
+    The opening balance broadcasts against the leading axes of flows and growth.
+    Returns balances of shape (..., months + 1), starting with the opening balance.
+    """
+    flows = np.asarray(flows, dtype=float)
+    growth = np.asarray(growth, dtype=float)
+    opening = np.asarray(opening, dtype=float)
+    shape = np.broadcast_shapes(flows.shape, growth.shape, opening.shape + (1,))
+    flows = np.broadcast_to(flows, shape)
+    growth = np.broadcast_to(growth, shape)
+
+    balances = np.empty(shape[:-1] + (shape[-1] + 1,))
+    balances[..., 0] = opening
+    if shape[-1] == 0:
+        return balances
+
+    # b[k] = P[k] * (b[0] + sum_{j<k} flows[j] / P[j]) with P the running growth
+    # product, evaluated in place to keep large path arrays to two allocations
+    with np.errstate(all="ignore"):
+        cumulative = np.cumprod(growth, axis=-1)
+        scaled = balances[..., 1:]
+        scaled[..., 0] = flows[..., 0]
+        np.divide(flows[..., 1:], cumulative[..., :-1], out=scaled[..., 1:])
+        np.cumsum(scaled, axis=-1, out=scaled)
+        scaled += opening[..., np.newaxis]
+        scaled *= cumulative
+    if not np.all(np.isfinite(balances)):
+        # Zero or overflowing growth products: fall back to stepping month by month
+        for k in range(shape[-1]):
+            balances[..., k + 1] = (balances[..., k] + flows[..., k]) * growth[..., k]
+    return balances
+
+
+def rule_cash_flows(
+    birthdate: date,
+    indices: np.ndarray,
+    days: np.ndarray,
+    contribution_rules: Sequence["ContributionRule"],
+    withdrawal_rules: Sequence["WithdrawalRule"],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the signed cash flow of every rule in every month, one column per rule
+    (contributions first, then withdrawals), and a mask of the months each rule is active in.
+    """
+    ages = whole_years(months_between(indices, days, birthdate))
+    flows = np.zeros((len(indices), len(contribution_rules) + len(withdrawal_rules)))
+    active = np.zeros(flows.shape, dtype=bool)
+
+    for column, rule in enumerate(contribution_rules):
+        active[:, column] = (rule.start_age <= ages) & (ages < rule.end_age)
+        start = birthdate + relativedelta(years=rule.start_age)
+        years_since_start = months_between(indices, days, start) // 12
+        escalated = rule.amount * (1.0 + rule.annual_increase_rate) ** years_since_start
+        flows[:, column] = np.where(active[:, column], escalated, 0.0)
+
+    for column, rule in enumerate(withdrawal_rules, start=len(contribution_rules)):
+        active[:, column] = (rule.start_age <= ages) & (ages < rule.end_age)
+        flows[:, column] = np.where(active[:, column], -rule.amount, 0.0)
+
+    return flows, active
+
+
+def rule_flow_derivatives(
+    birthdate: date,
+    indices: np.ndarray,
+    days: np.ndarray,
+    contribution_rules: Sequence["ContributionRule"],
+    withdrawal_rules: Sequence["WithdrawalRule"],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the derivative of the cash flows of rule_cash_flows in every month with
+    respect to each rule's amount, one column per rule in the same order, and
+    with respect to each contribution rule's annual increase rate.
+    """
+    ages = whole_years(months_between(indices, days, birthdate))
+    amounts = np.zeros((len(indices), len(contribution_rules) + len(withdrawal_rules)))
+    increase_rates = np.zeros((len(indices), len(contribution_rules)))
+
+    for column, rule in enumerate(contribution_rules):
+        active = (rule.start_age <= ages) & (ages < rule.end_age)
+        start = birthdate + relativedelta(years=rule.start_age)
+        years_since_start = months_between(indices, days, start) // 12
+        growth = 1.0 + rule.annual_increase_rate
+        amounts[:, column] = np.where(active, growth**years_since_start, 0.0)
+        increase_rates[:, column] = np.where(
+            active,
+            rule.amount * years_since_start * growth ** (years_since_start - 1),
+            0.0,
+        )
+
+    for column, rule in enumerate(withdrawal_rules, start=len(contribution_rules)):
+        active = (rule.start_age <= ages) & (ages < rule.end_age)
+        amounts[:, column] = np.where(active, -1.0, 0.0)
+
+    return amounts, increase_rates
+
+
+def project_account_history(plan: "AccountPlan") -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Project one account through its plan and return the history entries the
+    month-by-month loop would record, in the same order, as month indices and amounts.
+    """
+    steps = plan.steps()
+    rates = plan.strategy.get_monthly_rates(plan.dates())
+    balances = compound(plan.opening_amount, plan.net_flows(), 1.0 + rates)
+
+    # Each month records one entry per active rule, then the interest entry
+    amounts = np.concatenate(
+        [balances[:-1, None] + np.cumsum(plan.flows, axis=1), balances[1:, None]],
+        axis=1,
+    )
+    recorded = np.concatenate([plan.active, np.ones((steps, 1), dtype=bool)], axis=1)
+    positions = np.broadcast_to(
+        plan.first_index() + np.arange(steps)[:, None], recorded.shape
+    ).copy()
+    positions[:, -1] += 1
+
+    return positions[recorded], amounts[recorded]
@@ -73,6 +73,13 @@ class TestAccountPortfolio(unittest.TestCase):
         with self.assertRaises(KeyError):
             self.portfolio.add_withdrawal_rule(WithdrawalRule("savings", 500.0, 60, 70))
 
+    def test_projecting_an_empty_portfolio_does_nothing(self):
+        portfolio = AccountPortfolio(self.birthdate)
+        for engine in ("loop", "vectorized"):
+            portfolio.project_to_age(65, engine=engine)
+        self.assertEqual(portfolio.get_account_names(), [])
+        self.assertEqual(portfolio.total_balance(), 0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from datetime import date
+
+from dateutil.relativedelta import relativedelta
+
+from src.account_portfolio import AccountPortfolio
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.projection.age_table import AgeTable
+from src.projection.month_grid import month_index, month_start
+
+
+class TestAgeTable(unittest.TestCase):
+    def assertMatchesRelativedelta(self, birthdate: date):
+        first, last = month_index(date(1980, 1, 1)), month_index(date(2100, 12, 1))
+        table = AgeTable(birthdate, first, last)
+        for index in range(first, last + 1):
+            delta = relativedelta(month_start(index), birthdate)
+            self.assertEqual(table.age(index), delta.years)
+            self.assertEqual(
+                table.months_since_birth(index), delta.years * 12 + delta.months
+            )
+
+    def test_matches_relativedelta_for_month_end_birthdate(self):
+        self.assertMatchesRelativedelta(date(1990, 1, 31))
+
+    def test_matches_relativedelta_for_leap_day_birthdate(self):
+        self.assertMatchesRelativedelta(date(1992, 2, 29))
+
+    def test_covers(self):
+        table = AgeTable(date(1990, 1, 1), 100, 200)
+        self.assertTrue(table.covers(100, 200))
+        self.assertFalse(table.covers(99, 150))
+        self.assertFalse(table.covers(150, 201))
+
+    def test_portfolio_rebuilds_table_when_horizon_grows(self):
+        portfolio = AccountPortfolio(date(1990, 1, 1))
+        portfolio.add_account(
+            "pension", 1000.0, date(2023, 1, 1), FixedInterestStrategy(0.04)
+        )
+        portfolio.project_to_age(40)
+        table = portfolio._age_table
+        self.assertTrue(
+            table.covers(month_index(date(2023, 1, 1)), month_index(date(2030, 1, 1)))
+        )
+        portfolio.reset()
+        portfolio.project_to_age(35)
+        self.assertIs(portfolio._age_table, table)
+        portfolio.project_to_age(60)
+        self.assertIsNot(portfolio._age_table, table)
+        self.assertEqual(portfolio._current_age(date(2049, 12, 1)), 59)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -79,6 +79,71 @@ class TestBalanceWithHistoryAndStrategy(unittest.TestCase):
         self.assertEqual(self.balance.current_amount(), -500.0)
         self.assertEqual(len(self.balance.history()), 2)
 
+    def test_history_view_is_read_only(self):
+        self.balance.add(100.0)
+        history = self.balance.history()
+        with self.assertRaises(ValueError):
+            history.amounts()[0] = 0.0
+        self.assertEqual(list(history.amounts()), [1000.0, 1100.0])
+
+    def test_history_view_keeps_entries_when_it_was_taken(self):
+        history = self.balance.history()
+        for _ in range(40):
+            self.balance.project_one_month()
+        self.assertEqual(len(history), 1)
+        self.assertEqual(len(self.balance.history()), 41)
+        self.assertEqual(self.balance.history()[-1][0], date(2026, 5, 1))
+
+    def test_history_as_list(self):
+        self.balance.project_one_month()
+        self.assertEqual(
+            self.balance.history(as_list=True),
+            [(self.start_date, 1000.0), (date(2023, 2, 1), 1050.0)],
+        )
+
+    def test_history_keeps_mid_month_start_date(self):
+        balance = BalanceWithHistoryAndStrategy(
+            self.initial_amount, date(2023, 1, 15), self.strategy
+        )
+        balance.add(10.0)
+        balance.project_one_month()
+        self.assertEqual(
+            balance.history().dates(),
+            [date(2023, 1, 15), date(2023, 1, 15), date(2023, 2, 1)],
+        )
+
+    def test_reset_does_not_change_earlier_views(self):
+        self.balance.add(100.0)
+        history = self.balance.history()
+        self.balance.reset()
+        self.balance.add(5.0)
+        self.assertEqual(list(history.amounts()), [1000.0, 1100.0])
+        self.assertEqual(self.balance.current_amount(), 1005.0)
+
+    def test_rewind_to_yearly_checkpoint(self):
+        for _ in range(14):
+            self.balance.add(10.0)
+            self.balance.project_one_month()
+        expected = self.balance.history(as_list=True)
+        view = self.balance.history()
+        for _ in range(20):
+            self.balance.add(10.0)
+            self.balance.project_one_month()
+
+        self.balance.rewind(date(2024, 6, 15))
+        self.assertEqual(self.balance.current_date(), date(2024, 1, 1))
+        self.assertEqual(self.balance.steps_taken(), 12)
+        self.assertEqual(self.balance.history(as_list=True), expected[:25])
+        self.assertEqual(len(view), len(expected))
+        self.assertEqual(view.to_list(), expected)
+
+    def test_rewind_before_first_checkpoint_resets(self):
+        for _ in range(5):
+            self.balance.project_one_month()
+        self.balance.rewind(date(2023, 12, 31))
+        self.assertEqual(self.balance.current_date(), self.start_date)
+        self.assertEqual(self.balance.history(), [(self.start_date, 1000.0)])
+
     def test_large_growth_rate(self):
         high_growth_strategy = MockInterestStrategy(10.0)  # 1000% growth
         balance = BalanceWithHistoryAndStrategy(
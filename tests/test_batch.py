@@ -0,0 +1,143 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+
+import pandas as pd
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.batch import main, run
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+
+ACCOUNTS = [
+    {
+        "name": "pension",
+        "amount": 10000.0,
+        "start_date": "2023-01-15",
+        "annual_rate": 0.04,
+    },
+    {
+        "name": "savings",
+        "amount": 500.0,
+        "start_date": "2024-06-01",
+        "annual_rate": 0.01,
+    },
+]
+CONTRIBUTIONS = [
+    {
+        "account_name": "pension",
+        "amount": 500.0,
+        "start_age": 33,
+        "end_age": 65,
+        "annual_increase_rate": 0.02,
+    }
+]
+WITHDRAWALS = [
+    {"account_name": "pension", "amount": 2000.0, "start_age": 65, "end_age": 90}
+]
+
+
+def client_records() -> pd.DataFrame:
+    return pd.DataFrame(
+        [
+            {
+                "client_id": "a",
+                "birthdate": "1990-01-01",
+                "target_age": 70,
+                "accounts": json.dumps(ACCOUNTS),
+                "contribution_rules": json.dumps(CONTRIBUTIONS),
+                "withdrawal_rules": json.dumps(WITHDRAWALS),
+            },
+            {
+                "client_id": "broken",
+                "birthdate": "1990-01-01",
+                "accounts": json.dumps(ACCOUNTS),
+                "contribution_rules": json.dumps(
+                    [dict(CONTRIBUTIONS[0], account_name="x")]
+                ),
+            },
+            {
+                "client_id": "b",
+                "birthdate": "1985-05-31",
+                "accounts": json.dumps(ACCOUNTS[:1]),
+            },
+        ]
+    )
+
+
+def expected_portfolio() -> AccountPortfolio:
+    portfolio = AccountPortfolio(date(1990, 1, 1))
+    portfolio.add_account(
+        "pension", 10000.0, date(2023, 1, 15), FixedInterestStrategy(0.04)
+    )
+    portfolio.add_account(
+        "savings", 500.0, date(2024, 6, 1), FixedInterestStrategy(0.01)
+    )
+    portfolio.add_contribution_rule(ContributionRule("pension", 500.0, 33, 65, 0.02))
+    portfolio.add_withdrawal_rule(WithdrawalRule("pension", 2000.0, 65, 90))
+    portfolio.project_to_age(70, engine="vectorized")
+    return portfolio
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.input = os.path.join(self.directory.name, "clients.csv")
+        client_records().to_csv(self.input, index=False)
+        self.output = os.path.join(self.directory.name, "out")
+
+    def test_projects_records_and_records_failures(self):
+        progress = io.StringIO()
+        done, failed = run(
+            self.input,
+            self.output,
+            target_age=60,
+            chunk_size=2,
+            max_workers=1,
+            progress=progress,
+        )
+        self.assertEqual((done, failed), (3, 1))
+        self.assertEqual(len(progress.getvalue().splitlines()), 2)
+        self.assertEqual(
+            sorted(os.listdir(os.path.join(self.output, "results"))),
+            ["part-00000.parquet", "part-00001.parquet"],
+        )
+
+        errors = pd.read_parquet(os.path.join(self.output, "errors"))
+        self.assertEqual(errors["client_id"].tolist(), ["broken"])
+        self.assertIn("KeyError", errors["error"].iloc[0])
+
+        results = pd.read_parquet(os.path.join(self.output, "results"))
+        self.assertEqual(sorted(results["client_id"].unique()), ["a", "b"])
+        client = results[results["client_id"] == "a"]
+        expected = expected_portfolio().timeseries()
+        for name in ("pension", "savings"):
+            balances = client[client["account"] == name]
+            column = expected[name].dropna()
+            self.assertEqual(balances["balance"].tolist(), column.tolist())
+            self.assertEqual(list(pd.to_datetime(balances["date"])), list(column.index))
+        # Client b has no target_age column and is projected to the default
+        self.assertEqual(
+            pd.to_datetime(results[results["client_id"] == "b"]["date"]).max(),
+            pd.Timestamp(2045, 6, 1),
+        )
+
+    def test_parquet_input_and_cli(self):
+        records = client_records()
+        records["accounts"] = records["accounts"].map(json.loads)
+        path = os.path.join(self.directory.name, "clients.parquet")
+        records.to_parquet(path)
+        self.assertEqual(main([path, self.output, "--workers", "1"]), 0)
+        results = pd.read_parquet(os.path.join(self.output, "results"))
+        self.assertEqual(sorted(results["client_id"].unique()), ["a", "b"])
+
+    def test_unknown_engine_raises(self):
+        with self.assertRaises(ValueError):
+            run(self.input, self.output, engine="fast")
+
+
+if __name__ == "__main__":
+    unittest.main()
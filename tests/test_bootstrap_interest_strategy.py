@@ -0,0 +1,104 @@
+import os
+import pickle
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+
+from src.account_portfolio import AccountPortfolio
+from src.interest_strategy.bootstrap_interest_strategy import (
+    BootstrapInterestStrategy,
+    save_return_series,
+)
+from src.interest_strategy.strategy_registry import strategy_from_spec
+from src.projection.month_grid import month_dates
+
+
+class TestBootstrapInterestStrategy(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "returns.npy")
+        # Distinct returns, so every rate identifies its historical month
+        self.returns = np.arange(60) / 10000
+        save_return_series(self.path, self.returns)
+        self.strategy = BootstrapInterestStrategy(self.path, block_size=6, seed=1)
+        self.dates = month_dates(date(2025, 3, 20), 40)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_series_is_memory_mapped(self):
+        self.assertIsInstance(self.strategy._returns, np.memmap)
+
+    def test_batched_rates_match_scalar(self):
+        rates = self.strategy.get_monthly_rates(self.dates)
+        self.assertEqual(rates.shape, (40,))
+        for rate, d in zip(rates, self.dates):
+            self.assertEqual(rate, self.strategy.get_monthly_rate(d))
+        self.assertEqual(self.strategy.get_monthly_rates([]).shape, (0,))
+
+    def test_scenario_replays_historical_blocks(self):
+        positions = np.rint(self.strategy.get_monthly_rates(self.dates) * 10000)
+        # Months within a calendar block are consecutive historical months
+        steps = np.diff(positions) % len(self.returns)
+        block_edges = [
+            k
+            for k, d in enumerate(self.dates[1:], start=1)
+            if (d.year * 12 + d.month - 1) % 6 == 0
+        ]
+        self.assertTrue(np.all(np.delete(steps, np.array(block_edges) - 1) == 1))
+
+    def test_sampled_paths_are_bootstrapped_blocks(self):
+        rates = self.strategy.sample_monthly_rates(
+            self.dates, 500, np.random.default_rng(3)
+        )
+        self.assertEqual(rates.shape, (500, 40))
+        self.assertNotIsInstance(rates, np.memmap)
+        positions = np.rint(rates * 10000).astype(int)
+        steps = np.diff(positions, axis=1) % len(self.returns)
+        within_blocks = np.ones(39, dtype=bool)
+        within_blocks[5::6] = False
+        self.assertTrue(np.all(steps[:, within_blocks] == 1))
+        # Block starts cover the whole series
+        self.assertEqual(len(np.unique(positions[:, 0])), len(self.returns))
+
+    def test_pickling_reopens_the_mapping(self):
+        restored = pickle.loads(pickle.dumps(self.strategy))
+        self.assertIsInstance(restored._returns, np.memmap)
+        self.assertLess(len(pickle.dumps(self.strategy)), 1000)
+        np.testing.assert_array_equal(
+            restored.get_monthly_rates(self.dates),
+            self.strategy.get_monthly_rates(self.dates),
+        )
+        recreated = strategy_from_spec(self.strategy.spec())
+        self.assertEqual(recreated.spec(), self.strategy.spec())
+
+    def test_parallel_simulation_matches_in_process(self):
+        portfolio = AccountPortfolio(date(1990, 1, 1))
+        portfolio.add_account("stocks", 1000.0, date(2023, 1, 1), self.strategy)
+        serial = portfolio.simulate_to_age(40, n_paths=200, seed=4)
+        parallel = portfolio.simulate_to_age(40, n_paths=200, seed=4, max_workers=2)
+        np.testing.assert_array_equal(serial.balances, parallel.balances)
+
+    def test_path_without_npy_suffix_is_used_verbatim(self):
+        path = os.path.join(self.directory.name, "returns")
+        save_return_series(path, self.returns)
+        strategy = BootstrapInterestStrategy(path, block_size=6, seed=1)
+        np.testing.assert_array_equal(
+            strategy.get_monthly_rates(self.dates),
+            self.strategy.get_monthly_rates(self.dates),
+        )
+
+    def test_invalid_series_raise(self):
+        with self.assertRaises(ValueError):
+            BootstrapInterestStrategy(self.path, block_size=61)
+        with self.assertRaises(ValueError):
+            BootstrapInterestStrategy(self.path, block_size=0)
+        save_return_series(self.path, [0.01, -1.5])
+        with self.assertRaises(ValueError):
+            BootstrapInterestStrategy(self.path, block_size=1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,104 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.calculations import (
+    estimate_life_expectancies,
+    estimate_life_expectancy,
+    project_financials,
+    project_financials_batch,
+    summarize_drawdowns,
+)
+
+
+class TestBatchCalculations(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        n = 200
+        self.current_ages = rng.integers(20, 70, n)
+        # Includes households already past retirement or life expectancy
+        self.retirement_ages = self.current_ages + rng.integers(-5, 40, n)
+        self.savings = rng.uniform(0, 1e5, n)
+        self.monthly_savings = rng.uniform(0, 2000, n)
+        self.monthly_expenses = rng.uniform(0, 5000, n)
+        self.life_expectancies = self.retirement_ages + rng.integers(-3, 30, n)
+        self.growth_rates = rng.uniform(-0.02, 0.08, n)
+
+    def project(self):
+        return project_financials_batch(
+            self.current_ages,
+            self.retirement_ages,
+            self.savings,
+            self.monthly_savings,
+            self.monthly_expenses,
+            self.life_expectancies,
+            self.growth_rates,
+        )
+
+    def test_matches_scalar_projection(self):
+        total_savings, drawdown = self.project()
+        self.assertEqual(drawdown.shape, (200, 29))
+        for i in range(len(total_savings)):
+            expected_total, expected_drawdown = project_financials(
+                self.current_ages[i],
+                self.retirement_ages[i],
+                self.savings[i],
+                self.monthly_savings[i],
+                self.monthly_expenses[i],
+                self.life_expectancies[i],
+                self.growth_rates[i],
+            )
+            self.assertEqual(total_savings[i], expected_total)
+            row = drawdown[i]
+            self.assertEqual(row[~np.isnan(row)].tolist(), expected_drawdown)
+            self.assertTrue(np.all(np.isnan(row[len(expected_drawdown) :])))
+
+    def test_summaries(self):
+        _, drawdown = self.project()
+        summary = summarize_drawdowns(drawdown)
+        for i in range(len(drawdown)):
+            balances = drawdown[i][~np.isnan(drawdown[i])]
+            if len(balances) == 0:
+                self.assertTrue(np.isnan(summary["final_balance"][i]))
+                self.assertTrue(np.isnan(summary["min_balance"][i]))
+                self.assertEqual(summary["depletion_year"][i], -1)
+                continue
+            self.assertEqual(summary["final_balance"][i], balances[-1])
+            self.assertEqual(summary["min_balance"][i], balances.min())
+            negative = np.flatnonzero(balances < 0)
+            expected = negative[0] if len(negative) else -1
+            self.assertEqual(summary["depletion_year"][i], expected)
+
+    def test_accepts_dataframe_columns_and_scalars(self):
+        frame = pd.DataFrame(
+            {"age": [30, 40], "retire": [65, 60], "savings": [1000.0, 5000.0]}
+        )
+        total_savings, drawdown = project_financials_batch(
+            frame["age"], frame["retire"], frame["savings"], 100, 2000, 80
+        )
+        for i, row in enumerate(frame.itertuples()):
+            expected_total, expected_drawdown = project_financials(
+                row.age, row.retire, row.savings, 100, 2000, 80
+            )
+            self.assertAlmostEqual(total_savings[i], expected_total)
+            self.assertEqual(
+                drawdown[i][: len(expected_drawdown)].tolist(), expected_drawdown
+            )
+        self.assertEqual(drawdown.shape, (2, 20))
+
+    def test_life_expectancies_match_scalar(self):
+        rng = np.random.default_rng(5)
+        ages = rng.integers(0, 110, 300)
+        genders = rng.choice(["male", "female"], 300)
+        scores = rng.uniform(0, 10, 300)
+        result = estimate_life_expectancies(ages, genders, scores)
+        expected = [
+            estimate_life_expectancy(age, gender, score)
+            for age, gender, score in zip(ages, genders, scores)
+        ]
+        self.assertEqual(result.tolist(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+import unittest
+from datetime import date
+
+import numpy as np
+from dateutil.relativedelta import relativedelta
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.interest_strategy.lognormal_interest_strategy import (
+    LognormalInterestStrategy,
+)
+from src.interest_strategy.scheduled_interest_strategy import (
+    ScheduledInterestStrategy,
+)
+from src.projection.depletion import (
+    constant_flow_balance,
+    constant_flow_shortfall,
+    first_negative_indices,
+)
+
+
+def build_portfolio(strategy) -> AccountPortfolio:
+    portfolio = AccountPortfolio(date(1990, 1, 1))
+    portfolio.add_account("pension", 10000.0, date(2025, 3, 15), strategy)
+    portfolio.add_contribution_rule(ContributionRule("pension", 500.0, 35, 65, 0.02))
+    portfolio.add_withdrawal_rule(WithdrawalRule("pension", 6000.0, 65, 100))
+    return portfolio
+
+
+def loop_shortfall(portfolio: AccountPortfolio, name: str):
+    """First date the month-by-month loop holds a negative balance."""
+    while portfolio.get_current_date(name) < date(2090, 1, 1):
+        portfolio.project_one_month()
+        if portfolio.get_balance(name) < 0:
+            return portfolio.get_current_date(name)
+    return None
+
+
+class TestConstantFlows(unittest.TestCase):
+    def test_closed_form_matches_the_recurrence(self):
+        for opening, flow, growth in [
+            (1000.0, -30.0, 1.004),
+            (1000.0, -30.0, 0.99),
+            (1000.0, -30.0, 1.0),
+            (-50.0, 100.0, 1.01),
+        ]:
+            balance, shortfall = opening, None
+            for k in range(1, 121):
+                balance = (balance + flow) * growth
+                if balance < 0 and shortfall is None:
+                    shortfall = k
+                self.assertAlmostEqual(
+                    constant_flow_balance(opening, flow, growth, k), balance, places=6
+                )
+            self.assertEqual(
+                constant_flow_shortfall(opening, flow, growth, 120), shortfall
+            )
+        self.assertIsNone(constant_flow_shortfall(1000.0, -30.0, 1.004, 0))
+
+    def test_first_negative_indices_of_paths(self):
+        paths = np.array([[1.0, -1.0, 2.0], [1.0, 1.0, 1.0], [-1.0, 0.0, -2.0]])
+        np.testing.assert_array_equal(first_negative_indices(paths), [1, -1, 0])
+
+
+class TestShortfallQueries(unittest.TestCase):
+    def test_fixed_rate_shortfall_is_solved_in_closed_form(self):
+        portfolio = build_portfolio(FixedInterestStrategy(0.04))
+        shortfall = portfolio.first_shortfall_date("pension")
+        self.assertEqual(
+            shortfall,
+            loop_shortfall(build_portfolio(FixedInterestStrategy(0.04)), "pension"),
+        )
+        self.assertEqual(portfolio.depletion_age("pension"), 72)
+        # The query leaves the account untouched
+        self.assertEqual(portfolio.get_current_date("pension"), date(2025, 3, 15))
+        self.assertEqual(portfolio.get_balance("pension"), 10000.0)
+
+    def test_other_strategies_are_projected_until_the_shortfall(self):
+        schedule = ScheduledInterestStrategy(
+            [(date(2025, 1, 1), 0.05), (date(2050, 1, 1), 0.01)]
+        )
+        portfolio = build_portfolio(schedule)
+        self.assertEqual(
+            portfolio.first_shortfall_date("pension"),
+            loop_shortfall(build_portfolio(schedule), "pension"),
+        )
+        self.assertEqual(
+            portfolio.first_shortfall_date(), portfolio.first_shortfall_date("pension")
+        )
+
+    def test_no_shortfall_before_max_age(self):
+        portfolio = build_portfolio(FixedInterestStrategy(0.04))
+        self.assertIsNone(portfolio.first_shortfall_date("pension", max_age=70))
+        self.assertIsNone(portfolio.depletion_age(max_age=70))
+        empty = AccountPortfolio(date(1990, 1, 1))
+        self.assertIsNone(empty.first_shortfall_date())
+        self.assertEqual(empty.balance_at_age(80), 0.0)
+
+    def test_total_shortfall_counts_every_account(self):
+        portfolio = build_portfolio(FixedInterestStrategy(0.04))
+        portfolio.add_account(
+            "savings", 200000.0, date(2040, 1, 1), FixedInterestStrategy(0.0)
+        )
+        pension = portfolio.first_shortfall_date("pension")
+        total = portfolio.first_shortfall_date()
+        self.assertGreater(total, pension)
+        self.assertIsNone(portfolio.first_shortfall_date("savings"))
+        balance = portfolio.balance_at_age(total.year - 1990 - 1)
+        self.assertGreater(balance, 0)
+
+    def test_balance_at_age_matches_a_projection(self):
+        for strategy in (
+            FixedInterestStrategy(0.04),
+            LognormalInterestStrategy(0.05, 0.1, seed=2),
+        ):
+            portfolio = build_portfolio(strategy)
+            balance = portfolio.balance_at_age(68, "pension")
+            total = portfolio.balance_at_age(68)
+            portfolio.project_to_age(68)
+            self.assertAlmostEqual(balance, portfolio.get_balance("pension"), places=6)
+            self.assertEqual(total, balance)
+            with self.assertRaises(ValueError):
+                portfolio.balance_at_age(60, "pension")
+
+    def test_monte_carlo_shortfalls_across_paths(self):
+        portfolio = build_portfolio(LognormalInterestStrategy(0.04, 0.15))
+        result = portfolio.simulate_to_age(100, n_paths=300, seed=3)
+        positions = result.first_shortfall_indices()
+        dates = result.first_shortfall_dates()
+        ages = portfolio.depletion_ages(result)
+        grid = result.dates()
+        self.assertEqual(dates.shape, (300,))
+        for path in range(300):
+            if positions[path] < 0:
+                self.assertTrue(np.isnat(dates[path]))
+                self.assertTrue(np.isnan(ages[path]))
+                continue
+            self.assertEqual(dates[path], np.datetime64(grid[positions[path]]))
+            self.assertLess(result.balances[path, positions[path]], 0)
+            self.assertTrue(np.all(result.balances[path, : positions[path]] >= 0))
+            self.assertEqual(
+                ages[path], relativedelta(grid[positions[path]], date(1990, 1, 1)).years
+            )
+        np.testing.assert_array_equal(
+            result.balances_at(date(2060, 1, 1)),
+            result.balances[:, grid.index(date(2060, 1, 1))],
+        )
+        with self.assertRaises(ValueError):
+            result.balances_at(date(2100, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
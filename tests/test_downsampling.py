@@ -0,0 +1,90 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.projection.downsampling import (
+    downsample_frame,
+    key_indices,
+    lttb_indices,
+    min_max_indices,
+)
+
+
+class TestDownsampling(unittest.TestCase):
+    def setUp(self):
+        months = 1200
+        t = np.arange(months)
+        # Grows, peaks at month 700, then is drawn down below zero
+        self.total = np.where(t < 700, t * 100.0, 70000.0 - (t - 700) * 150.0)
+        self.frame = pd.DataFrame(
+            {"pension": self.total / 2, "total": self.total},
+            index=pd.date_range("2025-01-01", periods=months, freq="MS"),
+        )
+
+    def test_lttb_keeps_ends_and_follows_the_shape(self):
+        indices = lttb_indices(self.total, 20)
+        self.assertEqual(len(indices), 20)
+        self.assertEqual(indices[0], 0)
+        self.assertEqual(indices[-1], len(self.total) - 1)
+        self.assertTrue(np.all(np.diff(indices) > 0))
+        # The corner of the curve is the largest triangle in its bucket
+        self.assertIn(700, indices)
+
+    def test_short_series_are_kept_whole(self):
+        np.testing.assert_array_equal(lttb_indices([1.0, 2.0], 10), [0, 1])
+        np.testing.assert_array_equal(min_max_indices(np.ones(5), 10), np.arange(5))
+        short = self.frame.head(50)
+        self.assertIs(downsample_frame(short, 100), short)
+
+    def test_min_max_keeps_extremes_of_every_series(self):
+        values = np.zeros((1000, 2))
+        values[123, 0] = 5.0
+        values[456, 1] = -5.0
+        values[:10, 1] = np.nan
+        indices = min_max_indices(values, 40)
+        self.assertLessEqual(len(indices), 40)
+        self.assertIn(123, indices)
+        self.assertIn(456, indices)
+
+    def test_key_indices(self):
+        values = np.column_stack([self.total, np.full(len(self.total), np.nan)])
+        np.testing.assert_array_equal(
+            key_indices(values), [0, 700, 1167, len(self.total) - 1]
+        )
+
+    def test_frame_payload_is_bounded_and_keeps_key_points(self):
+        for method in ("lttb", "min_max"):
+            sampled = downsample_frame(self.frame, 60, method=method, keep=[5])
+            self.assertLessEqual(len(sampled), 60)
+            self.assertTrue(sampled.index.is_monotonic_increasing)
+            depletion = self.frame.index[np.argmax(self.total < 0)]
+            for kept in (self.frame.index[700], depletion, self.frame.index[5]):
+                self.assertIn(kept, sampled.index)
+            pd.testing.assert_frame_equal(sampled, self.frame.loc[sampled.index])
+
+    def test_many_columns_stay_within_the_budget(self):
+        rng = np.random.default_rng(3)
+        paths = pd.DataFrame(np.cumsum(rng.normal(size=(1000, 50)), axis=0))
+        for method in ("lttb", "min_max"):
+            sampled = downsample_frame(paths, 100, method=method)
+            self.assertLessEqual(len(sampled), 100)
+            # The extremes of the sum are still kept
+            summed = paths.sum(axis=1)
+            self.assertIn(summed.idxmax(), sampled.index)
+            self.assertIn(summed.idxmin(), sampled.index)
+        # Too many columns for per-column extremes: the envelope is kept instead
+        fan = downsample_frame(paths, 60, method="min_max")
+        self.assertGreater(len(fan), 40)
+        self.assertIn(paths.max(axis=1).idxmax(), fan.index)
+        self.assertIn(paths.min(axis=1).idxmin(), fan.index)
+        with self.assertRaises(ValueError):
+            downsample_frame(self.frame, 60, keep=range(100))
+
+    def test_unknown_method_raises(self):
+        with self.assertRaises(ValueError):
+            downsample_frame(self.frame, 60, method="mean")
+
+
+if __name__ == "__main__":
+    unittest.main()
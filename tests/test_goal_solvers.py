@@ -0,0 +1,127 @@
+import unittest
+from datetime import date
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.calculations import project_financials
+from src.goal_solvers import (
+    find_amount,
+    find_root,
+    max_monthly_expenses,
+    required_monthly_savings,
+)
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.interest_strategy.lognormal_interest_strategy import (
+    LognormalInterestStrategy,
+)
+
+
+def build_portfolio() -> AccountPortfolio:
+    portfolio = AccountPortfolio(date(1990, 1, 1))
+    portfolio.add_account(
+        "pension", 10000.0, date(2023, 1, 15), FixedInterestStrategy(0.04)
+    )
+    portfolio.add_account(
+        "savings", 5000.0, date(2024, 6, 1), LognormalInterestStrategy(0.03, 0.1, 7)
+    )
+    portfolio.add_contribution_rule(ContributionRule("savings", 100.0, 33, 60))
+    return portfolio
+
+
+class TestRootFinding(unittest.TestCase):
+    def test_affine_function_is_solved_by_first_interpolation(self):
+        solution = find_root(lambda x: 3 * x - 12, 0.0, 100.0)
+        self.assertAlmostEqual(solution.value, 4.0)
+        self.assertEqual(solution.evaluations, 3)
+        self.assertEqual(solution.method, "root_finding")
+
+    def test_nonlinear_function_converges_quickly(self):
+        solution = find_root(lambda x: x**3 - 2, 0.0, 10.0, tolerance=1e-10)
+        self.assertAlmostEqual(solution.value, 2 ** (1 / 3), places=8)
+        self.assertLess(solution.evaluations, 20)
+
+    def test_unbracketed_goal_raises(self):
+        with self.assertRaises(ValueError):
+            find_root(lambda x: x + 1, 0.0, 10.0)
+
+    def test_find_amount_expands_interval(self):
+        solution = find_amount(lambda x: 1000.0 - x)
+        self.assertAlmostEqual(solution.value, 1000.0, places=4)
+        with self.assertRaises(ValueError):
+            find_amount(lambda x: -1.0)
+
+
+class TestProjectFinancialsGoals(unittest.TestCase):
+    def test_required_monthly_savings_reaches_target(self):
+        solution = required_monthly_savings(30, 65, 10000, 1_000_000, 0.05)
+        self.assertEqual(solution.method, "closed_form")
+        total, _ = project_financials(30, 65, 10000, solution.value, 0, 65, 0.05)
+        self.assertAlmostEqual(total, 1_000_000, places=4)
+
+    def test_zero_growth_and_reached_target(self):
+        solution = required_monthly_savings(30, 40, 0, 12000, 0.0)
+        self.assertAlmostEqual(solution.value, 100.0)
+        self.assertEqual(required_monthly_savings(30, 65, 1e7, 1e6).value, 0.0)
+
+    def test_max_monthly_expenses_lasts_until_life_expectancy(self):
+        solution = max_monthly_expenses(30, 65, 10000, 500, 90, 0.05)
+        self.assertEqual(solution.method, "closed_form")
+        _, drawdown = project_financials(30, 65, 10000, 500, solution.value, 90, 0.05)
+        self.assertAlmostEqual(drawdown[-1], 0.0, places=4)
+        _, drawdown = project_financials(
+            30, 65, 10000, 500, solution.value + 1, 90, 0.05
+        )
+        self.assertLess(drawdown[-1], 0)
+
+    def test_invalid_ages_raise(self):
+        with self.assertRaises(ValueError):
+            required_monthly_savings(65, 65, 0, 1000)
+        with self.assertRaises(ValueError):
+            max_monthly_expenses(30, 65, 0, 500, 60)
+
+
+class TestPortfolioGoals(unittest.TestCase):
+    def setUp(self):
+        self.portfolio = build_portfolio()
+
+    def test_required_contribution_reaches_target(self):
+        solution = self.portfolio.required_contribution(
+            "pension", 500_000.0, 65, annual_increase_rate=0.02
+        )
+        self.assertEqual(solution.method, "closed_form")
+        self.assertLessEqual(solution.evaluations, 3)
+        self.assertEqual(len(self.portfolio.account_history("pension")), 1)
+
+        self.portfolio.add_contribution_rule(
+            ContributionRule("pension", solution.value, 33, 65, 0.02)
+        )
+        snapshots = list(self.portfolio.iter_projection(date(2055, 1, 1)))
+        self.assertAlmostEqual(snapshots[-1].total_balance(), 500_000.0, places=3)
+
+    def test_reached_target_needs_no_contribution(self):
+        solution = self.portfolio.required_contribution("pension", 1000.0, 65)
+        self.assertEqual(solution.value, 0.0)
+
+    def test_max_sustainable_withdrawal_lasts_until_end_age(self):
+        self.portfolio.add_contribution_rule(ContributionRule("pension", 800.0, 33, 65))
+        solution = self.portfolio.max_sustainable_withdrawal("pension", 65, 95)
+        self.assertEqual(solution.method, "closed_form")
+        self.assertLessEqual(solution.evaluations, 3)
+
+        self.portfolio.add_withdrawal_rule(
+            WithdrawalRule("pension", solution.value, 65, 95)
+        )
+        totals = [
+            snapshot.total_balance()
+            for snapshot in self.portfolio.iter_projection(date(2085, 1, 1))
+        ]
+        self.assertAlmostEqual(min(totals), 0.0, places=3)
+
+    def test_unknown_account_raises(self):
+        with self.assertRaises(KeyError):
+            self.portfolio.required_contribution("cash", 1000.0, 65)
+        with self.assertRaises(KeyError):
+            self.portfolio.max_sustainable_withdrawal("cash", 65, 95)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from datetime import date
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+
+
+def build_portfolio(history_mode: str = "full") -> AccountPortfolio:
+    portfolio = AccountPortfolio(date(1990, 1, 1), history_mode=history_mode)
+    portfolio.add_account(
+        "pension", 10000.0, date(2023, 3, 15), FixedInterestStrategy(0.04)
+    )
+    portfolio.add_account(
+        "savings", 500.0, date(2023, 1, 1), FixedInterestStrategy(0.01)
+    )
+    portfolio.add_contribution_rule(ContributionRule("pension", 500.0, 33, 65, 0.02))
+    portfolio.add_contribution_rule(ContributionRule("pension", 50.0, 40, 45))
+    portfolio.add_withdrawal_rule(WithdrawalRule("pension", 2000.0, 65, 90))
+    return portfolio
+
+
+def last_entry_per_date(history, yearly: bool = False):
+    kept = {}
+    start = history[0][0]
+    for entry_date, amount in history:
+        if not yearly or entry_date == start or entry_date.month == 1:
+            kept[entry_date] = amount
+    return list(kept.items())
+
+
+class TestHistoryModes(unittest.TestCase):
+    def setUp(self):
+        self.full = build_portfolio()
+        self.full.project_to_age(70)
+
+    def assertModeKeeps(self, mode: str, engine: str, yearly: bool = False):
+        portfolio = build_portfolio(mode)
+        portfolio.project_to_age(70, engine=engine)
+        for name in portfolio.get_account_names():
+            expected = last_entry_per_date(self.full.account_history(name), yearly)
+            actual = portfolio.account_history(name, as_list=True)
+            self.assertEqual([d for d, _ in actual], [d for d, _ in expected])
+            for (_, exp_amount), (_, act_amount) in zip(expected, actual):
+                self.assertAlmostEqual(act_amount, exp_amount, delta=1e-6)
+            self.assertAlmostEqual(
+                portfolio.get_balance(name), self.full.get_balance(name), delta=1e-6
+            )
+
+    def test_month_end_keeps_one_entry_per_month(self):
+        self.assertModeKeeps("month_end", "loop")
+        self.assertModeKeeps("month_end", "vectorized")
+
+    def test_yearly_keeps_start_and_januaries(self):
+        self.assertModeKeeps("yearly", "loop", yearly=True)
+        self.assertModeKeeps("yearly", "vectorized", yearly=True)
+
+    def test_none_keeps_no_history(self):
+        for engine in ("loop", "vectorized"):
+            portfolio = build_portfolio("none")
+            portfolio.project_to_age(70, engine=engine)
+            self.assertEqual(len(portfolio.account_history("pension")), 0)
+            self.assertAlmostEqual(
+                portfolio.total_balance(), self.full.total_balance(), delta=1e-6
+            )
+            self.assertEqual(
+                portfolio._accounts["pension"].current_date(),
+                self.full._accounts["pension"].current_date(),
+            )
+
+    def test_mode_applies_to_all_accounts(self):
+        portfolio = build_portfolio()
+        portfolio.set_history_mode("none")
+        portfolio.add_account("cash", 1.0, date(2023, 1, 1), FixedInterestStrategy(0))
+        portfolio.project_to_age(40)
+        self.assertEqual(portfolio.history_mode(), "none")
+        for name in portfolio.get_account_names():
+            self.assertEqual(
+                len(portfolio.account_history(name)), 1 if name != "cash" else 0
+            )
+
+    def test_unknown_mode_raises(self):
+        with self.assertRaises(ValueError):
+            AccountPortfolio(date(1990, 1, 1), history_mode="daily")
+        with self.assertRaises(ValueError):
+            build_portfolio().set_history_mode("daily")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,164 @@
+import unittest
+from datetime import date
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+
+
+def build_portfolio(history_mode: str = "full") -> AccountPortfolio:
+    portfolio = AccountPortfolio(date(1980, 2, 29), history_mode=history_mode)
+    portfolio.add_account(
+        "pension", 10000.0, date(2020, 5, 17), FixedInterestStrategy(0.04)
+    )
+    portfolio.add_account(
+        "savings", 500.0, date(2024, 1, 1), FixedInterestStrategy(0.01)
+    )
+    portfolio.add_contribution_rule(ContributionRule("pension", 500.0, 40, 65, 0.02))
+    portfolio.add_withdrawal_rule(WithdrawalRule("pension", 2000.0, 65, 90))
+    portfolio.add_withdrawal_rule(WithdrawalRule("savings", 20.0, 85, 95))
+    return portfolio
+
+
+def fresh_projection(portfolio: AccountPortfolio, target_age: int) -> AccountPortfolio:
+    """Project the same accounts and rules from scratch."""
+    fresh = AccountPortfolio(portfolio.birthdate(), portfolio.history_mode())
+    for name in portfolio.get_account_names():
+        account = portfolio._accounts[name]
+        fresh.add_account(
+            name, account.initial_amount(), account.start_date(), account.strategy()
+        )
+    for rule in portfolio.contribution_rules():
+        fresh.add_contribution_rule(rule)
+    for rule in portfolio.withdrawal_rules():
+        fresh.add_withdrawal_rule(rule)
+    fresh.project_to_age(target_age)
+    return fresh
+
+
+class TestIncrementalProjection(unittest.TestCase):
+    def setUp(self):
+        self.portfolio = build_portfolio()
+        self.portfolio.reproject_to_age(100)
+
+    def assertMatchesFreshProjection(
+        self, portfolio: AccountPortfolio, target_age: int = 100
+    ):
+        fresh = fresh_projection(portfolio, target_age)
+        self.assertEqual(portfolio.get_account_names(), fresh.get_account_names())
+        for name in fresh.get_account_names():
+            self.assertEqual(
+                portfolio.account_history(name), fresh.account_history(name)
+            )
+
+    def test_first_reprojection_matches_project_to_age(self):
+        self.assertMatchesFreshProjection(self.portfolio)
+
+    def test_late_rule_edit_only_reprojects_from_checkpoint(self):
+        savings_view = self.portfolio.account_history("savings")
+        pension_view = self.portfolio.account_history("pension")
+        self.portfolio.update_withdrawal_rule(
+            0, WithdrawalRule("pension", 2500.0, 88, 90)
+        )
+        self.portfolio.reproject_to_age(100)
+        self.assertMatchesFreshProjection(self.portfolio)
+
+        # Untouched accounts keep their history; the edited one keeps everything
+        # before the January 1st preceding age 65, the earlier of both versions
+        self.assertIs(
+            self.portfolio.account_history("savings")._amounts.base,
+            savings_view._amounts.base,
+        )
+        kept = self.portfolio.account_history("pension")
+        prefix = [entry for entry in pension_view if entry[0] < date(2045, 1, 1)]
+        self.assertEqual(kept[: len(prefix)], prefix)
+
+    def test_rule_add_and_remove(self):
+        self.portfolio.add_contribution_rule(ContributionRule("savings", 50.0, 50, 60))
+        self.portfolio.remove_withdrawal_rule(1)
+        self.portfolio.reproject_to_age(100)
+        self.assertMatchesFreshProjection(self.portfolio)
+        self.portfolio.remove_contribution_rule(0)
+        self.portfolio.reproject_to_age(100)
+        self.assertMatchesFreshProjection(self.portfolio)
+
+    def test_adding_and_removing_accounts_changes_lockstep_steps(self):
+        self.portfolio.add_account(
+            "late", 100.0, date(2030, 7, 20), FixedInterestStrategy(0.03)
+        )
+        self.portfolio.add_contribution_rule(ContributionRule("late", 10.0, 50, 60))
+        self.portfolio.reproject_to_age(100)
+        self.assertMatchesFreshProjection(self.portfolio)
+
+        self.portfolio.remove_account("late")
+        self.assertEqual(len(self.portfolio.contribution_rules()), 1)
+        self.portfolio.reproject_to_age(100)
+        self.assertMatchesFreshProjection(self.portfolio)
+
+    def test_sparse_history_modes(self):
+        for mode in ("month_end", "yearly", "none"):
+            portfolio = build_portfolio(mode)
+            portfolio.reproject_to_age(100)
+            portfolio.update_contribution_rule(
+                0, ContributionRule("pension", 700.0, 45, 60)
+            )
+            portfolio.reproject_to_age(100)
+            self.assertMatchesFreshProjection(portfolio)
+            self.assertEqual(
+                portfolio.total_balance(),
+                fresh_projection(portfolio, 100).total_balance(),
+            )
+
+    def test_other_changes_project_everything_again(self):
+        self.portfolio.deposit("savings", 100.0)
+        self.portfolio.reproject_to_age(100)
+        self.assertMatchesFreshProjection(self.portfolio)
+        self.portfolio.reproject_to_age(90)
+        self.assertMatchesFreshProjection(self.portfolio, 90)
+
+    def test_vectorized_engine(self):
+        portfolio = build_portfolio()
+        portfolio.reproject_to_age(100, engine="vectorized")
+        portfolio.update_withdrawal_rule(0, WithdrawalRule("pension", 2500.0, 70, 90))
+        portfolio.reproject_to_age(100, engine="vectorized")
+        fresh = fresh_projection(portfolio, 100)
+        for name in fresh.get_account_names():
+            self.assertAlmostEqual(
+                portfolio.get_balance(name), fresh.get_balance(name), delta=1e-6
+            )
+            self.assertEqual(
+                len(portfolio.account_history(name)), len(fresh.account_history(name))
+            )
+
+    def test_progress_and_resuming_an_interrupted_reprojection(self):
+        self.portfolio.update_withdrawal_rule(
+            0, WithdrawalRule("pension", 2500.0, 70, 90)
+        )
+        self.portfolio.add_contribution_rule(ContributionRule("savings", 50.0, 50, 60))
+
+        def interrupt(completed, total):
+            raise RuntimeError("cancelled")
+
+        with self.assertRaises(RuntimeError):
+            self.portfolio.reproject_to_age(100, progress=interrupt)
+        reports = []
+        self.portfolio.reproject_to_age(
+            100, progress=lambda completed, total: reports.append((completed, total))
+        )
+        self.assertMatchesFreshProjection(self.portfolio)
+        # Only the savings account was left to finish after the interruption
+        self.assertEqual(len(reports), 1)
+        self.assertEqual(reports[0][0], reports[0][1])
+
+    def test_edits_validate_accounts(self):
+        with self.assertRaises(KeyError):
+            self.portfolio.update_contribution_rule(
+                0, ContributionRule("cash", 1.0, 40, 50)
+            )
+        with self.assertRaises(KeyError):
+            self.portfolio.remove_account("cash")
+        with self.assertRaises(IndexError):
+            self.portfolio.remove_withdrawal_rule(5)
+
+
+if __name__ == "__main__":
+    unittest.main()
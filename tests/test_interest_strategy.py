@@ -0,0 +1,142 @@
+import unittest
+from datetime import date
+
+import numpy as np
+
+from src.account_portfolio import AccountPortfolio, ContributionRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.interest_strategy.interest_strategy import InterestStrategy
+from src.interest_strategy.lognormal_interest_strategy import (
+    LognormalInterestStrategy,
+)
+from src.interest_strategy.scheduled_interest_strategy import (
+    ScheduledInterestStrategy,
+)
+from src.interest_strategy.strategy_registry import strategy_from_spec
+
+
+class MonthDependentStrategy(InterestStrategy):
+    def get_monthly_rate(self, current_date: date) -> float:
+        return current_date.month / 1000
+
+    def spec(self):
+        return {"type": "month_dependent"}
+
+
+class TestInterestStrategy(unittest.TestCase):
+    def setUp(self):
+        self.dates = [date(2023, 1, 15), date(2023, 2, 1), date(2023, 3, 1)]
+
+    def test_default_batched_rates_fall_back_to_scalar(self):
+        rates = MonthDependentStrategy().get_monthly_rates(self.dates)
+        np.testing.assert_array_equal(rates, [0.001, 0.002, 0.003])
+
+    def test_fixed_batched_rates_match_scalar(self):
+        strategy = FixedInterestStrategy(0.04)
+        rates = strategy.get_monthly_rates(self.dates)
+        self.assertEqual(rates.shape, (3,))
+        for rate, d in zip(rates, self.dates):
+            self.assertEqual(rate, strategy.get_monthly_rate(d))
+
+    def test_batched_rates_for_empty_horizon(self):
+        self.assertEqual(FixedInterestStrategy(0.04).get_monthly_rates([]).shape, (0,))
+        self.assertEqual(MonthDependentStrategy().get_monthly_rates([]).shape, (0,))
+
+    def test_strategies_are_recreated_from_their_spec(self):
+        for strategy in (
+            FixedInterestStrategy(0.04),
+            LognormalInterestStrategy(0.05, 0.15, seed=3),
+            ScheduledInterestStrategy(
+                [(date(2023, 2, 10), 0.05), (date(2024, 1, 1), 0.02)]
+            ),
+        ):
+            recreated = strategy_from_spec(strategy.spec())
+            self.assertIs(type(recreated), type(strategy))
+            self.assertEqual(recreated.spec(), strategy.spec())
+            np.testing.assert_array_equal(
+                recreated.get_monthly_rates(self.dates),
+                strategy.get_monthly_rates(self.dates),
+            )
+
+    def test_unknown_strategy_type_raises(self):
+        with self.assertRaises(ValueError):
+            strategy_from_spec({"type": "unknown"})
+
+
+class TestScheduledInterestStrategy(unittest.TestCase):
+    def setUp(self):
+        # Glide path: 6% until 2030, 4% in 2030, 2% from 2031 on
+        self.strategy = ScheduledInterestStrategy(
+            [
+                (date(2020, 1, 1), 0.06),
+                (date(2030, 1, 15), 0.04),
+                (date(2031, 1, 1), 0.02),
+            ]
+        )
+
+    def test_rates_follow_the_segments(self):
+        expected = [
+            (date(2010, 5, 1), 0.06),
+            (date(2029, 12, 31), 0.06),
+            (date(2030, 1, 1), 0.04),
+            (date(2030, 12, 1), 0.04),
+            (date(2031, 1, 1), 0.02),
+            (date(2090, 1, 1), 0.02),
+        ]
+        for d, annual_rate in expected:
+            self.assertEqual(
+                self.strategy.get_monthly_rate(d),
+                FixedInterestStrategy(annual_rate).get_monthly_rate(d),
+            )
+
+    def test_batched_rates_match_scalar(self):
+        dates = [date(2019 + k // 12, k % 12 + 1, 1) for k in range(180)]
+        rates = self.strategy.get_monthly_rates(dates)
+        self.assertEqual(rates.shape, (180,))
+        for rate, d in zip(rates, dates):
+            self.assertEqual(rate, self.strategy.get_monthly_rate(d))
+        self.assertEqual(self.strategy.get_monthly_rates([]).shape, (0,))
+
+    def test_monthly_rate_table(self):
+        strategy = ScheduledInterestStrategy.from_monthly_rates(
+            date(2024, 11, 20), [0.01, 0.02, 0.03]
+        )
+        np.testing.assert_array_equal(
+            strategy.get_monthly_rates(
+                [
+                    date(2024, 10, 1),
+                    date(2024, 11, 1),
+                    date(2025, 1, 31),
+                    date(2026, 1, 1),
+                ]
+            ),
+            [0.01, 0.01, 0.03, 0.03],
+        )
+        self.assertEqual(strategy_from_spec(strategy.spec()).spec(), strategy.spec())
+
+    def test_invalid_schedules_raise(self):
+        with self.assertRaises(ValueError):
+            ScheduledInterestStrategy([])
+        with self.assertRaises(ValueError):
+            ScheduledInterestStrategy(
+                [(date(2030, 1, 1), 0.04), (date(2030, 1, 20), 0.02)]
+            )
+        with self.assertRaises(ValueError):
+            ScheduledInterestStrategy([(date(2030, 1, 1), float("nan"))])
+
+    def test_projection_with_a_schedule(self):
+        portfolio = AccountPortfolio(date(1990, 1, 1))
+        portfolio.add_account("pension", 1000.0, date(2023, 1, 1), self.strategy)
+        portfolio.add_contribution_rule(ContributionRule("pension", 100.0, 33, 60))
+        vectorized = AccountPortfolio.from_spec(portfolio.spec())
+        portfolio.project_to_age(60)
+        vectorized.project_to_age(60, engine="vectorized")
+        self.assertAlmostEqual(
+            portfolio.get_balance("pension"),
+            vectorized.get_balance("pension"),
+            places=6,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from datetime import date
+from itertools import islice
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+
+
+def build_portfolio() -> AccountPortfolio:
+    portfolio = AccountPortfolio(date(1990, 1, 1))
+    portfolio.add_account(
+        "pension", 10000.0, date(2023, 1, 1), FixedInterestStrategy(0.04)
+    )
+    portfolio.add_account(
+        "savings", 500.0, date(2023, 1, 1), FixedInterestStrategy(0.01)
+    )
+    portfolio.add_contribution_rule(ContributionRule("pension", 500.0, 33, 65, 0.02))
+    portfolio.add_withdrawal_rule(WithdrawalRule("savings", 50.0, 33, 34))
+    portfolio.add_withdrawal_rule(WithdrawalRule("pension", 2000.0, 65, 90))
+    return portfolio
+
+
+class TestIterProjection(unittest.TestCase):
+    def setUp(self):
+        self.portfolio = build_portfolio()
+        self.target_date = date(2060, 1, 1)
+
+    def test_last_snapshot_matches_project_to_date(self):
+        snapshots = list(self.portfolio.iter_projection(self.target_date))
+        expected = build_portfolio()
+        expected.project_to_date(self.target_date)
+        self.assertEqual(len(snapshots), 12 * 37)
+        for name in expected.get_account_names():
+            self.assertEqual(snapshots[-1].balances[name], expected.get_balance(name))
+        self.assertEqual(snapshots[-1].date, date(2059, 12, 1))
+        self.assertEqual(snapshots[-1].age, 69)
+
+    def test_does_not_change_accounts_by_default(self):
+        for _ in self.portfolio.iter_projection(self.target_date):
+            pass
+        self.assertEqual(self.portfolio.get_balance("pension"), 10000.0)
+        self.assertEqual(len(self.portfolio.account_history("pension")), 1)
+
+    def test_record_history_advances_accounts(self):
+        for _ in self.portfolio.iter_projection(self.target_date, record_history=True):
+            pass
+        expected = build_portfolio()
+        expected.project_to_date(self.target_date)
+        self.assertEqual(
+            self.portfolio.account_history("pension"),
+            expected.account_history("pension"),
+        )
+
+    def test_snapshots_report_monthly_cash_flows(self):
+        first = next(iter(self.portfolio.iter_projection(self.target_date)))
+        self.assertEqual(first.date, date(2023, 1, 1))
+        self.assertEqual(first.age, 33)
+        self.assertEqual(first.contributions, {"pension": 500.0, "savings": 0.0})
+        self.assertEqual(first.withdrawals, {"pension": 0.0, "savings": 50.0})
+        self.assertAlmostEqual(
+            first.total_balance(),
+            10500.0 * 1.04 ** (1 / 12) + 450.0 * 1.01 ** (1 / 12),
+        )
+
+    def test_accounts_join_in_their_start_month(self):
+        self.portfolio.add_account(
+            "brokerage", 100.0, date(2023, 3, 15), FixedInterestStrategy(0.0)
+        )
+        snapshots = list(islice(self.portfolio.iter_projection(self.target_date), 3))
+        self.assertNotIn("brokerage", snapshots[1].balances)
+        self.assertEqual(snapshots[2].balances["brokerage"], 100.0)
+        self.assertEqual(snapshots[2].date, date(2023, 3, 1))
+
+    def test_staggered_accounts_end_where_project_to_date_leaves_them(self):
+        def staggered():
+            portfolio = AccountPortfolio(date(1990, 1, 1))
+            portfolio.add_account(
+                "a", 1000.0, date(2023, 1, 1), FixedInterestStrategy(0.04)
+            )
+            portfolio.add_account(
+                "b", 1000.0, date(2025, 6, 1), FixedInterestStrategy(0.04)
+            )
+            return portfolio
+
+        target_date = date(2030, 1, 1)
+        expected = staggered()
+        expected.project_to_date(target_date)
+        # "b" is advanced as many months as "a" needs, past the target date
+        self.assertEqual(expected.get_current_date("b"), date(2032, 6, 1))
+
+        recorded = staggered()
+        snapshots = list(recorded.iter_projection(target_date, record_history=True))
+        self.assertEqual(snapshots[-1].date, date(2032, 5, 1))
+        for name in ("a", "b"):
+            self.assertEqual(
+                recorded.account_history(name), expected.account_history(name)
+            )
+            self.assertEqual(snapshots[-1].balances[name], expected.get_balance(name))
+
+        # Without recording, every account stops at the target date
+        untouched = staggered()
+        snapshots = list(untouched.iter_projection(target_date))
+        self.assertEqual(snapshots[-1].date, date(2029, 12, 1))
+        self.assertAlmostEqual(
+            snapshots[-1].balances["b"], 1000.0 * 1.04 ** (55 / 12), delta=1e-9
+        )
+        self.assertEqual(untouched.get_balance("b"), 1000.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
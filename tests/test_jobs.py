@@ -0,0 +1,135 @@
+import threading
+import unittest
+from datetime import date
+
+from src.account_portfolio import AccountPortfolio, ContributionRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.interest_strategy.lognormal_interest_strategy import (
+    LognormalInterestStrategy,
+)
+from src.jobs import JobCancelled, JobRunner
+
+
+def build_portfolio() -> AccountPortfolio:
+    portfolio = AccountPortfolio(date(1990, 1, 1))
+    portfolio.add_account(
+        "pension", 10000.0, date(2023, 1, 15), FixedInterestStrategy(0.04)
+    )
+    portfolio.add_contribution_rule(ContributionRule("pension", 500.0, 33, 65))
+    return portfolio
+
+
+def wait_for(event: threading.Event, progress):
+    """A job function blocking until the test releases it, reporting progress."""
+    progress(1, 2)
+    event.wait(5)
+    progress(2, 2)
+    return "finished"
+
+
+class TestProjectionProgress(unittest.TestCase):
+    def test_loop_reports_every_month(self):
+        reports = []
+        portfolio = build_portfolio()
+        portfolio.project_to_date(
+            date(2024, 1, 1), progress=lambda *r: reports.append(r)
+        )
+        self.assertEqual(reports, [(k, 12) for k in range(1, 13)])
+
+    def test_vectorized_reports_every_account(self):
+        reports = []
+        portfolio = build_portfolio()
+        portfolio.add_account("cash", 0.0, date(2023, 6, 1), FixedInterestStrategy(0))
+        portfolio.project_to_date(
+            date(2024, 1, 1), engine="vectorized", progress=lambda *r: reports.append(r)
+        )
+        self.assertEqual(reports, [(1, 2), (2, 2)])
+
+    def test_simulation_reports_every_batch(self):
+        portfolio = AccountPortfolio(date(1990, 1, 1))
+        portfolio.add_account(
+            "stocks", 1000.0, date(2023, 1, 1), LognormalInterestStrategy(0.05, 0.15)
+        )
+        for streaming in (False, True):
+            reports = []
+            portfolio.simulate_to_age(
+                35,
+                n_paths=25000,
+                seed=1,
+                streaming=streaming,
+                progress=lambda *r: reports.append(r),
+            )
+            self.assertEqual(reports[-1], (25000, 25000))
+            self.assertEqual(len(reports), 3)
+        with self.assertRaises(ValueError):
+            portfolio.simulate_to_age(40, max_workers=2, progress=print)
+
+    def test_exception_from_progress_stops_the_projection(self):
+        def stop(completed, total):
+            if completed == 3:
+                raise JobCancelled()
+
+        portfolio = build_portfolio()
+        with self.assertRaises(JobCancelled):
+            portfolio.project_to_date(date(2024, 1, 1), progress=stop)
+        self.assertEqual(portfolio._accounts["pension"].steps_taken(), 3)
+
+
+class TestJobRunner(unittest.TestCase):
+    def setUp(self):
+        self.runner = JobRunner(max_workers=1)
+
+    def tearDown(self):
+        self.runner.shutdown()
+
+    def test_job_returns_result_and_progress(self):
+        portfolio = build_portfolio()
+        job = self.runner.submit("session", portfolio.project_to_age, 40)
+        self.assertIsNone(job.result(timeout=10))
+        self.assertEqual(job.state(), "done")
+        self.assertEqual(job.progress(), (84, 84))
+        self.assertEqual(job.fraction(), 1.0)
+        self.assertIs(self.runner.job("session"), job)
+        self.assertGreater(portfolio.get_balance("pension"), 10000.0)
+
+    def test_cancel_stops_a_running_job(self):
+        release = threading.Event()
+        job = self.runner.submit("session", wait_for, release)
+        while job.progress() != (1, 2):
+            pass
+        self.assertEqual(job.state(), "running")
+        self.assertEqual(job.fraction(), 0.5)
+        self.runner.cancel("session")
+        release.set()
+        with self.assertRaises(JobCancelled):
+            job.result(timeout=10)
+        self.assertEqual(job.state(), "cancelled")
+        self.assertIsNone(job.error())
+
+    def test_newer_job_supersedes_the_stale_one(self):
+        release = threading.Event()
+        stale = self.runner.submit("session", wait_for, release)
+        # Queued behind the stale job on the single worker
+        queued = self.runner.submit("other", wait_for, release)
+        newer = self.runner.submit("other", wait_for, threading.Event())
+        self.assertEqual(queued.state(), "cancelled")
+        release.set()
+        self.assertEqual(stale.result(timeout=10), "finished")
+        newer.cancel()
+        with self.assertRaises(JobCancelled):
+            queued.result(timeout=10)
+        self.assertIs(self.runner.job("other"), newer)
+
+    def test_failed_job_exposes_its_error(self):
+        def fail(progress):
+            raise ValueError("bad input")
+
+        job = self.runner.submit("session", fail)
+        with self.assertRaises(ValueError):
+            job.result(timeout=10)
+        self.assertEqual(job.state(), "failed")
+        self.assertIsInstance(job.error(), ValueError)
+
+
+if __name__ == "__main__":
+    unittest.main()
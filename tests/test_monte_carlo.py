@@ -0,0 +1,127 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.interest_strategy.lognormal_interest_strategy import (
+    LognormalInterestStrategy,
+)
+from src.projection.monte_carlo import simulate
+from src.projection.parallel_monte_carlo import simulate_parallel
+
+
+class TestMonteCarlo(unittest.TestCase):
+    def setUp(self):
+        self.portfolio = AccountPortfolio(date(1990, 1, 1))
+        self.portfolio.add_account(
+            "pension",
+            10000.0,
+            date(2023, 1, 1),
+            LognormalInterestStrategy(0.05, 0.15, seed=7),
+        )
+        self.portfolio.add_account(
+            "savings", 5000.0, date(2023, 1, 1), FixedInterestStrategy(0.02)
+        )
+        self.portfolio.add_contribution_rule(
+            ContributionRule("pension", 500.0, 33, 65, 0.02)
+        )
+        self.portfolio.add_withdrawal_rule(WithdrawalRule("pension", 2000.0, 65, 95))
+
+    def test_zero_volatility_matches_deterministic_projection(self):
+        portfolio = AccountPortfolio(date(1990, 1, 1))
+        portfolio.add_account(
+            "pension", 10000.0, date(2023, 1, 1), LognormalInterestStrategy(0.05, 0.0)
+        )
+        portfolio.add_contribution_rule(ContributionRule("pension", 500.0, 33, 65))
+        result = portfolio.simulate_to_age(70, n_paths=3, seed=1)
+
+        deterministic = AccountPortfolio(date(1990, 1, 1))
+        deterministic.add_account(
+            "pension", 10000.0, date(2023, 1, 1), FixedInterestStrategy(0.05)
+        )
+        deterministic.add_contribution_rule(ContributionRule("pension", 500.0, 33, 65))
+        deterministic.project_to_age(70)
+
+        self.assertEqual(result.balances.shape, (3, 12 * 37 + 1))
+        np.testing.assert_allclose(
+            result.balances[:, -1], deterministic.get_balance("pension"), rtol=1e-9
+        )
+        self.assertEqual(result.dates()[-1], date(2060, 1, 1))
+
+    def test_same_seed_reproduces_paths(self):
+        first = self.portfolio.simulate_to_age(90, n_paths=200, seed=42)
+        second = self.portfolio.simulate_to_age(90, n_paths=200, seed=42)
+        np.testing.assert_array_equal(first.balances, second.balances)
+
+    def test_simulation_does_not_change_accounts(self):
+        self.portfolio.simulate_to_age(90, n_paths=10, seed=1)
+        self.assertEqual(len(self.portfolio.account_history("pension")), 1)
+        self.assertEqual(self.portfolio.get_balance("pension"), 10000.0)
+
+    def test_percentile_bands_and_depletion(self):
+        result = self.portfolio.simulate_to_age(95, n_paths=2000, seed=3)
+        low, median, high = result.percentiles((5, 50, 95))
+        self.assertTrue(np.all(low <= median) and np.all(median <= high))
+        self.assertEqual(low[0], 15000.0)
+        curve = result.depletion_curve()
+        self.assertTrue(np.all(np.diff(curve) >= 0))
+        self.assertEqual(curve[-1], result.depletion_probability())
+        self.assertGreater(result.depletion_probability(), 0.0)
+        self.assertLess(result.depletion_probability(), 1.0)
+
+    def test_parallel_results_do_not_depend_on_worker_count(self):
+        plans = [
+            self.portfolio._account_plan(name, 12 * 50)
+            for name in self.portfolio.get_account_names()
+        ]
+        serial = simulate(plans, 250, seed=5, batch_size=40)
+        for workers in (1, 3):
+            parallel = simulate_parallel(
+                plans, 250, seed=5, max_workers=workers, batch_size=40
+            )
+            np.testing.assert_array_equal(parallel.balances, serial.balances)
+
+    def test_portfolio_simulation_across_processes(self):
+        serial = self.portfolio.simulate_to_age(80, n_paths=100, seed=9)
+        parallel = self.portfolio.simulate_to_age(
+            80, n_paths=100, seed=9, max_workers=2
+        )
+        np.testing.assert_array_equal(parallel.balances, serial.balances)
+        self.assertEqual(parallel.start_date, serial.start_date)
+
+    def test_paths_written_to_a_memmap(self):
+        serial = self.portfolio.simulate_to_age(80, n_paths=100, seed=9)
+        with tempfile.TemporaryDirectory() as directory:
+            for workers in (1, 2):
+                path = os.path.join(directory, f"paths_{workers}.npy")
+                mapped = self.portfolio.simulate_to_age(
+                    80, n_paths=100, seed=9, max_workers=workers, memmap_path=path
+                )
+                self.assertIsInstance(mapped.balances, np.memmap)
+                np.testing.assert_array_equal(mapped.balances, serial.balances)
+                np.testing.assert_array_equal(np.load(path), serial.balances)
+                del mapped
+            with self.assertRaises(ValueError):
+                self.portfolio.simulate_to_age(
+                    80, n_paths=100, streaming=True, memmap_path=path
+                )
+
+    def test_scalar_rates_are_reproducible(self):
+        strategy = LognormalInterestStrategy(0.05, 0.15, seed=11)
+        later = strategy.get_monthly_rate(date(2030, 5, 1))
+        strategy.get_monthly_rate(date(2024, 1, 1))
+        self.assertEqual(strategy.get_monthly_rate(date(2030, 5, 1)), later)
+
+    def test_invalid_parameters_raise(self):
+        with self.assertRaises(ValueError):
+            LognormalInterestStrategy(-1.0, 0.1)
+        with self.assertRaises(ValueError):
+            LognormalInterestStrategy(0.05, -0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+
+
+def build_portfolio(
+    retirement_age: int = 65,
+    contribution: float = 500.0,
+    withdrawal: float = 2000.0,
+    pension_rate: float = 0.04,
+    savings_rate: float = 0.01,
+) -> AccountPortfolio:
+    portfolio = AccountPortfolio(date(1990, 1, 1))
+    portfolio.add_account(
+        "pension", 10000.0, date(2023, 1, 15), FixedInterestStrategy(pension_rate)
+    )
+    portfolio.add_account(
+        "savings", 500.0, date(2024, 6, 1), FixedInterestStrategy(savings_rate)
+    )
+    portfolio.add_contribution_rule(
+        ContributionRule("pension", contribution, 33, retirement_age, 0.02)
+    )
+    portfolio.add_withdrawal_rule(
+        WithdrawalRule("pension", withdrawal, retirement_age, 95)
+    )
+    return portfolio
+
+
+def final_total(portfolio: AccountPortfolio, target_age: int) -> float:
+    target_date = date(1990 + target_age, 1, 1)
+    snapshots = list(portfolio.iter_projection(target_date))
+    return snapshots[-1].total_balance()
+
+
+class TestParameterSweep(unittest.TestCase):
+    def setUp(self):
+        self.portfolio = build_portfolio()
+
+    def test_grid_matches_individual_projections(self):
+        result = self.portfolio.sweep(
+            90,
+            retirement_ages=[60, 67],
+            contribution_amounts=[400.0, 800.0],
+            annual_rates=[0.03, 0.06],
+            withdrawal_amounts=[1500.0, 2500.0],
+        )
+        self.assertEqual(len(result), 16)
+        self.assertEqual(
+            list(result.columns),
+            [
+                "retirement_age",
+                "contribution_amount",
+                "annual_rate",
+                "withdrawal_amount",
+                "final_balance",
+                "min_balance",
+                "depletion_date",
+            ],
+        )
+        for row in result.itertuples():
+            expected = build_portfolio(
+                row.retirement_age,
+                row.contribution_amount,
+                row.withdrawal_amount,
+                row.annual_rate,
+                row.annual_rate,
+            )
+            self.assertAlmostEqual(
+                row.final_balance, final_total(expected, 90), delta=1e-6
+            )
+
+    def test_unswept_parameters_keep_portfolio_values(self):
+        result = self.portfolio.sweep(90, contribution_amounts=[500.0])
+        self.assertEqual(
+            list(result.columns),
+            ["contribution_amount", "final_balance", "min_balance", "depletion_date"],
+        )
+        self.assertAlmostEqual(
+            result["final_balance"].iloc[0],
+            final_total(build_portfolio(), 90),
+            delta=1e-6,
+        )
+
+    def test_depletion_date(self):
+        result = self.portfolio.sweep(95, withdrawal_amounts=[10.0, 50000.0])
+        self.assertTrue(pd.isna(result["depletion_date"].iloc[0]))
+        # Closing balance of November 2055, recorded on the first of December
+        self.assertEqual(result["depletion_date"].iloc[1], pd.Timestamp(2055, 12, 1))
+        self.assertLess(result["min_balance"].iloc[1], 0)
+        self.assertGreaterEqual(result["min_balance"].iloc[0], 0)
+
+    def test_does_not_change_accounts(self):
+        self.portfolio.sweep(90, retirement_ages=[60, 70], annual_rates=[0.05])
+        self.assertEqual(len(self.portfolio.account_history("pension")), 1)
+        self.assertEqual(self.portfolio.get_balance("pension"), 10000.0)
+
+    def test_parallel_matches_in_process(self):
+        axes = dict(
+            retirement_ages=[60, 63, 67],
+            contribution_amounts=[400.0, 800.0],
+            annual_rates=[0.03, 0.06],
+        )
+        in_process = self.portfolio.sweep(90, **axes)
+        parallel = self.portfolio.sweep(90, max_workers=2, **axes)
+        pd.testing.assert_frame_equal(in_process, parallel)
+
+    def test_invalid_retirement_age_raises(self):
+        with self.assertRaises(ValueError):
+            self.portfolio.sweep(90, retirement_ages=[20])
+
+    def test_staged_rules_move_with_retirement(self):
+        def staged(rules):
+            portfolio = AccountPortfolio(date(1990, 1, 1))
+            portfolio.add_account(
+                "pension", 10000.0, date(2023, 1, 15), FixedInterestStrategy(0.04)
+            )
+            portfolio.add_contribution_rule(ContributionRule("pension", *rules[0]))
+            for rule in rules[1:]:
+                portfolio.add_withdrawal_rule(WithdrawalRule("pension", *rule))
+            return portfolio
+
+        # A bridge withdrawal from retirement at 60 until the pension starts at 65
+        portfolio = staged([(500.0, 33, 60, 0.02), (3000.0, 60, 65), (2000.0, 65, 95)])
+        result = portfolio.sweep(90, retirement_ages=[58, 63, 67])
+        expected = {
+            58: [(500.0, 33, 58, 0.02), (3000.0, 58, 65), (2000.0, 65, 95)],
+            63: [(500.0, 33, 63, 0.02), (3000.0, 63, 65), (2000.0, 65, 95)],
+            # The bridge is dropped and the pension starts at retirement
+            67: [(500.0, 33, 67, 0.02), (2000.0, 67, 95)],
+        }
+        for row in result.itertuples():
+            self.assertAlmostEqual(
+                row.final_balance,
+                final_total(staged(expected[row.retirement_age]), 90),
+                delta=1e-6,
+            )
+
+    def test_rates_are_row_major(self):
+        result = self.portfolio.sweep(90, annual_rates=[0.0, 0.02, 0.04])
+        np.testing.assert_array_equal(result["annual_rate"], [0.0, 0.02, 0.04])
+        self.assertTrue(np.all(np.diff(result["final_balance"]) > 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,113 @@
+import unittest
+from datetime import date
+
+import numpy as np
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.interest_strategy.lognormal_interest_strategy import (
+    LognormalInterestStrategy,
+)
+from src.interest_strategy.scheduled_interest_strategy import (
+    ScheduledInterestStrategy,
+)
+from src.portfolio_batch import PortfolioBatch
+
+
+def build_portfolios():
+    leap_day = AccountPortfolio(date(1960, 2, 29))
+    leap_day.add_account(
+        "pension", 50000.0, date(2024, 2, 29), FixedInterestStrategy(0.05)
+    )
+    leap_day.add_account(
+        "stocks", 1000.0, date(2026, 7, 15), LognormalInterestStrategy(0.06, 0.2, 3)
+    )
+    leap_day.add_contribution_rule(ContributionRule("pension", 300.0, 60, 67, 0.03))
+    leap_day.add_contribution_rule(ContributionRule("stocks", 50.0, 64, 70, 0.1))
+    leap_day.add_withdrawal_rule(WithdrawalRule("pension", 900.0, 67, 90))
+    leap_day.add_withdrawal_rule(WithdrawalRule("pension", 100.0, 70, 75))
+
+    month_end = AccountPortfolio(date(1985, 1, 31))
+    month_end.add_account(
+        "savings",
+        0.0,
+        date(2025, 3, 28),
+        ScheduledInterestStrategy([(date(2025, 1, 1), 0.04), (date(2045, 1, 1), 0.01)]),
+    )
+    month_end.add_contribution_rule(ContributionRule("savings", 200.0, 40, 60, 0.02))
+
+    idle = AccountPortfolio(date(1990, 6, 1))
+    idle.add_account("cash", 5000.0, date(2023, 1, 1), FixedInterestStrategy(0.0))
+    return [leap_day, month_end, AccountPortfolio(date(2000, 1, 1)), idle]
+
+
+class TestPortfolioBatch(unittest.TestCase):
+    def assert_matches(self, batch, portfolios):
+        for p, portfolio in enumerate(portfolios):
+            self.assertEqual(batch.account_names(p), portfolio.get_account_names())
+            for name in portfolio.get_account_names():
+                self.assertEqual(batch.balance(p, name), portfolio.get_balance(name))
+                self.assertEqual(
+                    batch.current_date(p, name), portfolio.get_current_date(name)
+                )
+
+    def test_project_to_age_matches_each_portfolio(self):
+        portfolios = build_portfolios()
+        batch = PortfolioBatch.from_portfolios(portfolios)
+        batch.project_to_age(95)
+        for portfolio in portfolios:
+            if portfolio.get_account_names():
+                portfolio.project_to_age(95)
+        self.assert_matches(batch, portfolios)
+
+    def test_project_to_date_continues_from_the_current_state(self):
+        portfolios = build_portfolios()
+        for portfolio in portfolios[:2]:
+            portfolio.project_to_date(date(2030, 5, 1))
+        batch = PortfolioBatch.from_portfolios(portfolios)
+        self.assert_matches(batch, portfolios)
+
+        batch.project_to_date(date(2041, 11, 20))
+        batch.project_to_date(date(2060, 1, 1))
+        for portfolio in portfolios:
+            if portfolio.get_account_names():
+                portfolio.project_to_date(date(2041, 11, 20))
+                portfolio.project_to_date(date(2060, 1, 1))
+        self.assert_matches(batch, portfolios)
+
+    def test_portfolios_are_left_untouched(self):
+        portfolios = build_portfolios()
+        PortfolioBatch.from_portfolios(portfolios).project_to_age(80)
+        self.assertEqual(portfolios[0].get_balance("pension"), 50000.0)
+        self.assertEqual(portfolios[0].get_current_date("pension"), date(2024, 2, 29))
+
+    def test_balance_arrays(self):
+        batch = PortfolioBatch.from_portfolios(build_portfolios())
+        balances = batch.balances()
+        self.assertEqual(balances.shape, (4, 2))
+        np.testing.assert_array_equal(balances[0], [50000.0, 1000.0])
+        self.assertTrue(np.isnan(balances[1, 1]))
+        self.assertTrue(np.all(np.isnan(balances[2])))
+        np.testing.assert_array_equal(batch.total_balances(), [51000.0, 0, 0, 5000])
+        self.assertEqual(len(batch), 4)
+
+    def test_unknown_accounts_raise(self):
+        batch = PortfolioBatch.from_portfolios(build_portfolios())
+        with self.assertRaises(KeyError):
+            batch.balance(1, "pension")
+        with self.assertRaises(KeyError):
+            PortfolioBatch(
+                [date(1990, 1, 1)],
+                [[("cash", 0.0, date(2025, 1, 1), FixedInterestStrategy(0.0))]],
+                [[ContributionRule("pension", 1.0, 30, 40)]],
+                [[]],
+            )
+
+    def test_empty_batch(self):
+        batch = PortfolioBatch([], [], [], [])
+        batch.project_to_age(90)
+        self.assertEqual(batch.total_balances().shape, (0,))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.interest_strategy.interest_strategy import InterestStrategy
+from src.interest_strategy.lognormal_interest_strategy import (
+    LognormalInterestStrategy,
+)
+from src.interest_strategy.scheduled_interest_strategy import (
+    ScheduledInterestStrategy,
+)
+from src.projection.portfolio_spec import PortfolioSpec
+from src.projection.projection_cache import ProjectionCache
+
+
+def build_portfolio(contribution=500.0) -> AccountPortfolio:
+    portfolio = AccountPortfolio(date(1990, 1, 1))
+    portfolio.add_account(
+        "pension", 10000.0, date(2023, 1, 15), FixedInterestStrategy(0.04)
+    )
+    portfolio.add_account(
+        "savings", 500, date(2024, 6, 1), LognormalInterestStrategy(0.03, 0.1, seed=7)
+    )
+    portfolio.add_contribution_rule(
+        ContributionRule("pension", contribution, 33, 65, 0.02)
+    )
+    portfolio.add_withdrawal_rule(WithdrawalRule("pension", 2000.0, 65, 90))
+    return portfolio
+
+
+class TestPortfolioSpec(unittest.TestCase):
+    def test_equivalent_configurations_share_a_key(self):
+        first = build_portfolio(500.0).spec(date(2060, 1, 1))
+        second = build_portfolio(500).spec(date(2060, 1, 1))
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertEqual(first.key(), second.key())
+
+    def test_key_covers_rules_strategies_and_horizon(self):
+        portfolio = build_portfolio()
+        key = portfolio.spec(date(2060, 1, 1)).key()
+        self.assertNotEqual(key, portfolio.spec(date(2061, 1, 1)).key())
+        self.assertNotEqual(
+            key, portfolio.spec(date(2060, 1, 1), engine="vectorized").key()
+        )
+        portfolio.update_withdrawal_rule(0, WithdrawalRule("pension", 2100.0, 65, 90))
+        self.assertNotEqual(key, portfolio.spec(date(2060, 1, 1)).key())
+
+        other = AccountPortfolio(date(1990, 1, 1))
+        other.add_account(
+            "a", 1.0, date(2023, 1, 1), LognormalInterestStrategy(0.03, 0.1, seed=7)
+        )
+        reseeded = AccountPortfolio(date(1990, 1, 1))
+        reseeded.add_account(
+            "a", 1.0, date(2023, 1, 1), LognormalInterestStrategy(0.03, 0.1, seed=8)
+        )
+        self.assertNotEqual(other.spec().key(), reseeded.spec().key())
+
+    def test_spec_round_trips_through_json_and_portfolio(self):
+        portfolio = build_portfolio()
+        spec = portfolio.spec(date(2060, 1, 1), engine="vectorized")
+        self.assertEqual(PortfolioSpec.from_json(spec.to_json()), spec)
+
+        recreated = AccountPortfolio.from_spec(spec)
+        self.assertEqual(recreated.spec(date(2060, 1, 1), engine="vectorized"), spec)
+        portfolio.project_to_date(date(2060, 1, 1))
+        recreated.project_to_date(date(2060, 1, 1))
+        for name in portfolio.get_account_names():
+            self.assertEqual(recreated.get_balance(name), portfolio.get_balance(name))
+
+    def test_scheduled_strategy_spec_is_hashable(self):
+        portfolio = build_portfolio()
+        portfolio.add_account(
+            "bonds",
+            100.0,
+            date(2024, 1, 1),
+            ScheduledInterestStrategy([("2024-01-01", 0.05), ("2040-01-01", 0.02)]),
+        )
+        spec = portfolio.spec(date(2060, 1, 1))
+        restored = PortfolioSpec.from_json(spec.to_json())
+        self.assertEqual(hash(restored), hash(spec))
+        self.assertEqual(restored.key(), spec.key())
+        self.assertEqual(
+            AccountPortfolio.from_spec(restored).spec(date(2060, 1, 1)), spec
+        )
+
+    def test_strategy_without_spec_cannot_be_created(self):
+        class ConstantStrategy(InterestStrategy):
+            def get_monthly_rate(self, current_date: date) -> float:
+                return 0.0
+
+        with self.assertRaises(TypeError):
+            ConstantStrategy()
+
+
+class TestProjectionCache(unittest.TestCase):
+    def test_memory_lru_eviction_and_counters(self):
+        cache = ProjectionCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(
+            cache.stats(),
+            {"hits": 2, "disk_hits": 0, "misses": 1, "entries": 2, "disk_bytes": 0},
+        )
+
+    def test_disk_tier_survives_memory_eviction_and_new_instances(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ProjectionCache(max_entries=1, directory=directory)
+            cache.put("a", np.arange(10))
+            cache.put("b", np.arange(5))
+            np.testing.assert_array_equal(cache.get("a"), np.arange(10))
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+
+            reopened = ProjectionCache(directory=directory)
+            np.testing.assert_array_equal(reopened.get("b"), np.arange(5))
+            self.assertEqual(reopened.stats()["disk_hits"], 1)
+
+    def test_disk_tier_evicts_least_recently_used_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = ProjectionCache(max_entries=1, directory=directory, max_bytes=2500)
+            for index, key in enumerate(("a", "b", "c")):
+                cache.put(key, np.zeros(100))
+                os.utime(os.path.join(directory, key + ".pkl"), ns=(index, index))
+            cache.put("d", np.zeros(100))
+            files = sorted(os.listdir(directory))
+            self.assertNotIn("a.pkl", files)
+            self.assertIn("d.pkl", files)
+            self.assertLessEqual(cache.stats()["disk_bytes"], 2500)
+
+            cache.clear()
+            self.assertEqual(os.listdir(directory), [])
+            self.assertIsNone(cache.get("d"))
+
+    def test_get_or_compute(self):
+        cache = ProjectionCache()
+        calls = []
+        compute = lambda: calls.append(1) or "result"  # noqa: E731
+        self.assertEqual(cache.get_or_compute("k", compute), "result")
+        self.assertEqual(cache.get_or_compute("k", compute), "result")
+        self.assertEqual(len(calls), 1)
+
+
+class TestCachedReprojection(unittest.TestCase):
+    def test_unchanged_scenario_is_restored_from_cache(self):
+        cache = ProjectionCache()
+        portfolio = build_portfolio()
+        portfolio.reproject_to_age(90, cache=cache)
+        expected = {
+            name: portfolio.account_history(name, as_list=True)
+            for name in portfolio.get_account_names()
+        }
+
+        other = build_portfolio()
+        other.reproject_to_age(90, cache=cache)
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+        for name, history in expected.items():
+            self.assertEqual(other.account_history(name, as_list=True), history)
+            self.assertEqual(other.get_balance(name), history[-1][1])
+
+        # Restored accounts still support incremental edits
+        other.update_contribution_rule(0, ContributionRule("pension", 600.0, 33, 65))
+        other.reproject_to_age(90, cache=cache)
+        fresh = build_portfolio()
+        fresh.update_contribution_rule(0, ContributionRule("pension", 600.0, 33, 65))
+        fresh.project_to_age(90)
+        self.assertEqual(
+            other.account_history("pension"), fresh.account_history("pension")
+        )
+        self.assertEqual(cache.stats()["misses"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
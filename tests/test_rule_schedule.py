@@ -0,0 +1,72 @@
+import unittest
+from datetime import date
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.projection.rule_schedule import RuleSchedule
+
+
+class TestRuleSchedule(unittest.TestCase):
+    def setUp(self):
+        self.first = ContributionRule("pension", 500.0, 30, 33, 0.1)
+        self.second = ContributionRule("pension", 100.0, 31, 40)
+        self.schedule = RuleSchedule(
+            [self.first, ContributionRule("savings", 50.0, 20, 60), self.second],
+            [WithdrawalRule("pension", 1000.0, 65, 67)],
+        )
+
+    def test_contributions_are_escalated_per_age(self):
+        self.assertEqual(
+            self.schedule.contributions("pension", 30), ((self.first, 500.0),)
+        )
+        rules = self.schedule.contributions("pension", 32)
+        self.assertEqual([rule for rule, _ in rules], [self.first, self.second])
+        self.assertAlmostEqual(rules[0][1], 605.0)
+        self.assertEqual(rules[1][1], 100.0)
+
+    def test_end_age_is_exclusive(self):
+        self.assertEqual(self.schedule.contributions("pension", 40), ())
+        self.assertEqual(self.schedule.withdrawals("pension", 66), (1000.0,))
+        self.assertEqual(self.schedule.withdrawals("pension", 67), ())
+
+    def test_unknown_account_has_no_rules(self):
+        self.assertEqual(self.schedule.contributions("brokerage", 35), ())
+        self.assertEqual(self.schedule.withdrawals("brokerage", 65), ())
+
+
+class TestPortfolioRuleSchedule(unittest.TestCase):
+    def setUp(self):
+        self.portfolio = AccountPortfolio(date(1990, 1, 1))
+        self.portfolio.add_account(
+            "pension", 1000.0, date(2023, 1, 1), FixedInterestStrategy(0.0)
+        )
+        self.portfolio.add_contribution_rule(ContributionRule("pension", 100.0, 30, 40))
+
+    def test_schedule_is_compiled_once_across_months(self):
+        schedule = self.portfolio._compile_rules()
+        self.portfolio.project_one_month()
+        self.portfolio.project_one_month()
+        self.assertIs(self.portfolio._compile_rules(), schedule)
+        self.assertEqual(self.portfolio.get_balance("pension"), 1200.0)
+
+    def test_rule_changes_recompile_the_schedule(self):
+        self.portfolio.project_one_month()
+        self.portfolio.add_withdrawal_rule(WithdrawalRule("pension", 30.0, 30, 40))
+        self.portfolio.project_one_month()
+        self.assertEqual(self.portfolio.get_balance("pension"), 1170.0)
+        self.portfolio.update_contribution_rule(
+            0, ContributionRule("pension", 50.0, 30, 40)
+        )
+        self.portfolio.project_one_month()
+        self.assertEqual(self.portfolio.get_balance("pension"), 1190.0)
+        self.portfolio.remove_withdrawal_rule(0)
+        self.portfolio.project_one_month()
+        self.assertEqual(self.portfolio.get_balance("pension"), 1240.0)
+        self.portfolio.remove_account("pension")
+        self.assertEqual(
+            self.portfolio._compile_rules().contributions("pension", 33), ()
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
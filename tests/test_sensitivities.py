@@ -0,0 +1,130 @@
+import unittest
+from datetime import date
+
+import numpy as np
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.interest_strategy.scheduled_interest_strategy import (
+    ScheduledInterestStrategy,
+)
+from src.projection.sensitivities import (
+    adjoint_sensitivities,
+    forward_sensitivities,
+    log_growth_per_annual_rate,
+)
+
+STEP = 1e-6
+
+
+def build_portfolio(
+    rate=0.05, savings_rate=0.03, amount=500.0, increase_rate=0.02, withdrawal=3000.0
+) -> AccountPortfolio:
+    portfolio = AccountPortfolio(date(1980, 6, 15))
+    portfolio.add_account(
+        "pension", 10000.0, date(2025, 3, 10), FixedInterestStrategy(rate)
+    )
+    portfolio.add_account(
+        "savings",
+        5000.0,
+        date(2030, 1, 1),
+        ScheduledInterestStrategy(
+            [(date(2025, 1, 1), savings_rate), (date(2045, 1, 1), savings_rate - 0.02)]
+        ),
+    )
+    portfolio.add_contribution_rule(
+        ContributionRule("pension", amount, 45, 65, increase_rate)
+    )
+    portfolio.add_contribution_rule(ContributionRule("savings", 200.0, 50, 60, 0.01))
+    portfolio.add_withdrawal_rule(WithdrawalRule("pension", withdrawal, 65, 90))
+    return portfolio
+
+
+class TestSensitivityKernels(unittest.TestCase):
+    def test_forward_and_adjoint_agree(self):
+        rng = np.random.default_rng(0)
+        flows = rng.normal(0, 100, 60)
+        growth = 1 + rng.normal(0.004, 0.02, 60)
+        flow_tangents = rng.normal(size=(3, 60))
+        log_growth_tangents = rng.normal(size=(3, 60))
+        positions = [0, 12, 59, 60]
+        forward = forward_sensitivities(
+            1000.0, flows, growth, flow_tangents, log_growth_tangents, positions
+        )
+        adjoint = adjoint_sensitivities(
+            1000.0, flows, growth, flow_tangents, log_growth_tangents, positions
+        )
+        np.testing.assert_allclose(forward[0], adjoint[0])
+        np.testing.assert_allclose(forward[1], adjoint[1], rtol=1e-10, atol=1e-8)
+        self.assertTrue(np.all(forward[1][:, 0] == 0))
+
+    def test_log_growth_per_annual_rate(self):
+        growth = (1 + np.array([0.05, -0.2])) ** (1 / 12)
+        shifted = (1 + np.array([0.05, -0.2]) + STEP) ** (1 / 12)
+        np.testing.assert_allclose(
+            log_growth_per_annual_rate(growth),
+            (np.log(shifted) - np.log(growth)) / STEP,
+            rtol=1e-5,
+        )
+
+
+class TestBalanceSensitivities(unittest.TestCase):
+    def test_derivatives_match_finite_differences(self):
+        sensitivities = build_portfolio().balance_sensitivities(80, ages=[60, 70])
+        self.assertEqual(sensitivities.ages, [60, 70, 80])
+        bumps = {
+            ("annual_rate", "pension"): lambda h: build_portfolio(rate=0.05 + h),
+            ("annual_rate", "savings"): lambda h: build_portfolio(
+                savings_rate=0.03 + h
+            ),
+            ("contribution_amount", 0): lambda h: build_portfolio(amount=500.0 + h),
+            ("contribution_increase_rate", 0): lambda h: build_portfolio(
+                increase_rate=0.02 + h
+            ),
+            ("withdrawal_amount", 0): lambda h: build_portfolio(withdrawal=3000.0 + h),
+        }
+        for key, bumped in bumps.items():
+            expected = [
+                (bumped(STEP).balance_at_age(age) - bumped(-STEP).balance_at_age(age))
+                / (2 * STEP)
+                for age in sensitivities.ages
+            ]
+            np.testing.assert_allclose(
+                sensitivities.derivative(*key), expected, rtol=1e-6, atol=1e-4
+            )
+
+    def test_modes_agree_with_the_projection(self):
+        portfolio = build_portfolio()
+        forward = portfolio.balance_sensitivities(80, ages=[40, 65])
+        adjoint = portfolio.balance_sensitivities(80, ages=[40, 65], mode="adjoint")
+        np.testing.assert_allclose(forward.derivatives, adjoint.derivatives, rtol=1e-12)
+        np.testing.assert_allclose(
+            forward.balances, [portfolio.balance_at_age(age) for age in forward.ages]
+        )
+        # Nothing is open at 40, and the savings rules only affect savings
+        self.assertTrue(np.all(forward.frame()[40] == 0))
+        self.assertEqual(forward.derivative("contribution_amount", 1)[0], 0)
+        self.assertEqual(portfolio.get_current_date("pension"), date(2025, 3, 10))
+
+    def test_single_account_matches_project_to_age(self):
+        portfolio = build_portfolio()
+        portfolio.remove_account("savings")
+        sensitivities = portfolio.balance_sensitivities(70)
+        self.assertEqual(len(sensitivities.inputs), 4)
+        portfolio.project_to_age(70)
+        self.assertAlmostEqual(
+            sensitivities.balances[-1], portfolio.get_balance("pension"), places=6
+        )
+
+    def test_invalid_queries(self):
+        portfolio = build_portfolio()
+        with self.assertRaises(ValueError):
+            portfolio.balance_sensitivities(70, mode="reverse")
+        with self.assertRaises(ValueError):
+            portfolio.balance_sensitivities(70, ages=[75])
+        with self.assertRaises(KeyError):
+            portfolio.balance_sensitivities(70).derivative("annual_rate", "missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
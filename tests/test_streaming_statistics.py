@@ -0,0 +1,92 @@
+import unittest
+from datetime import date
+
+import numpy as np
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.interest_strategy.lognormal_interest_strategy import (
+    LognormalInterestStrategy,
+)
+from src.projection.monte_carlo import simulate, simulate_streaming
+from src.projection.parallel_monte_carlo import simulate_streaming_parallel
+from src.projection.streaming_statistics import (
+    MonteCarloSummary,
+    MonthlyQuantileSketch,
+)
+
+
+class TestStreamingStatistics(unittest.TestCase):
+    def setUp(self):
+        self.values = np.random.default_rng(0).normal(50_000, 40_000, (3000, 4))
+        portfolio = AccountPortfolio(date(1980, 1, 1))
+        portfolio.add_account(
+            "pension",
+            50000.0,
+            date(2023, 1, 1),
+            LognormalInterestStrategy(0.05, 0.18, seed=2),
+        )
+        portfolio.add_contribution_rule(ContributionRule("pension", 300.0, 43, 60))
+        portfolio.add_withdrawal_rule(WithdrawalRule("pension", 1500.0, 60, 90))
+        self.plans = [portfolio._account_plan("pension", 12 * 45)]
+
+    def test_sketch_quantiles_within_relative_accuracy(self):
+        sketch = MonthlyQuantileSketch(4, relative_accuracy=0.01)
+        sketch.add(self.values)
+        for q in (0.05, 0.5, 0.95):
+            exact = np.percentile(self.values, q * 100, axis=0, method="lower")
+            np.testing.assert_allclose(sketch.quantiles([q])[0], exact, rtol=0.01)
+
+    def test_merged_sketches_equal_single_sketch(self):
+        whole = MonthlyQuantileSketch(4)
+        whole.add(self.values)
+        merged = MonthlyQuantileSketch(4)
+        part = MonthlyQuantileSketch(4)
+        merged.add(self.values[:1000])
+        part.add(self.values[1000:])
+        merged.merge(part)
+        np.testing.assert_array_equal(
+            merged.quantiles([0.05, 0.5, 0.95]), whole.quantiles([0.05, 0.5, 0.95])
+        )
+        np.testing.assert_array_equal(merged.count(), [3000] * 4)
+        with self.assertRaises(ValueError):
+            merged.merge(MonthlyQuantileSketch(4, relative_accuracy=0.02))
+
+    def test_streaming_matches_full_simulation(self):
+        full = simulate(self.plans, 900, seed=4, batch_size=200)
+        summary = simulate_streaming(self.plans, 900, seed=4, batch_size=200)
+        self.assertEqual(summary.path_count(), 900)
+        np.testing.assert_allclose(summary.mean(), full.balances.mean(axis=0))
+        np.testing.assert_allclose(
+            summary.variance(), full.balances.var(axis=0, ddof=1), rtol=1e-9
+        )
+        np.testing.assert_array_equal(summary.depletion_curve(), full.depletion_curve())
+        exact = np.percentile(full.balances, [5, 50, 95], axis=0, method="lower")
+        approx = summary.percentiles((5, 50, 95))
+        large = np.abs(exact) >= 1.0
+        np.testing.assert_allclose(approx[large], exact[large], rtol=0.01)
+
+    def test_parallel_summaries_merge_exactly(self):
+        serial = simulate_streaming(self.plans, 500, seed=8, batch_size=100)
+        parallel = simulate_streaming_parallel(
+            self.plans, 500, seed=8, max_workers=2, batch_size=100
+        )
+        np.testing.assert_array_equal(parallel.percentiles(), serial.percentiles())
+        self.assertEqual(
+            parallel.depletion_probability(), serial.depletion_probability()
+        )
+        np.testing.assert_allclose(parallel.mean(), serial.mean())
+
+    def test_empty_summaries_have_no_depletion_share(self):
+        with np.errstate(all="raise"):
+            empty = MonteCarloSummary(date(2023, 1, 1), 3)
+            self.assertTrue(np.all(np.isnan(empty.depletion_curve())))
+            self.assertTrue(np.isnan(empty.depletion_probability()))
+            no_months = MonteCarloSummary(date(2023, 1, 1), 0)
+            self.assertTrue(np.isnan(no_months.depletion_probability()))
+            no_months.add(np.empty((5, 0)))
+            self.assertEqual(no_months.depletion_curve().shape, (0,))
+            self.assertEqual(no_months.depletion_probability(), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+from src.projection.timeseries import align_month_end_balances, month_end_balances
+
+
+def build_portfolio(history_mode: str = "full") -> AccountPortfolio:
+    portfolio = AccountPortfolio(date(1990, 1, 1), history_mode=history_mode)
+    portfolio.add_account(
+        "pension", 10000.0, date(2023, 1, 15), FixedInterestStrategy(0.04)
+    )
+    portfolio.add_account(
+        "savings", 500.0, date(2024, 6, 1), FixedInterestStrategy(0.01)
+    )
+    portfolio.add_contribution_rule(ContributionRule("pension", 500.0, 33, 65, 0.02))
+    portfolio.add_withdrawal_rule(WithdrawalRule("pension", 2000.0, 65, 90))
+    return portfolio
+
+
+class TestMonthEndBalances(unittest.TestCase):
+    def test_keeps_last_entry_of_every_month(self):
+        indices, amounts = month_end_balances(
+            np.array([5, 5, 6, 8, 8]), np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+        )
+        np.testing.assert_array_equal(indices, [5, 6, 8])
+        np.testing.assert_array_equal(amounts, [2.0, 3.0, 5.0])
+
+    def test_aligns_and_forward_fills(self):
+        grid, columns = align_month_end_balances(
+            {
+                "a": (np.array([5, 5, 6, 8]), np.array([1.0, 2.0, 3.0, 4.0])),
+                "b": (np.array([7, 8, 9]), np.array([10.0, 20.0, 30.0])),
+            }
+        )
+        np.testing.assert_array_equal(grid, [5, 6, 7, 8, 9])
+        np.testing.assert_array_equal(columns[:, 0], [2.0, 3.0, 3.0, 4.0, 4.0])
+        np.testing.assert_array_equal(columns[:, 1], [np.nan, np.nan, 10.0, 20.0, 30.0])
+
+
+class TestPortfolioTimeseries(unittest.TestCase):
+    def setUp(self):
+        self.portfolio = build_portfolio()
+        self.portfolio.project_to_age(70)
+
+    def test_columns_match_month_end_history(self):
+        frame = self.portfolio.timeseries()
+        self.assertEqual(list(frame.columns), ["pension", "savings", "total"])
+        self.assertEqual(frame.index[0], pd.Timestamp(2023, 1, 1))
+        # project_to_date steps accounts in lockstep, so the later account overshoots
+        self.assertEqual(frame.index[-1], pd.Timestamp(2061, 6, 1))
+        self.assertTrue(np.isnan(frame["savings"].loc["2024-05-01"]))
+        for name in self.portfolio.get_account_names():
+            month_end = {}
+            for entry_date, amount in self.portfolio.account_history(name):
+                month_end[pd.Timestamp(entry_date.year, entry_date.month, 1)] = amount
+            for timestamp, amount in month_end.items():
+                self.assertEqual(frame[name].loc[timestamp], amount)
+
+    def test_total_sums_every_account(self):
+        frame = self.portfolio.timeseries()
+        self.assertAlmostEqual(
+            frame["total"].iloc[-1], self.portfolio.total_balance(), delta=1e-6
+        )
+        np.testing.assert_allclose(
+            frame["total"].to_numpy(),
+            frame[["pension", "savings"]].fillna(0).sum(axis=1).to_numpy(),
+        )
+
+    def test_arrow_output(self):
+        table = self.portfolio.timeseries(output="arrow")
+        frame = self.portfolio.timeseries()
+        self.assertEqual(table.column_names, ["date", "pension", "savings", "total"])
+        self.assertEqual(table.num_rows, len(frame))
+        self.assertEqual(table.column("date")[0].as_py(), date(2023, 1, 1))
+        np.testing.assert_array_equal(
+            table.column("total").to_numpy(), frame["total"].to_numpy()
+        )
+
+    def test_sparse_history_modes_match_full_history(self):
+        frame = self.portfolio.timeseries()
+        for mode in ("month_end", "none"):
+            portfolio = build_portfolio(mode)
+            portfolio.project_to_age(70)
+            sparse = portfolio.timeseries()
+            self.assertEqual(sparse["total"].iloc[-1], frame["total"].iloc[-1])
+        monthly = build_portfolio("month_end")
+        monthly.project_to_age(70)
+        pd.testing.assert_frame_equal(monthly.timeseries(), frame)
+
+    def test_empty_portfolio(self):
+        frame = AccountPortfolio(date(1990, 1, 1)).timeseries()
+        self.assertTrue(frame.empty)
+        self.assertEqual(list(frame.columns), ["total"])
+
+    def test_unknown_format_raises(self):
+        with self.assertRaises(ValueError):
+            self.portfolio.timeseries(output="csv")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from datetime import date
+
+from src.account_portfolio import AccountPortfolio, ContributionRule, WithdrawalRule
+from src.interest_strategy.fixed_interest_strategy import FixedInterestStrategy
+
+
+def build_portfolio(birthdate: date) -> AccountPortfolio:
+    portfolio = AccountPortfolio(birthdate)
+    portfolio.add_account(
+        "pension", 10000.0, date(2023, 1, 15), FixedInterestStrategy(0.04)
+    )
+    portfolio.add_account(
+        "savings", 2500.0, date(2024, 6, 1), FixedInterestStrategy(0.02)
+    )
+    portfolio.add_contribution_rule(ContributionRule("pension", 500.0, 30, 65, 0.02))
+    portfolio.add_contribution_rule(ContributionRule("pension", 100.0, 40, 50))
+    portfolio.add_contribution_rule(ContributionRule("savings", 200.0, 35, 45, 0.1))
+    portfolio.add_withdrawal_rule(WithdrawalRule("pension", 1500.0, 65, 90))
+    portfolio.add_withdrawal_rule(WithdrawalRule("savings", 300.0, 45, 100))
+    return portfolio
+
+
+class TestVectorizedProjection(unittest.TestCase):
+    def assertSameProjection(self, loop, vectorized):
+        for name in loop.get_account_names():
+            expected = loop.account_history(name)
+            actual = vectorized.account_history(name)
+            self.assertEqual(len(actual), len(expected))
+            for (exp_date, exp_amount), (act_date, act_amount) in zip(expected, actual):
+                self.assertEqual(act_date, exp_date)
+                self.assertAlmostEqual(act_amount, exp_amount, delta=1e-6)
+
+    def test_matches_loop_engine(self):
+        loop = build_portfolio(date(1990, 1, 1))
+        vectorized = build_portfolio(date(1990, 1, 1))
+        loop.project_to_age(100)
+        vectorized.project_to_age(100, engine="vectorized")
+        self.assertSameProjection(loop, vectorized)
+
+    def test_matches_loop_engine_for_leap_day_birthdate(self):
+        loop = build_portfolio(date(1992, 2, 29))
+        vectorized = build_portfolio(date(1992, 2, 29))
+        loop.project_to_age(95)
+        vectorized.project_to_age(95, engine="vectorized")
+        self.assertSameProjection(loop, vectorized)
+
+    def test_continues_from_partial_projection(self):
+        loop = build_portfolio(date(1985, 8, 31))
+        vectorized = build_portfolio(date(1985, 8, 31))
+        loop.project_to_age(50)
+        vectorized.project_to_age(45)
+        vectorized.project_to_age(50, engine="vectorized")
+        self.assertSameProjection(loop, vectorized)
+
+    def test_target_in_the_past_is_a_no_op(self):
+        portfolio = build_portfolio(date(1990, 1, 1))
+        portfolio.project_to_date(date(2020, 1, 1), engine="vectorized")
+        self.assertEqual(len(portfolio.account_history("pension")), 1)
+
+    def test_unknown_engine_raises(self):
+        portfolio = build_portfolio(date(1990, 1, 1))
+        with self.assertRaises(ValueError):
+            portfolio.project_to_age(70, engine="gpu")
+
+    def test_negative_hundred_percent_rate(self):
+        portfolio = AccountPortfolio(date(1990, 1, 1))
+        portfolio.add_account(
+            "pension", 1000.0, date(2023, 1, 1), FixedInterestStrategy(-1)
+        )
+        portfolio.add_contribution_rule(ContributionRule("pension", 50.0, 30, 40))
+        portfolio.project_to_age(35, engine="vectorized")
+        self.assertEqual(portfolio.get_balance("pension"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()